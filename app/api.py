@@ -1,14 +1,256 @@
-from fastapi import FastAPI
-import pandas as pd
-from app.schemas import InputData, OutputData
-from models.salary_predictor import SalaryPredictor
+import os
+import asyncio
+import numpy as np
+from time import perf_counter_ns
+from pathlib import Path
+from contextlib import asynccontextmanager, contextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.schemas import InputData, OutputData, BatchInputData, BatchOutputData
+from app.batching import PredictionCoalescer, QueueFullError
+from app.executor import (InferenceExecutor, ExecutorOverloadedError, InferenceTimeoutError,
+                          predict_batch as run_predict_batch, lookup_record)
+from app.lifecycle import ModelLoader, ModelNotReadyError, ModelRegistryWatcher
+from models.prediction_cache import PredictionCache, RedisBackend
+from src.utils.paths import MODELS_DIR
+from src.utils.metrics import PhaseMetrics, prometheus_histogram, prometheus_metric
 
-app = FastAPI(title="IT Salary Prediction API")
-model = SalaryPredictor()
+# micro-batching для запитів, які не покриває таблиця передбачень
+COALESCER_MAX_BATCH_SIZE = 64
+COALESCER_MAX_WAIT_MS = 2.0
+COALESCER_MAX_QUEUE_SIZE = 1024
+
+# прогрів моделі синтетичним передбаченням перед переходом у ready
+WARMUP = os.environ.get('SALARY_API_WARMUP', '1') == '1'
+# 1 - сервер приймає з'єднання лише після завантаження моделі (без readiness-проб)
+WAIT_FOR_MODEL = os.environ.get('SALARY_API_WAIT_FOR_MODEL', '0') == '1'
+# директорія з best_model.pkl і model_metadata.pkl
+ARTIFACTS_DIR = Path(os.environ.get('SALARY_API_MODELS_DIR', MODELS_DIR))
+TABLE_MODE = os.environ.get('SALARY_API_TABLE_MODE', '1') == '1'
+# як часто перевіряти нову версію артефактів (сек); 0 - без hot reload
+RELOAD_INTERVAL = float(os.environ.get('SALARY_API_RELOAD_INTERVAL', '5'))
+# LRU-кеш передбачень перед моделлю: кількість записів (0 - без кешу) і TTL (сек)
+CACHE_SIZE = int(os.environ.get('SALARY_API_CACHE_SIZE', '10000'))
+CACHE_TTL = float(os.environ['SALARY_API_CACHE_TTL']) if os.environ.get('SALARY_API_CACHE_TTL') else None
+# redis://... - спільний між воркерами рівень кешу (потрібен пакет redis)
+CACHE_REDIS_URL = os.environ.get('SALARY_API_CACHE_REDIS_URL')
+
+# пул для CPU-роботи моделі (див. app.executor): 'thread' або 'process' (власний SalaryPredictor у кожному процесі)
+EXECUTOR_MODE = os.environ.get('SALARY_API_EXECUTOR', 'thread')
+EXECUTOR_WORKERS = int(os.environ.get('SALARY_API_EXECUTOR_WORKERS') or min(4, os.cpu_count() or 1))
+# задач понад EXECUTOR_WORKERS, що можуть чекати в пулі; більше - 429
+EXECUTOR_QUEUE = int(os.environ.get('SALARY_API_EXECUTOR_QUEUE', '64'))
+# ліміт часу інференсу на запит (сек); 0 - без ліміту; перевищення - 504
+REQUEST_TIMEOUT = float(os.environ.get('SALARY_API_REQUEST_TIMEOUT', '10')) or None
+
+# 0 - без таймінгу фаз інференсу (/metrics лишається з кешем, коалесером і моделлю)
+PHASE_METRICS = os.environ.get('SALARY_API_METRICS', '1') == '1'
+
+phase_metrics = PhaseMetrics() if PHASE_METRICS else None
+prediction_cache = None
+if CACHE_SIZE > 0:
+    prediction_cache = PredictionCache(
+        max_size=CACHE_SIZE, ttl=CACHE_TTL,
+        backend=RedisBackend.from_url(CACHE_REDIS_URL) if CACHE_REDIS_URL else None)
+
+loader = ModelLoader(warmup=WARMUP,
+                     model_path=ARTIFACTS_DIR / 'best_model.pkl',
+                     metadata_path=ARTIFACTS_DIR / 'model_metadata.pkl',
+                     table_mode=TABLE_MODE,
+                     prediction_cache=prediction_cache,
+                     metrics=phase_metrics)
+coalescer = None
+executor = None
+watcher = None
+
+async def load_model():
+    """
+    Завантажує модель у фоновому потоці, створює виконавець і коалесер, запускає
+    watcher реєстру і (у process-режимі) процеси пулу з власною моделлю
+    """
+    global coalescer, executor, watcher
+    # коалесер і виконавець беруть актуальну модель loader'а на кожен батч, тож переживають
+    # hot reload; створюються до завантаження, щоб існувати в момент, коли readiness стане ready
+    worker_kwargs = {key: value for key, value in loader.predictor_kwargs.items()
+                     if key not in ('prediction_cache', 'metrics')}
+    executor = InferenceExecutor(loader, mode=EXECUTOR_MODE, max_workers=EXECUTOR_WORKERS,
+                                 max_queue=EXECUTOR_QUEUE, timeout=REQUEST_TIMEOUT, **worker_kwargs).start()
+    coalescer = PredictionCoalescer(loader,
+                                    max_batch_size=COALESCER_MAX_BATCH_SIZE,
+                                    max_wait_ms=COALESCER_MAX_WAIT_MS,
+                                    max_queue_size=COALESCER_MAX_QUEUE_SIZE,
+                                    executor=executor)
+    # watcher - і до першого завантаження: якщо воно не вдасться (артефактів ще немає),
+    # нова модель у реєстрі завантажиться без рестарту
+    if RELOAD_INTERVAL > 0:
+        watcher = ModelRegistryWatcher(loader, interval=RELOAD_INTERVAL).start()
+    await loader.load_async()
+    await executor.warmup()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # модель вантажиться у фоні: liveness відповідає одразу, readiness - після завантаження
+    loading = asyncio.create_task(load_model())
+    if WAIT_FOR_MODEL:
+        await loading
+    yield
+
+    try:
+        await loading
+    except Exception:
+        pass # помилку вже залоговано і видно в /health/ready
+    if watcher is not None:
+        watcher.stop()
+    if coalescer is not None:
+        await coalescer.stop()
+    if executor is not None:
+        await asyncio.to_thread(executor.shutdown)
+
+app = FastAPI(title="IT Salary Prediction API", lifespan=lifespan)
+
+def use_model():
+    """with use_model() as model: ... - модель не звільняється hot reload'ом до кінця запиту"""
+    try:
+        return loader.use()
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@contextmanager
+def inference_errors():
+    """
+    Модель не готова - 503, черга коалесера або виконавця заповнена - 429, таймаут - 504,
+    невалідний запис (невідома категорія тощо) - 422
+    """
+    try:
+        yield
+    except ModelNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except (QueueFullError, ExecutorOverloadedError) as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.get("/health/live")
+def liveness():
+    return {'status': 'alive'}
+
+@app.get("/health/ready")
+def readiness():
+    """Стан завантаження моделі і тривалість етапів старту (мс); 503 поки модель не готова"""
+    return JSONResponse(loader.health(), status_code=200 if loader.ready else 503)
+
+@app.get("/model")
+def model_info():
+    """Активна версія моделі, test_R2 з метаданих і кількість hot reload'ів"""
+    with use_model():
+        info = loader.info()
+    if watcher is not None:
+        info['reload_error'] = watcher.last_error
+    return info
 
 @app.post("/predict", response_model=OutputData)
-def predict(input_data: InputData):
-    input_data = pd.DataFrame([input_data.dict()])
-    predicted_value = model.predict(input_data)[0]
+async def predict(input_data: InputData):
+    start = perf_counter_ns() if phase_metrics is not None else 0
+    record = input_data.model_dump()
+    if phase_metrics is not None:
+        phase_metrics.record('parse', start)
+
+    # таблиця (table mode) і кеш відповідають без моделі, решта йде через коалесер
+    with inference_errors():
+        with loader.use() as model:
+            # спільний рівень кешу (Redis) - мережевий запит: lookup у потоці, а не в event loop
+            shared_cache = model.cache is not None and model.cache.backend is not None
+            predicted_value = None if shared_cache else model.lookup_record(record)
+        if shared_cache:
+            predicted_value = await asyncio.to_thread(loader.call, lookup_record, record)
+        if predicted_value is None:
+            predicted_value = await coalescer.submit(record)
 
     return OutputData(prediction=predicted_value)
+
+@app.post("/predict/batch", response_model=BatchOutputData)
+async def predict_batch(batch: BatchInputData):
+    start = perf_counter_ns() if phase_metrics is not None else 0
+    if batch.records is not None:
+        input_data = [record.model_dump() for record in batch.records]
+    else:
+        input_data = batch.columns.model_dump()
+    if phase_metrics is not None:
+        phase_metrics.record('parse', start)
+
+    # DataFrame будується і передбачається в пулі виконавця, event loop не блокується
+    with inference_errors():
+        loader.get()
+        predictions, row_errors = await executor.run(run_predict_batch, input_data, list(InputData.model_fields))
+
+    return BatchOutputData(
+        predictions=[None if np.isnan(value) else int(value) for value in predictions],
+        errors=row_errors.to_dict()
+    )
+
+@app.get("/predict/coalescer")
+def coalescer_stats():
+    """Налаштування коалесера, глибина черги та гістограми queue time / batch size"""
+    with use_model():
+        return coalescer.stats()
+
+@app.get("/predict/executor")
+def executor_stats():
+    """Режим і розмір пулу інференсу, задачі в роботі, відмови (429) і таймаути (504)"""
+    return executor.stats() if executor is not None else {'enabled': False}
+
+@app.get("/predict/cache")
+def cache_stats():
+    """Розмір кешу передбачень, hits/misses/evictions і версія моделі, до якої він прив'язаний"""
+    if prediction_cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **prediction_cache.stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Метрики у текстовому форматі Prometheus: фази інференсу, кеш, коалесер і модель"""
+    lines = prometheus_metric('salary_model_ready', 'Model is loaded and serving', 'gauge',
+                              {(): int(loader.ready)})
+    if loader.ready:
+        lines += prometheus_metric('salary_model_info', 'Active model version', 'gauge',
+                                   {(('version', loader.version),): 1})
+        lines += prometheus_metric('salary_model_reloads_total', 'Hot reloads since start', 'counter',
+                                   {(): loader.reloads})
+
+    if phase_metrics is not None:
+        lines += prometheus_histogram(
+            'salary_inference_phase_seconds', 'Inference latency by phase',
+            {(('phase', phase),): histogram for phase, histogram in phase_metrics.histograms().items()},
+            scale=1e-6)
+
+    if prediction_cache is not None:
+        stats = prediction_cache.stats()
+        for counter in ('hits', 'backend_hits', 'misses', 'evictions', 'expirations', 'invalidations'):
+            lines += prometheus_metric(f'salary_prediction_cache_{counter}_total',
+                                       f'Prediction cache {counter.replace("_", " ")}', 'counter',
+                                       {(): stats[counter]})
+        lines += prometheus_metric('salary_prediction_cache_size', 'Prediction cache entries', 'gauge',
+                                   {(): stats['size']})
+
+    if coalescer is not None:
+        stats = coalescer.stats()
+        lines += prometheus_metric('salary_coalescer_queue_depth', 'Records waiting for a batch', 'gauge',
+                                   {(): stats['queue_depth']})
+        lines += prometheus_histogram('salary_coalescer_queue_time_seconds', 'Time in the coalescer queue',
+                                      {(): coalescer.queue_time_ms}, scale=1e-3)
+        lines += prometheus_histogram('salary_coalescer_batch_size', 'Records per coalesced batch',
+                                      {(): coalescer.batch_size})
+
+    if executor is not None:
+        stats = executor.stats()
+        lines += prometheus_metric('salary_executor_in_flight', 'Inference tasks running or queued', 'gauge',
+                                   {(): stats['in_flight']})
+        for counter in ('completed', 'rejected', 'timeouts'):
+            lines += prometheus_metric(f'salary_executor_{counter}_total', f'Inference tasks {counter}', 'counter',
+                                       {(): stats[counter]})
+        lines += prometheus_histogram('salary_executor_task_seconds', 'Inference task time in the executor pool',
+                                      {(): executor.task_time_ms}, scale=1e-3)
+
+    return PlainTextResponse('\n'.join(lines) + '\n', media_type='text/plain; version=0.0.4')
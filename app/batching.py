@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+from src.utils.metrics import Histogram
+from app.executor import predict_batch
+
+class QueueFullError(Exception):
+    """Черга коалесера заповнена - запит потрібно відхилити"""
+
+class PredictionCoalescer:
+    """
+    Micro-batching перед SalaryPredictor: запити, що надходять протягом
+    max_wait_ms (або поки не набереться max_batch_size рядків), збираються
+    в один DataFrame і передбачаються одним predict_batch у фоновому потоці.
+    Кожен викликач отримує свій результат через asyncio.Future.
+    predictor - SalaryPredictor або ModelLoader (тоді кожен батч іде в актуальну модель).
+    executor - app.executor.InferenceExecutor: батчі передбачаються в його пулі
+    і відправляються, не чекаючи попередніх (паралелізм і відмови - на боці
+    виконавця); без нього - по одному через asyncio.to_thread.
+    """
+
+    def __init__(self,
+                 predictor,
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0,
+                 max_queue_size: int = 1024,
+                 executor=None):
+        self.predictor = predictor
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue_size = max_queue_size
+
+        self.queue_time_ms = Histogram()
+        self.batch_size = Histogram(buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024))
+
+        self._queue = None
+        self._worker = None
+        self._batches = set() # батчі, відправлені у executor
+
+    async def submit(self, record: dict) -> int:
+        """
+        Ставить запис у чергу і чекає на передбачення.
+        QueueFullError - якщо черга заповнена, ValueError - невалідний запис.
+        """
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((record, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            raise QueueFullError(f'Prediction queue is full ({self.max_queue_size} requests)')
+
+        return await future
+
+    def _ensure_worker(self):
+        """Запускає фоновий worker у поточному event loop при першому запиті"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        for task in [self._worker, *self._batches]:
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._worker = None
+        self._batches.clear()
+
+    async def _collect_batch(self) -> list:
+        """Перший запит чекаємо без обмежень, решту - до дедлайну або max_batch_size"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_time_ms.observe((started - enqueued) * 1000)
+            self.batch_size.observe(len(batch))
+
+            if self.executor is None:
+                await self._predict(batch)
+            else:
+                task = asyncio.get_running_loop().create_task(self._predict(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _predict(self, batch: list):
+        records = [record for record, _, _ in batch]
+        try:
+            if self.executor is not None:
+                predictions, row_errors = await self.executor.run(predict_batch, records)
+            else:
+                import pandas as pd # відкладений імпорт: app.api не тягне pandas при старті
+
+                predictions, row_errors = await asyncio.to_thread(self.predictor.predict_batch,
+                                                                  pd.DataFrame(records))
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for idx, (_, future, _) in enumerate(batch):
+            if future.done(): # викликач вже скасував очікування
+                continue
+            if idx in row_errors.index:
+                future.set_exception(ValueError(row_errors[idx]))
+            else:
+                future.set_result(int(predictions[idx]))
+
+    def stats(self) -> dict:
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'max_queue_size': self.max_queue_size,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'queue_time_ms': self.queue_time_ms.snapshot(),
+            'batch_size': self.batch_size.snapshot(),
+        }
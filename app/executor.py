@@ -0,0 +1,175 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from src.utils.metrics import Histogram
+
+EXECUTOR_MODES = ('thread', 'process')
+
+class ExecutorOverloadedError(Exception):
+    """У виконавці вже max_workers + max_queue задач - запит потрібно відхилити (429)"""
+
+class InferenceTimeoutError(Exception):
+    """Задача не завершилась за timeout (504)"""
+
+class InferenceExecutor:
+    """
+    Виділений пул для CPU-роботи моделі, окремий від threadpool AnyIO,
+    на якому FastAPI виконує sync-ендпоінти; async-ендпоінти чекають на нього
+    через await, і event loop не блокується.
+
+    Задача - func(predictor, *args), де func - функція рівня модуля (див. predict_batch).
+
+    mode='thread': ThreadPoolExecutor, predictor - актуальна модель loader'а
+    (з lease, тож hot reload чекає на задачу). sklearn/XGBoost відпускають GIL лише
+    частково, тому на кількох ядрах масштабується гірше за process.
+    mode='process': ProcessPoolExecutor (spawn), кожен процес тримає власний
+    SalaryPredictor з predictor_kwargs. Разом із задачею передається версія
+    активної моделі loader'а: процес з іншою версією перезавантажує артефакти
+    (hot reload). Кеш передбачень і PhaseMetrics у процеси не передаються.
+
+    Допуск: одночасно щонайбільше max_workers + max_queue задач (виконуються
+    або чекають у пулі); понад це run() одразу кидає ExecutorOverloadedError.
+    timeout - ліміт очікування результату (сек): задача, що ще чекає в черзі,
+    скасовується, а та, що вже виконується, дораховує, але результат відкидається
+    (потік або процес не перериваються); слот звільняється, коли задача завершиться.
+    """
+
+    def __init__(self,
+                 loader,
+                 mode: str = 'thread',
+                 max_workers: int = 2,
+                 max_queue: int = 64,
+                 timeout: float = None,
+                 **predictor_kwargs):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode '{mode}', expected one of {EXECUTOR_MODES}")
+        self.loader = loader
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.predictor_kwargs = predictor_kwargs
+
+        self.task_time_ms = Histogram()
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def start(self):
+        if self.mode == 'thread':
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix='inference')
+        else:
+            # spawn: fork процесу з потоками uvicorn / loader'а небезпечний
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_init_worker, initargs=(self.predictor_kwargs,))
+        return self
+
+    async def warmup(self):
+        """Процес-режим: запускає всі процеси пулу і чекає, поки кожен завантажить модель"""
+        if self.mode == 'process':
+            loop = asyncio.get_running_loop()
+            version = self.loader.version
+            await asyncio.gather(*(loop.run_in_executor(self._pool, _worker_version, version)
+                                   for _ in range(self.max_workers)))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, func, *args, timeout: float = None):
+        """
+        await func(predictor, *args) у пулі.
+        ExecutorOverloadedError - пул і черга заповнені, InferenceTimeoutError - timeout.
+        """
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorOverloadedError(
+                    f'Inference executor is busy ({self.in_flight} tasks, '
+                    f'{self.max_workers} workers + {self.max_queue} queued)')
+            self.in_flight += 1
+
+        if self.mode == 'thread':
+            future = self._pool.submit(self.loader.call, func, *args)
+        else:
+            future = self._pool.submit(_worker_call, self.loader.version, func, args)
+        submitted = time.perf_counter()
+        future.add_done_callback(lambda done: self._done(done, submitted))
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise InferenceTimeoutError(f'Inference did not finish in {timeout} s')
+
+    def _done(self, future, submitted: float):
+        # колбек виконується в потоці пулу (або в потоці менеджера ProcessPoolExecutor)
+        with self._lock:
+            self.in_flight -= 1
+            if not future.cancelled():
+                self.completed += 1
+                self.task_time_ms.observe((time.perf_counter() - submitted) * 1000)
+
+    def stats(self) -> dict:
+        return {
+            'mode': self.mode,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'timeout_s': self.timeout,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'task_time_ms': self.task_time_ms.snapshot(),
+        }
+
+def predict_batch(predictor, data, columns: list = None):
+    """
+    SalaryPredictor.predict_records для списку записів або dict колонок:
+    DataFrame будується вже в пулі, а не в event loop
+    """
+    return predictor.predict_records(data, columns)
+
+def lookup_record(predictor, record: dict):
+    """SalaryPredictor.lookup_record поза event loop (спільний кеш ходить у мережу)"""
+    return predictor.lookup_record(record)
+
+# ---------- процеси пулу ----------
+_worker_kwargs = None
+_worker_predictor = None
+_worker_synced = None # версія loader'а, під яку процес востаннє завантажував модель
+
+def _init_worker(predictor_kwargs: dict):
+    global _worker_kwargs
+    _worker_kwargs = predictor_kwargs
+
+def _worker_model(version):
+    """
+    SalaryPredictor процесу; перезавантажується, коли loader перейшов на іншу версію.
+    Порівнюється з версією loader'а при останньому завантаженні, а не з версією
+    моделі процесу: артефакти на диску можуть бути новішими, ніж loader встиг
+    підхопити, і тоді процес не перезавантажувався б на кожній задачі.
+    """
+    global _worker_predictor, _worker_synced
+    if _worker_predictor is None or version != _worker_synced:
+        from models.salary_predictor import SalaryPredictor
+
+        _worker_predictor = SalaryPredictor(**_worker_kwargs)
+        _worker_predictor.warmup()
+        _worker_synced = version
+    return _worker_predictor
+
+def _worker_version(version):
+    return _worker_model(version).version
+
+def _worker_call(version, func, args: tuple):
+    return func(_worker_model(version), *args)
@@ -0,0 +1,271 @@
+import asyncio
+import importlib
+import threading
+import time
+from collections import Counter
+from datetime import datetime, UTC
+
+from src.utils.logger import get_logger
+from src.utils.paths import MODELS_DIR
+
+logger = get_logger(__name__)
+
+# стани завантажувача (див. ModelLoader.status)
+STARTING = 'starting'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+class ModelNotReadyError(Exception):
+    """Модель ще завантажується або завантаження завершилось помилкою"""
+
+class ModelLoader:
+    """
+    Відкладене завантаження SalaryPredictor для API та Gradio.
+
+    Імпорт модуля не тягне sklearn/pandas/xgboost і не читає артефакти:
+    models.salary_predictor імпортується і модель завантажується лише в load()
+    (у FastAPI - з lifespan, у фоновому потоці через load_async).
+    startup_report - тривалість етапів у мс: import, unpickle, configs,
+    compile, table, warmup і total.
+
+    reload() завантажує і прогріває нову версію поруч зі старою, атомарно
+    підміняє посилання і чекає, поки запити, що взяли стару модель через
+    use(), завершаться (drain).
+    """
+
+    def __init__(self, warmup: bool = True, drain_timeout: float = 30.0, **predictor_kwargs):
+        self.warmup = warmup
+        self.drain_timeout = drain_timeout
+        self.predictor_kwargs = predictor_kwargs
+        self.status = STARTING
+        self.error = None
+        self.predictor = None
+        self.loaded_at = None
+        self.reloads = 0
+        self.startup_report = {}
+        self._load_lock = threading.Lock() # один load/reload одночасно
+        self._state = threading.Condition() # посилання на модель і лічильники use()
+        self._in_use = Counter()
+
+    @property
+    def ready(self) -> bool:
+        return self.status == READY
+
+    @property
+    def version(self):
+        return self.predictor.version if self.predictor is not None else None
+
+    def _build(self):
+        """Новий прогрітий SalaryPredictor і звіт про етапи завантаження"""
+        started = time.perf_counter()
+
+        start = time.perf_counter()
+        module = importlib.import_module('models.salary_predictor')
+        report = {'import_ms': _elapsed_ms(start)}
+
+        predictor = module.SalaryPredictor(**self.predictor_kwargs)
+        report.update(predictor.load_times)
+
+        if self.warmup:
+            report['warmup_ms'] = predictor.warmup()
+
+        report['total_ms'] = _elapsed_ms(started)
+        return predictor, report
+
+    def load(self):
+        """Імпорт, завантаження артефактів і (опційно) прогрів. Повторний виклик - no-op."""
+        with self._load_lock:
+            if self.status == READY:
+                return self.predictor
+
+            self.status, self.error = LOADING, None
+            try:
+                predictor, report = self._build()
+            except Exception as e:
+                self.status, self.error = FAILED, f'{type(e).__name__}: {e}'
+                logger.error(f'Model loading failed: {self.error}')
+                raise
+
+            with self._state:
+                self.predictor, self.startup_report = predictor, report
+                self.loaded_at = datetime.now(UTC).isoformat()
+                self.status = READY
+
+        logger.info(f'Model {predictor.version} ready: ' +
+                    ', '.join(f'{phase}={ms}' for phase, ms in report.items()))
+        return predictor
+
+    async def load_async(self):
+        """load() у фоновому потоці, щоб event loop відповідав на liveness під час завантаження"""
+        return await asyncio.to_thread(self.load)
+
+    def reload(self):
+        """
+        Завантажує актуальні артефакти поруч з поточною моделлю і підміняє її.
+        Помилка завантаження не зачіпає поточну модель (виняток прокидається далі).
+        Повертає нову модель; стара звільняється після drain.
+        """
+        with self._load_lock:
+            predictor, report = self._build()
+
+            with self._state:
+                old, self.predictor = self.predictor, predictor
+                self.startup_report = report
+                self.loaded_at = datetime.now(UTC).isoformat()
+                self.status, self.error = READY, None
+                self.reloads += 1
+
+            logger.info(f'Model swapped: {getattr(old, "version", None)} -> {predictor.version} '
+                        f'(load {report["total_ms"]} ms)')
+            if old is not None:
+                self._drain(old)
+
+        return predictor
+
+    def _drain(self, old):
+        with self._state:
+            drained = self._state.wait_for(lambda: self._in_use[old] == 0, timeout=self.drain_timeout)
+        if drained:
+            logger.info(f'Model {old.version} drained')
+        else:
+            logger.warning(f'Model {old.version} still has {self._in_use[old]} requests '
+                           f'after {self.drain_timeout}s, releasing reference')
+
+    def get(self):
+        """Завантажений SalaryPredictor або ModelNotReadyError"""
+        if self.status != READY:
+            detail = f': {self.error}' if self.error else ''
+            raise ModelNotReadyError(f'Model is not ready (status: {self.status}){detail}')
+        return self.predictor
+
+    def use(self) -> '_ModelLease':
+        """
+        Поточна модель на час запиту: with loader.use() as model: ...
+        Поки lease відкритий, reload() не вважає стару модель звільненою.
+        """
+        with self._state:
+            predictor = self.get()
+            self._in_use[predictor] += 1
+        return _ModelLease(self, predictor)
+
+    def _release(self, predictor):
+        with self._state:
+            self._in_use[predictor] -= 1
+            if self._in_use[predictor] <= 0:
+                del self._in_use[predictor]
+                self._state.notify_all()
+
+    def artifact_paths(self) -> tuple:
+        """(model_path, metadata_path), з яких load()/reload() вантажать модель"""
+        return (self.predictor_kwargs.get('model_path', MODELS_DIR / 'best_model.pkl'),
+                self.predictor_kwargs.get('metadata_path', MODELS_DIR / 'model_metadata.pkl'))
+
+    def predict_batch(self, input_data):
+        """SalaryPredictor.predict_batch поточної моделі (для PredictionCoalescer)"""
+        with self.use() as predictor:
+            return predictor.predict_batch(input_data)
+
+    def call(self, func, *args):
+        """func(поточна модель, *args) під lease (для InferenceExecutor)"""
+        with self.use() as predictor:
+            return func(predictor, *args)
+
+    def health(self) -> dict:
+        return {'status': self.status, 'error': self.error, 'startup_ms': self.startup_report}
+
+    def info(self) -> dict:
+        """Активна версія моделі і метрики з model_metadata.pkl"""
+        metadata = self.get().metadata
+        test_r2 = metadata.get('test_R2')
+        return {
+            'version': self.version,
+            'model_name': metadata.get('model_name'),
+            'test_R2': None if test_r2 is None else float(test_r2),
+            'trained_at': metadata.get('trained_at'),
+            'loaded_at': self.loaded_at,
+            'reloads': self.reloads,
+        }
+
+class _ModelLease:
+    def __init__(self, loader: ModelLoader, predictor):
+        self.loader = loader
+        self.predictor = predictor
+
+    def __enter__(self):
+        return self.predictor
+
+    def __exit__(self, *exc):
+        self.loader._release(self.predictor)
+
+class ModelRegistryWatcher:
+    """
+    Фоновий потік, що стежить за model_metadata.pkl активної моделі.
+    Метадані записуються останніми (src.models.registry.save_model_artifacts),
+    тому зміна їх (mtime, size) з новою версією означає, що нова модель готова:
+    викликається loader.reload(). Невдале перезавантаження логиться, сервіс
+    продовжує працювати на поточній моделі.
+
+    Якщо перше завантаження не вдалось (артефактів ще не було або вони биті),
+    зміна метаданих запускає loader.load() - репліка стає ready без рестарту.
+    """
+
+    def __init__(self, loader: ModelLoader, interval: float = 5.0):
+        self.loader = loader
+        self.interval = interval
+        self.last_error = None
+        self._stamp = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='model-registry-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> bool:
+        """Одна перевірка реєстру; True - модель (пере)завантажено"""
+        from src.models.registry import metadata_stamp, read_version
+
+        status = self.loader.status
+        if status not in (READY, FAILED):
+            return False # перше завантаження ще триває
+
+        stamp = None
+        try:
+            model_path, metadata_path = self.loader.artifact_paths()
+            stamp = metadata_stamp(metadata_path)
+            if stamp is None or stamp == self._stamp:
+                return False
+
+            if status == FAILED:
+                self.loader.load()
+            else:
+                if read_version(model_path, metadata_path) == self.loader.version:
+                    self._stamp = stamp
+                    return False
+                self.loader.reload()
+        except Exception as e:
+            # повторна спроба - лише після наступного запису артефактів
+            if stamp is not None:
+                self._stamp = stamp
+            self.last_error = f'{type(e).__name__}: {e}'
+            logger.error(f'Model reload failed, keeping version {self.loader.version}: {self.last_error}')
+            return False
+
+        self._stamp = stamp
+        self.last_error = None
+        return True
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, model_validator
 
 # input
 class InputData(BaseModel):
@@ -11,3 +12,40 @@ class InputData(BaseModel):
 # output
 class OutputData(BaseModel):
     prediction: int
+
+# batch input: запис батчу; пропущені/null поля не відхиляють весь батч, а дають помилку рядка
+class BatchRecordData(BaseModel):
+    job_category: Optional[str] = None
+    seniority_level: Optional[str] = None
+    english_level: Optional[str] = None
+    experience_years: Optional[int] = None
+
+# batch input: колонковий формат (масив на кожну фічу)
+class ColumnarInputData(BaseModel):
+    job_category: List[Optional[str]]
+    seniority_level: List[Optional[str]]
+    english_level: List[Optional[str]]
+    experience_years: List[Optional[int]]
+
+    @model_validator(mode='after')
+    def check_equal_lengths(self):
+        lengths = {len(values) for values in self.model_dump().values()}
+        if len(lengths) > 1:
+            raise ValueError('All columns must have the same length')
+        return self
+
+# batch input: або список записів, або колонки
+class BatchInputData(BaseModel):
+    records: Optional[List[BatchRecordData]] = None
+    columns: Optional[ColumnarInputData] = None
+
+    @model_validator(mode='after')
+    def check_single_payload(self):
+        if (self.records is None) == (self.columns is None):
+            raise ValueError("Exactly one of 'records' or 'columns' must be provided")
+        return self
+
+# batch output: передбачення у порядку вхідних рядків, помилки за індексом рядка
+class BatchOutputData(BaseModel):
+    predictions: List[Optional[int]]
+    errors: Dict[int, str]
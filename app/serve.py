@@ -0,0 +1,124 @@
+"""
+Pre-fork сервер для app.api: кілька процесів-воркерів uvicorn на одному сокеті.
+
+--preload: модель завантажується один раз у головному процесі до fork(),
+воркери отримують її через copy-on-write і не розпаковують best_model.pkl
+кожен окремо (дерева ансамблів sklearn при розпаковці копіюються у власну
+пам'ять процесу, тож спільними їх робить лише fork). До fork() OpenMP/BLAS
+обмежені одним потоком, а прогрів виконується вже у воркерах (див. preload_model).
+Без --preload кожен воркер завантажує модель сам у lifespan (як uvicorn --workers).
+
+Запуск:
+    python -m app.serve --workers 4 --preload
+"""
+import os
+import gc
+import sys
+import signal
+import socket
+import argparse
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# змінні, з яких OpenMP (HistGBM, XGBoost) і BLAS беруть розмір пулу потоків при завантаженні бібліотеки
+THREAD_POOL_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+def preload_model(api) -> int:
+    """
+    Завантажує модель у головному процесі до fork(). Пули потоків OpenMP/BLAS,
+    створені до fork(), у дочірньому процесі не існують, а їхній стан успадковується -
+    відома причина deadlock'ів; тому під час завантаження (unpickle, таблиця,
+    перевірки точності) вони обмежені одним потоком, а прогрів відкладено до воркерів.
+    Повертає к-сть потоків OpenMP/BLAS, яку відновлює воркер.
+    """
+    threads = int(os.environ.get('OMP_NUM_THREADS') or os.cpu_count() or 1)
+    saved = {var: os.environ.get(var) for var in THREAD_POOL_VARS}
+    os.environ.update({var: '1' for var in THREAD_POOL_VARS})
+    warmup, api.loader.warmup = api.loader.warmup, False
+    try:
+        api.loader.load()
+    finally:
+        api.loader.warmup = warmup
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+    return threads
+
+def run_worker(sock: socket.socket, log_level: str, preload_threads: int = None):
+    import uvicorn
+    import app.api as api
+
+    if preload_threads is not None:
+        from threadpoolctl import threadpool_limits
+
+        # після fork(): повний пул потоків і прогрів - вже у власному процесі воркера
+        threadpool_limits(limits=preload_threads)
+        if api.loader.warmup:
+            api.loader.startup_report['warmup_ms'] = api.loader.get().warmup()
+
+    config = uvicorn.Config(api.app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+def serve(host: str = '127.0.0.1', port: int = 8000, workers: int = 1,
+          preload: bool = False, log_level: str = 'warning'):
+    """Запускає workers процесів і чекає їх завершення; SIGINT/SIGTERM пересилається воркерам"""
+    import app.api as api
+
+    preload_threads = None
+    if preload:
+        preload_threads = preload_model(api)
+        # об'єкти моделі - у permanent generation, щоб збирач сміття у воркерах
+        # не торкався їх заголовків і не копіював сторінки (copy-on-write)
+        gc.freeze()
+
+    sock = bind_socket(host, port)
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock, log_level, preload_threads)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    logger.info(f'Serving on {host}:{port} with {workers} workers (preload={preload}), pids {pids}')
+
+    def forward(signum, frame):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+
+    for pid in pids:
+        os.waitpid(pid, 0)
+    sock.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--preload', action='store_true', help='завантажити модель до fork()')
+    parser.add_argument('--log-level', default='warning')
+    args = parser.parse_args(argv)
+
+    serve(args.host, args.port, args.workers, args.preload, args.log_level)
+
+if __name__ == '__main__':
+    sys.exit(main())
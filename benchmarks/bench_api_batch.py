@@ -0,0 +1,53 @@
+"""
+Навантажувальний тест: пропускна здатність (rows/sec) /predict проти /predict/batch.
+
+Запуск:
+    python -m benchmarks.bench_api_batch --rows 1000 --batch-sizes 100 1000 10000
+"""
+import os
+import argparse
+import time
+
+from benchmarks.common import ensure_model_artifacts, make_records
+
+def to_columns(records: list) -> dict:
+    return {key: [record[key] for record in records] for key in records[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000, help='к-сть запитів для /predict')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1_000, 10_000])
+    args = parser.parse_args()
+
+    # app.api читає директорію артефактів з оточення при імпорті
+    os.environ['SALARY_API_MODELS_DIR'] = str(ensure_model_artifacts())
+    from fastapi.testclient import TestClient
+    from app.api import app
+
+    client = TestClient(app)
+    client.__enter__() # lifespan: завантаження моделі
+    while client.get('/health/ready').json()['status'] in ('starting', 'loading'):
+        time.sleep(0.05)
+
+    records = make_records(args.rows)
+    start = time.perf_counter()
+    for record in records:
+        client.post('/predict', json=record).raise_for_status()
+    single_rps = args.rows / (time.perf_counter() - start)
+    print(f"{'endpoint':<24}{'batch':>8}{'rows/sec':>14}{'vs /predict':>14}")
+    print(f"{'/predict':<24}{1:>8}{single_rps:>14.0f}{'1.0x':>14}")
+
+    for batch_size in args.batch_sizes:
+        batch = make_records(batch_size, random_state=batch_size)
+
+        for payload_name, payload in [('records', {'records': batch}),
+                                      ('columns', {'columns': to_columns(batch)})]:
+            start = time.perf_counter()
+            response = client.post('/predict/batch', json=payload)
+            response.raise_for_status()
+            batch_rps = batch_size / (time.perf_counter() - start)
+            print(f"{'/predict/batch ' + payload_name:<24}{batch_size:>8}"
+                  f"{batch_rps:>14.0f}{batch_rps / single_rps:>13.1f}x")
+
+if __name__ == '__main__':
+    main()
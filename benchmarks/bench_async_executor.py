@@ -0,0 +1,123 @@
+"""
+Латентність app.api під навантаженням великої кількості одночасних з'єднань
+для режимів виконавця інференсу (SALARY_API_EXECUTOR=thread / process).
+Сервер - один процес uvicorn, таблиця передбачень і кеш вимкнені, тож кожен
+запит проходить через коалесер і пул виконавця. Клієнт - httpx.AsyncClient
+з --connections одночасними з'єднаннями, кожне шле запити без пауз.
+
+Латентність (p50/p99) рахується лише для відповідей 200; 429 (перевантаження)
+і 504 (таймаут) - окремими лічильниками.
+
+Запуск:
+    python -m benchmarks.bench_async_executor --connections 1000 --modes thread process --duration 10
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import subprocess
+from collections import Counter
+import numpy as np
+
+from src.utils.paths import PROJECT_ROOT
+from benchmarks.common import ensure_model_artifacts, make_records
+from benchmarks.bench_workers import free_port
+
+def wait_ready(url: str, timeout: float = 300):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    with httpx.Client(timeout=5) as client:
+        while time.monotonic() < deadline:
+            try:
+                if client.get(f'{url}/health/ready').status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.1)
+    raise TimeoutError('Server did not become ready')
+
+async def load_test(url: str, endpoint: str, connections: int, duration: float, records: list) -> dict:
+    """Латентності (мс) відповідей 200 і лічильник статусів за duration секунд"""
+    import httpx
+
+    latencies, statuses = [], Counter()
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        async def connection(idx: int):
+            deadline = time.monotonic() + duration
+            i = idx
+            while time.monotonic() < deadline:
+                payload = records[i % len(records)] if endpoint == '/predict' else {'records': records[:100]}
+                i += connections
+                start = time.perf_counter()
+                try:
+                    response = await client.post(endpoint, json=payload)
+                except httpx.TransportError:
+                    statuses['transport error'] += 1
+                    continue
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(connection(idx) for idx in range(connections)))
+        elapsed = time.perf_counter() - start
+
+    return {'latencies': np.array(latencies), 'statuses': statuses, 'elapsed': elapsed}
+
+def run_server(models_dir, mode: str, workers: int, queue: int, timeout: float) -> subprocess.Popen:
+    port = free_port()
+    env = {**os.environ,
+           'SALARY_API_MODELS_DIR': str(models_dir),
+           'SALARY_API_TABLE_MODE': '0',
+           'SALARY_API_CACHE_SIZE': '0',
+           'SALARY_API_RELOAD_INTERVAL': '0',
+           'SALARY_API_EXECUTOR': mode,
+           'SALARY_API_EXECUTOR_WORKERS': str(workers),
+           'SALARY_API_EXECUTOR_QUEUE': str(queue),
+           'SALARY_API_REQUEST_TIMEOUT': str(timeout)}
+    server = subprocess.Popen([sys.executable, '-m', 'uvicorn', 'app.api:app', '--port', str(port),
+                               '--log-level', 'warning', '--backlog', '4096'],
+                              cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    server.url = f'http://127.0.0.1:{port}'
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, nargs='+', default=[1000])
+    parser.add_argument('--modes', nargs='+', choices=['thread', 'process'], default=['thread', 'process'])
+    parser.add_argument('--endpoints', nargs='+', choices=['/predict', '/predict/batch'], default=['/predict'])
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help='SALARY_API_EXECUTOR_WORKERS')
+    parser.add_argument('--queue', type=int, default=64, help='SALARY_API_EXECUTOR_QUEUE')
+    parser.add_argument('--timeout', type=float, default=10, help='SALARY_API_REQUEST_TIMEOUT, сек')
+    parser.add_argument('--duration', type=float, default=10.0, help='секунд навантаження на конфігурацію')
+    args = parser.parse_args()
+
+    models_dir = ensure_model_artifacts()
+    records = make_records(10_000)
+
+    print(f'cpus: {os.cpu_count()}, executor workers: {args.workers}, queue: {args.queue}, timeout: {args.timeout} s')
+    print(f"{'mode':<9}{'endpoint':<16}{'conns':>7}{'req/s':>9}{'p50, ms':>10}{'p99, ms':>10}"
+          f"{'200':>8}{'429':>7}{'504':>7}{'other':>7}")
+    for mode in args.modes:
+        server = run_server(models_dir, mode, args.workers, args.queue, args.timeout)
+        try:
+            wait_ready(server.url)
+            for endpoint in args.endpoints:
+                for connections in args.connections:
+                    result = asyncio.run(load_test(server.url, endpoint, connections, args.duration, records))
+                    latencies, statuses = result['latencies'], result['statuses']
+                    p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (np.nan, np.nan)
+                    other = sum(statuses.values()) - statuses[200] - statuses[429] - statuses[504]
+                    print(f"{mode:<9}{endpoint:<16}{connections:>7}{len(latencies) / result['elapsed']:>9.0f}"
+                          f"{p50:>10.1f}{p99:>10.1f}{statuses[200]:>8}{statuses[429]:>7}{statuses[504]:>7}{other:>7}",
+                          flush=True)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+feature_balancing_category: векторизований стратифікований семплінг
+проти попереднього groupby + x.sample + pd.concat по кожній страті.
+
+Запуск:
+    python -m benchmarks.bench_balancing --rows 10000 100000 1000000
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import feature_balancing_category
+from benchmarks.common import make_clean_frame, time_call
+
+JOB_CATEGORIES = ['Software Engineering', 'QA & Testing', 'Data & Machine Learning', 'Design & Creative']
+
+def legacy_feature_balancing_category(df, se_scale=100, qa_scale=600, random_state=25):
+    """Попередня реалізація: окремий x.sample на кожну пару (seniority_level, salary_usd)"""
+    se_df = df[df['job_category'] == 'Software Engineering']
+    qa_df = df[df['job_category'] == 'QA & Testing']
+    other_df = df[~df['job_category'].isin(['Software Engineering', 'QA & Testing'])]
+
+    se_sampled = pd.concat([
+        x.sample(min(len(x), max(1, int(se_scale * len(x) / len(se_df)))), random_state=random_state)
+        for _, x in se_df.groupby(['seniority_level', 'salary_usd'])
+    ], ignore_index=True)
+
+    qa_sampled = pd.concat([
+        x.sample(min(len(x), max(1, int(qa_scale * len(x) / len(qa_df)))), random_state=random_state)
+        for _, x in qa_df.groupby(['seniority_level', 'salary_usd'])
+    ], ignore_index=True)
+
+    return pd.concat([se_sampled, qa_sampled, other_df], ignore_index=True)
+
+def make_frame(n_rows: int, random_state: int = 25) -> pd.DataFrame:
+    df = make_clean_frame(n_rows, random_state)
+    rng = np.random.default_rng(random_state)
+    df['job_category'] = rng.choice(JOB_CATEGORIES, size=n_rows, p=[0.5, 0.2, 0.2, 0.1])
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=1_000_000)
+    parser.add_argument('--salary-bins', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'strata':>10}{'legacy, s':>12}{'vectorized, s':>15}{'binned, s':>12}{'speedup':>10}")
+    for n_rows in args.rows:
+        df = make_frame(n_rows)
+        n_strata = df.groupby(['job_category', 'seniority_level', 'salary_usd']).ngroups
+
+        vectorized = time_call(feature_balancing_category, df)
+        binned = time_call(feature_balancing_category, df, salary_bins=args.salary_bins)
+        if n_rows <= args.legacy_max_rows:
+            legacy = time_call(legacy_feature_balancing_category, df, repeat=1)
+            speedup = f'{legacy / vectorized:>9.0f}x'
+        else:
+            legacy, speedup = float('nan'), '-'
+
+        print(f'{n_rows:>10}{n_strata:>10}{legacy:>12.3f}{vectorized:>15.3f}{binned:>12.3f}{speedup:>10}')
+
+if __name__ == '__main__':
+    main()
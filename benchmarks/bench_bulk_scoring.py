@@ -0,0 +1,76 @@
+"""
+Пакетний скоринг (models.bulk_scoring): пропускна здатність і пам'ять на вхідних
+файлах різного розміру. Кожен запуск - в окремому процесі (spawn), тож RSS не
+містить згенерованих вхідних даних; 'growth' - пік RSS мінус RSS на старті
+скорингу (після імпортів) - має не залежати від к-сті рядків.
+
+Запуск:
+    python -m benchmarks.bench_bulk_scoring --rows 100000 1000000 --workers 1 2 --format csv parquet
+"""
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pandas as pd
+
+from models.bulk_scoring import score_file
+from benchmarks.common import ensure_model_artifacts, make_records
+
+def write_input(path: Path, n_rows: int, fmt: str, block: int = 100_000) -> Path:
+    """Вхідний файл на n_rows записів (блоками, щоб генерація не тримала все в пам'яті)"""
+    records = pd.DataFrame(make_records(min(n_rows, block)))
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(records, preserve_index=False)
+        with pq.ParquetWriter(path, table.schema) as writer:
+            for start in range(0, n_rows, block):
+                writer.write_table(table.slice(0, min(block, n_rows - start)))
+        return path
+
+    with open(path, 'w', newline='') as f:
+        for start in range(0, n_rows, block):
+            part = records.iloc[:min(block, n_rows - start)]
+            if fmt == 'csv':
+                part.to_csv(f, index=False, header=start == 0)
+            else:
+                part.to_json(f, orient='records', lines=True)
+    return path
+
+def _score(*args, **kwargs) -> dict:
+    from src.utils.profiling import current_rss_mb
+
+    rss_start = current_rss_mb()
+    report = score_file(*args, **kwargs)
+    return {**report, 'growth_mb': report['peak_rss_mb'] - rss_start}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--format', nargs='+', default=['csv', 'parquet'], choices=['csv', 'parquet', 'jsonl'])
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    args = parser.parse_args()
+
+    models_dir = ensure_model_artifacts()
+    context = multiprocessing.get_context('spawn')
+
+    print(f"{'format':<9}{'rows':>10}{'workers':>9}{'time, s':>9}{'rows/s':>10}{'peak RSS, MB':>14}{'growth, MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.format:
+            for n_rows in args.rows:
+                input_path = write_input(Path(tmp) / f'input_{n_rows}.{fmt}', n_rows, fmt)
+                for workers in args.workers:
+                    with ProcessPoolExecutor(1, mp_context=context) as pool:
+                        report = pool.submit(_score, input_path, Path(tmp) / f'output.{fmt}',
+                                             chunksize=args.chunksize, workers=workers,
+                                             model_path=models_dir / 'best_model.pkl',
+                                             metadata_path=models_dir / 'model_metadata.pkl').result()
+                    print(f"{fmt:<9}{n_rows:>10}{workers:>9}{report['elapsed_s']:>9.2f}{report['rows_per_s']:>10}"
+                          f"{report['peak_rss_mb']:>14.1f}{report['growth_mb']:>12.1f}", flush=True)
+                input_path.unlink()
+
+if __name__ == '__main__':
+    main()
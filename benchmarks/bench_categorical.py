@@ -0,0 +1,67 @@
+"""
+Рядкові колонки проти CategoricalDtype з фіксованими категоріями
+(allowed_values.json) на реплікованих оброблених даних:
+пам'ять, groupby, валідація allowed values і енкодери.
+
+Запуск:
+    python -m benchmarks.bench_categorical --rows 10000000
+"""
+import argparse
+import json
+import numpy as np
+import pandas as pd
+
+from src.utils.paths import CONFIG_DIR, DATA_DIR
+from src.data.categories import CATEGORICAL_COLUMNS, recode
+from src.pipeline import preprocces_data
+from src.scripts.encoders import TargetEncoder, FrequencyEncoder
+from benchmarks.common import time_call
+
+def make_frames(n_rows: int):
+    """(рядкова, категоріальна) версії оброблених даних, розмножених до n_rows"""
+    processed = preprocces_data(DATA_DIR / 'raw/2025_june_raw.csv', save_data=False)
+    categorical = processed.iloc[np.resize(np.arange(len(processed)), n_rows)].reset_index(drop=True)
+    strings = categorical.astype({col: str for col in CATEGORICAL_COLUMNS})
+    return strings, categorical
+
+def validate_isin(df, allowed):
+    """Попередня перевірка SalaryPredictor.validate_input"""
+    return [~df[col].isin(allowed[col]) for col in CATEGORICAL_COLUMNS]
+
+def validate_codes(df, allowed):
+    return [recode(df[col], allowed[col]) < 0 for col in CATEGORICAL_COLUMNS]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    allowed = json.load(open(CONFIG_DIR / 'allowed_values.json'))
+    strings, categorical = make_frames(args.rows)
+    y = strings['salary_usd']
+
+    def memory_mb(df):
+        return df[list(CATEGORICAL_COLUMNS)].memory_usage(deep=True).sum() / 1e6
+
+    rows = [('memory of categorical columns, MB', memory_mb(strings), memory_mb(categorical))]
+    cases = [
+        ('groupby seniority mean, s',
+         lambda df: df.groupby('seniority_level', observed=True)['salary_usd'].mean()),
+        ('allowed-values validation, s', lambda df: validate_isin(df, allowed)),
+        ('validation by codes, s', lambda df: validate_codes(df, allowed)),
+        ('TargetEncoder.fit_transform, s',
+         lambda df: TargetEncoder().fit_transform(df[['seniority_level']], y)),
+        ('FrequencyEncoder fit+transform, s',
+         lambda df: FrequencyEncoder().fit(df[['job_category']]).transform(df[['job_category']])),
+    ]
+    for name, func in cases:
+        rows.append((name, time_call(func, strings, repeat=1), time_call(func, categorical, repeat=1)))
+
+    print(f'{args.rows} rows')
+    print(f"{'':<36}{'strings':>10}{'category':>10}{'ratio':>8}")
+    for name, string_value, categorical_value in rows:
+        print(f'{name:<36}{string_value:>10.3f}{categorical_value:>10.3f}'
+              f'{string_value / categorical_value:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Конкурентні запити до живої моделі: окремий predict на кожен запит у threadpool
+проти PredictionCoalescer (micro-batching).
+
+Запуск:
+    python -m benchmarks.bench_coalescer --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+
+from app.batching import PredictionCoalescer
+from models.salary_predictor import SalaryPredictor
+from benchmarks.common import ensure_model_artifacts, make_records
+
+async def run_clients(handler, records, concurrency: int) -> np.ndarray:
+    """concurrency клієнтів по черзі відправляють записи; повертає латентності, мс"""
+    latencies = []
+    pending = iter(records)
+
+    async def client():
+        for record in pending:
+            start = time.perf_counter()
+            await handler(record)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return np.array(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    models_dir = ensure_model_artifacts()
+    predictor = SalaryPredictor(model_path=models_dir / 'best_model.pkl',
+                                metadata_path=models_dir / 'model_metadata.pkl')
+    records = make_records(args.requests)
+
+    async def per_request(record):
+        return await asyncio.to_thread(predictor.predict, pd.DataFrame([record]))
+
+    coalescer = PredictionCoalescer(predictor,
+                                    max_batch_size=args.max_batch_size,
+                                    max_wait_ms=args.max_wait_ms)
+
+    print(f"{'mode':<14}{'req/sec':>10}{'p50, ms':>10}{'p99, ms':>10}")
+    for name, handler in [('per-request', per_request), ('coalescer', coalescer.submit)]:
+        start = time.perf_counter()
+        latencies = asyncio.run(run_clients(handler, records, args.concurrency))
+        throughput = len(records) / (time.perf_counter() - start)
+        print(f'{name:<14}{throughput:>10.0f}{np.percentile(latencies, 50):>10.1f}'
+              f'{np.percentile(latencies, 99):>10.1f}')
+
+    stats = coalescer.stats()
+    print(f"mean batch size: {stats['batch_size']['sum'] / stats['batch_size']['count']:.1f}, "
+          f"mean queue time: {stats['queue_time_ms']['sum'] / stats['queue_time_ms']['count']:.2f} ms")
+
+if __name__ == '__main__':
+    main()
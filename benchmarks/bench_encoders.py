@@ -0,0 +1,74 @@
+"""
+Мікробенчмарк transform для TargetEncoder / FrequencyEncoder:
+векторизований lookup проти попереднього подвійного циклу по рядках.
+
+Запуск:
+    python -m benchmarks.bench_encoders --rows 1 1000 1000000
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.scripts.encoders import TargetEncoder, FrequencyEncoder
+from benchmarks.common import make_clean_frame, time_call
+
+def legacy_validate_input(X):
+    """Попередній _validate_input енкодерів: DataFrame/Series -> .values"""
+    if hasattr(X, 'values'):
+        return X.values
+    return np.asarray(X)
+
+def legacy_target_transform(encoder, X):
+    """Попередній TargetEncoder.transform: dict lookup на кожну клітинку"""
+    X = legacy_validate_input(X)
+    result = np.zeros_like(X, dtype=float)
+
+    for col_idx in range(X.shape[1]):
+        mapping = encoder.encodings_[col_idx]['basic']
+        for row_idx in range(X.shape[0]):
+            category = X[row_idx, col_idx]
+            result[row_idx, col_idx] = mapping.get(category, encoder.fill_value)
+
+    return result
+
+def legacy_frequency_transform(encoder, X):
+    """Попередній FrequencyEncoder.transform: dict lookup на кожну клітинку"""
+    X = legacy_validate_input(X)
+    result = np.zeros_like(X, dtype=int)
+
+    for col_idx in range(X.shape[1]):
+        freq_map = encoder.frequency_maps_[col_idx]
+        for row_idx in range(X.shape[0]):
+            category = X[row_idx, col_idx]
+            result[row_idx, col_idx] = freq_map.get(category, encoder.fill_value)
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 1_000, 1_000_000])
+    parser.add_argument('--fit-rows', type=int, default=10_000)
+    args = parser.parse_args()
+
+    train = make_clean_frame(args.fit_rows)
+    X_train = train[['seniority_level']]
+    target = TargetEncoder().fit(X_train, train['salary_usd'])
+    frequency = FrequencyEncoder().fit(X_train)
+
+    print(f"{'encoder':<12}{'rows':>10}{'legacy, ms':>14}{'vectorized, ms':>17}{'speedup':>10}")
+    for n_rows in args.rows:
+        X = make_clean_frame(n_rows, random_state=n_rows)[['seniority_level']]
+        repeat = 50 if n_rows <= 1_000 else 3
+
+        for name, encoder, legacy in [
+            ('target', target, legacy_target_transform),
+            ('frequency', frequency, legacy_frequency_transform),
+        ]:
+            np.testing.assert_allclose(encoder.transform(X), legacy(encoder, X))
+
+            old_time = time_call(legacy, encoder, X, repeat=repeat) * 1e3
+            new_time = time_call(encoder.transform, X, repeat=repeat) * 1e3
+            print(f'{name:<12}{n_rows:>10}{old_time:>14.3f}{new_time:>17.3f}{old_time / new_time:>9.1f}x')
+
+if __name__ == '__main__':
+    main()
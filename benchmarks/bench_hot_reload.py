@@ -0,0 +1,105 @@
+"""
+Hot reload під навантаженням: сервер (app.serve) обслуговує /predict у кілька
+потоків, тим часом у реєстр кілька разів публікується нова версія моделі.
+Рахує невдалі запити, перемикання версій у /model і латентність до/під час reload.
+
+Запуск:
+    python -m benchmarks.bench_hot_reload --reloads 3
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+import joblib
+import numpy as np
+
+from src.utils.paths import PROJECT_ROOT
+from src.models.registry import save_model_artifacts
+from benchmarks.common import build_model_artifacts, make_records
+from benchmarks.bench_workers import free_port
+
+def main():
+    import httpx
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reloads', type=int, default=3)
+    parser.add_argument('--interval', type=float, default=4.0, help='секунд між публікаціями')
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        models_dir = Path(models_dir)
+        build_model_artifacts(models_dir)
+        pipeline = joblib.load(models_dir / 'best_model.pkl')
+        save_model_artifacts(pipeline, {'model_name': 'HistGBM', 'test_R2': 0.0, 'params': {}}, models_dir)
+
+        port = free_port()
+        env = {**os.environ, 'SALARY_API_MODELS_DIR': str(models_dir),
+               'SALARY_API_TABLE_MODE': '0', 'SALARY_API_RELOAD_INTERVAL': '0.5'}
+        server = subprocess.Popen([sys.executable, '-m', 'app.serve', '--port', str(port), '--preload'],
+                                  cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        url = f'http://127.0.0.1:{port}'
+
+        latencies, errors, stop = [], [], threading.Event()
+
+        def load():
+            records = make_records(200)
+            with httpx.Client(base_url=url, timeout=30) as client:
+                idx = 0
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        client.post('/predict', json=records[idx % len(records)]).raise_for_status()
+                        latencies.append((time.monotonic(), (time.perf_counter() - start) * 1000))
+                    except Exception as e:
+                        errors.append(repr(e))
+                    idx += 1
+
+        try:
+            with httpx.Client(base_url=url, timeout=30) as client:
+                while True:
+                    try:
+                        if client.get('/health/ready').status_code == 200:
+                            break
+                    except httpx.TransportError:
+                        pass
+                    time.sleep(0.1)
+
+                threads = [threading.Thread(target=load) for _ in range(args.concurrency)]
+                for thread in threads:
+                    thread.start()
+
+                versions, reload_windows = [client.get('/model').json()['version']], []
+                for idx in range(args.reloads):
+                    time.sleep(args.interval / 2)
+                    published = time.monotonic()
+                    new_version = save_model_artifacts(
+                        pipeline, {'model_name': 'HistGBM', 'test_R2': idx + 1.0, 'params': {}}, models_dir)
+                    while client.get('/model').json()['version'] != new_version:
+                        time.sleep(0.05)
+                    reload_windows.append((published, time.monotonic()))
+                    versions.append(new_version)
+                    time.sleep(args.interval / 2)
+
+                stop.set()
+                for thread in threads:
+                    thread.join()
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    during = [ms for ts, ms in latencies if any(start <= ts <= end for start, end in reload_windows)]
+    steady = [ms for ts, ms in latencies if not any(start <= ts <= end for start, end in reload_windows)]
+    print(f'requests: {len(latencies) + len(errors)}, failed: {len(errors)}, versions served: {len(versions)}')
+    print(f'swap time after publish, s: {[round(end - start, 2) for start, end in reload_windows]}')
+    for name, values in [('steady', steady), ('during reload', during)]:
+        if values:
+            print(f'{name:<14} p50 {np.percentile(values, 50):7.2f} ms   p99 {np.percentile(values, 99):7.2f} ms'
+                  f'   n={len(values)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Інгест сирого CSV: повний read_csv проти потокового читання чанками
+(usecols + фіксовані типи). Звітує wall time і пік пам'яті (tracemalloc)
+на файлі, розмноженому з data/raw в --copies разів.
+
+Запуск:
+    python -m benchmarks.bench_ingestion --copies 1 10 50 --chunksize 50000
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import pandas as pd
+
+from src.utils.paths import DATA_DIR
+from src.pipeline import preprocces_data
+
+RAW_CSV = DATA_DIR / 'raw/2025_june_raw.csv'
+
+def make_raw_csv(copies: int, output_dir) -> Path:
+    """Сирий CSV з усіма колонками опитування, повторений copies разів"""
+    path = Path(output_dir) / f'raw_x{copies}.csv'
+    raw = pd.read_csv(RAW_CSV, encoding='cp1251')
+    pd.concat([raw] * copies, ignore_index=True).to_csv(path, index=False, encoding='cp1251')
+    return path
+
+def measure(func, *args, **kwargs):
+    """
+    (сек, пік пам'яті у МБ): час - окремим запуском,
+    бо tracemalloc сам суттєво сповільнює виконання
+    """
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'file, MB':>10}{'full, s':>10}{'full, MB':>10}"
+          f"{'stream, s':>11}{'stream, MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.copies:
+            path = make_raw_csv(copies, tmp)
+            n_rows = sum(1 for _ in open(path, encoding='cp1251'))
+            full_time, full_peak = measure(preprocces_data, path, save_data=False)
+            stream_time, stream_peak = measure(preprocces_data, path, save_data=False,
+                                               chunksize=args.chunksize)
+            print(f'{n_rows:>10}{path.stat().st_size / 1e6:>10.1f}{full_time:>10.2f}{full_peak:>10.1f}'
+                  f'{stream_time:>11.2f}{stream_peak:>12.1f}')
+            path.unlink()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Накладні витрати PhaseMetrics: та сама послідовність запитів через SalaryPredictor
+без метрик і з метриками; медіана різниці латентності між сусідніми раундами -
+ціна інструментації на запит. Шляхи: table (lookup з таблиці), compiled (CompiledPipeline + дерева),
+pandas (validate_input + покроковий пайплайн) і batch (predict_batch на 1000 рядків).
+
+Запуск:
+    python -m benchmarks.bench_metrics --requests 200 --rounds 200
+"""
+import argparse
+import time
+import numpy as np
+
+from src.utils.metrics import PhaseMetrics
+from models.salary_predictor import SalaryPredictor
+from benchmarks.common import ensure_model_artifacts, make_records
+
+PATHS = {
+    'table': {'table_mode': True},
+    'compiled': {},
+    'pandas': {'compiled_inference': False, 'tree_inference': False},
+}
+
+def replay(predictor: SalaryPredictor, records: list) -> float:
+    """Середня латентність запиту (мкс)"""
+    start = time.perf_counter()
+    for record in records:
+        predictor.predict_record(record)
+    return (time.perf_counter() - start) / len(records) * 1e6
+
+def paired_overhead(run, predictor: SalaryPredictor, metrics: PhaseMetrics, rounds: int) -> tuple:
+    """
+    Раунди off/on впереміш, з випадковим порядком у раунді: повільний дрейф латентності
+    моделі (частота CPU, кеші) однаково зачіпає обидва варіанти. Повертає медіани
+    (off, on, on - off) по раундах.
+    """
+    rng = np.random.default_rng(25)
+    off, on = [], []
+    for _ in range(rounds):
+        for enabled in rng.permutation([False, True]):
+            predictor.metrics = metrics if enabled else None
+            (on if enabled else off).append(run())
+    off, on = np.array(off), np.array(on)
+    return np.median(off), np.median(on), np.median(on - off)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200, help='запитів в одному раунді')
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    models_dir = ensure_model_artifacts()
+    records = make_records(args.requests)
+
+    print(f"{'path':<10}{'off, us':>10}{'on, us':>10}{'overhead, us':>14}{'phases':>8}")
+    for path, kwargs in list(PATHS.items()) + [('batch', {})]:
+        metrics = PhaseMetrics()
+        predictor = SalaryPredictor(model_path=models_dir / 'best_model.pkl',
+                                    metadata_path=models_dir / 'model_metadata.pkl', **kwargs)
+        predictor.warmup()
+        if path == 'batch':
+            batch = predictor._sample_inputs(1_000)
+            run, n_calls = (lambda: _time_batch(predictor, batch)), 1
+        else:
+            trace = records[:max(1, args.requests // 20)] if path == 'pandas' else records
+            run, n_calls = (lambda: replay(predictor, trace)), len(trace)
+
+        off, on, overhead = paired_overhead(run, predictor, metrics, args.rounds)
+        n_phases = sum(histogram.count for histogram in metrics.histograms().values()) / (n_calls * args.rounds)
+        print(f'{path:<10}{off:>10.2f}{on:>10.2f}{overhead:>14.2f}{n_phases:>8.0f}', flush=True)
+
+def _time_batch(predictor: SalaryPredictor, batch) -> float:
+    start = time.perf_counter()
+    predictor.predict_batch(batch)
+    return (time.perf_counter() - start) * 1e6
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Порівняння векторизованого очищення викидів з попередньою реалізацією (iterrows).
+
+Запуск:
+    python -m benchmarks.bench_outliers --rows 10000 1000000 10000000
+"""
+import argparse
+
+from src.data.preprocessing import cleaning_outliers_experience, cleaning_outliers_salary
+from src.data.configs.experience_mapping import EXPERIENCE_RANGES
+from src.data.configs.salary_mapping import SALARY_RANGES
+from benchmarks.common import make_clean_frame, time_call
+
+def legacy_cleaning_outliers_experience(df):
+    """Попередня реалізація: iterrows + фільтрація на кожному рядку"""
+    df_copy = df.copy()
+    df_copy['is_outlier'] = False
+    df_copy['outlier_score'] = float(0.0)
+
+    for index, row in df_copy.iterrows():
+        seniority = row['seniority_level']
+        experience = row['experience_years']
+        score = 0.0
+
+        if seniority in EXPERIENCE_RANGES:
+            rules = EXPERIENCE_RANGES[seniority]
+            if 'max_outlier' in rules and experience > rules['max_outlier']:
+                score = 1.0
+            elif rules['typical_range'][0] <= experience <= rules['typical_range'][1]:
+                score = 0.0
+            elif rules['acceptable'][0] <= experience <= rules['acceptable'][1]:
+                score = 0.25
+            elif experience < rules['critical_outlier']:
+                score = 0.75
+            elif experience < rules['outlier_threshold']:
+                score = 0.50
+            else:
+                score = 1.0
+
+        if score >= 0.5:
+            df_copy.at[index, 'is_outlier'] = True
+        df_copy.at[index, 'outlier_score'] = score
+
+        df_normal = df_copy[df_copy['is_outlier'] == False]
+        df_normal = df_normal.drop(columns=['is_outlier', 'outlier_score'])
+
+    return df_normal
+
+def legacy_cleaning_outliers_salary(df):
+    """Попередня реалізація: iterrows + фільтрація на кожному рядку"""
+    df_copy = df.copy()
+    df_copy['is_outlier'] = False
+    df_copy['salary_score'] = float(0.0)
+
+    for index, row in df_copy.iterrows():
+        seniority = row['seniority_level']
+        salary = row['salary_usd']
+        score = 0.0
+
+        if seniority in SALARY_RANGES:
+            rules = SALARY_RANGES[seniority]
+            if rules['typical_range'][0] <= salary <= rules['typical_range'][1]:
+                score = 0.0
+            elif rules['acceptable'][0] <= salary <= rules['acceptable'][1]:
+                score = 0.25
+            elif rules['outlier_range'][0] <= salary <= rules['outlier_range'][1]:
+                score = 0.75
+            else:
+                score = 1.0
+
+        if score >= 0.5:
+            df_copy.at[index, 'is_outlier'] = True
+        df_copy.at[index, 'salary_score'] = score
+
+        df_normal = df_copy[df_copy['is_outlier'] == False]
+        df_normal = df_normal.drop(columns=['is_outlier', 'salary_score']).reset_index(drop=True)
+
+    return df_normal
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=10_000,
+                        help='попередня реалізація квадратична, тому запускається лише до цього розміру')
+    args = parser.parse_args()
+
+    print(f"{'stage':<12}{'rows':>12}{'legacy, s':>14}{'vectorized, s':>16}{'speedup':>10}")
+    for n_rows in args.rows:
+        df = make_clean_frame(n_rows)
+
+        for stage, legacy, vectorized in [
+            ('experience', legacy_cleaning_outliers_experience, cleaning_outliers_experience),
+            ('salary', legacy_cleaning_outliers_salary, cleaning_outliers_salary),
+        ]:
+            new_time = time_call(vectorized, df)
+
+            if n_rows <= args.legacy_max_rows:
+                old_time = time_call(legacy, df, repeat=1)
+                print(f'{stage:<12}{n_rows:>12}{old_time:>14.3f}{new_time:>16.4f}{old_time / new_time:>9.0f}x')
+            else:
+                print(f"{stage:<12}{n_rows:>12}{'skipped':>14}{new_time:>16.4f}{'-':>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Кеш передбачень на Zipf-розподіленому трейсі запитів: predict_record без кешу
+проти PredictionCache (LRU) різного розміру. Популярність записів (категорії x
+досвід з кроком 0.5 року) спадає як 1 / rank^s. Таблиця передбачень вимкнена,
+щоб кожен промах ішов у модель. Рахуються латентність на запит і hit rate.
+
+Запуск:
+    python -m benchmarks.bench_prediction_cache --requests 20000 --zipf 1.1 --cache-sizes 100 1000 10000
+"""
+import argparse
+import itertools
+import json
+import time
+import numpy as np
+
+from src.utils.paths import CONFIG_DIR
+from src.data.categories import CATEGORICAL_COLUMNS
+from models.prediction_cache import PredictionCache
+from models.salary_predictor import SalaryPredictor
+from benchmarks.common import ensure_model_artifacts
+
+def make_zipf_trace(n_requests: int, exponent: float, random_state: int = 25) -> tuple:
+    """(трейс записів, кількість різних записів у популяції)"""
+    rng = np.random.default_rng(random_state)
+    allowed = json.load(open(CONFIG_DIR / 'allowed_values.json'))
+    population = [
+        dict(zip(CATEGORICAL_COLUMNS, values), experience_years=experience)
+        for values in itertools.product(*(allowed[col] for col in CATEGORICAL_COLUMNS))
+        for experience in np.arange(0, 30.5, 0.5).tolist()
+    ]
+    # ранг популярності - випадкова перестановка популяції
+    weights = 1 / np.arange(1, len(population) + 1) ** exponent
+    ranks = rng.choice(len(population), size=n_requests, p=weights / weights.sum())
+    order = rng.permutation(len(population))
+    return [population[order[rank]] for rank in ranks], len(population)
+
+def replay(predictor: SalaryPredictor, trace: list) -> np.ndarray:
+    """Латентність кожного запиту (мкс)"""
+    latencies = np.empty(len(trace))
+    for idx, record in enumerate(trace):
+        start = time.perf_counter()
+        predictor.predict_record(record)
+        latencies[idx] = time.perf_counter() - start
+    return latencies * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--zipf', type=float, default=1.1, help='показник s розподілу Zipf')
+    parser.add_argument('--cache-sizes', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--paths', nargs='+', default=['compiled', 'pandas'],
+                        help='compiled - CompiledPipeline + TreeEnsemble, pandas - validate_input + model.predict')
+    args = parser.parse_args()
+
+    models_dir = ensure_model_artifacts()
+    trace, population = make_zipf_trace(args.requests, args.zipf)
+    print(f'{args.requests} requests, {len(set(map(str, trace)))} distinct of {population}, zipf s={args.zipf}')
+
+    print(f"{'path':<10}{'cache':>8}{'hit rate':>10}{'mean, us':>11}{'p50, us':>10}{'p99, us':>10}"
+          f"{'evictions':>11}{'speedup':>9}")
+    for path in args.paths:
+        baseline = None
+        for cache_size in [0] + args.cache_sizes:
+            cache = PredictionCache(max_size=cache_size) if cache_size else None
+            predictor = SalaryPredictor(model_path=models_dir / 'best_model.pkl',
+                                        metadata_path=models_dir / 'model_metadata.pkl',
+                                        compiled_inference=path == 'compiled',
+                                        tree_inference=path == 'compiled',
+                                        prediction_cache=cache)
+            predictor.warmup()
+            if cache is not None:
+                cache.clear()
+                cache.reset_stats()
+
+            latencies = replay(predictor, trace)
+            mean = latencies.mean()
+            baseline = baseline or mean
+            stats = cache.stats() if cache is not None else {'hit_rate': 0.0, 'evictions': 0}
+            print(f"{path:<10}{cache_size or '-':>8}{stats['hit_rate']:>10.1%}{mean:>11.1f}"
+                  f"{np.percentile(latencies, 50):>10.1f}{np.percentile(latencies, 99):>10.1f}"
+                  f"{stats['evictions']:>11}{baseline / mean:>8.1f}x", flush=True)
+
+if __name__ == '__main__':
+    main()
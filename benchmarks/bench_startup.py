@@ -0,0 +1,63 @@
+"""
+Холодний старт сервісу в окремих процесах: час імпорту app.api (до цього
+моменту сервер вже може приймати з'єднання і відповідати на liveness) і
+розбивка завантаження моделі по етапах (ModelLoader.startup_report).
+Для порівняння - старий шлях: імпорт SalaryPredictor і створення моделі
+при імпорті модуля.
+
+Запуск:
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import os
+import argparse
+import json
+import subprocess
+import sys
+import numpy as np
+
+from src.utils.paths import PROJECT_ROOT
+from benchmarks.common import ensure_model_artifacts
+
+LAZY = """
+import json, time
+start = time.perf_counter()
+import app.api
+import_ms = (time.perf_counter() - start) * 1000
+app.api.loader.load()
+print(json.dumps({'api_import_ms': import_ms, **app.api.loader.startup_report}))
+"""
+
+EAGER = """
+import json, os, time
+from pathlib import Path
+start = time.perf_counter()
+import fastapi
+from models.salary_predictor import SalaryPredictor
+models_dir = Path(os.environ['SALARY_API_MODELS_DIR'])
+model = SalaryPredictor(model_path=models_dir / 'best_model.pkl', metadata_path=models_dir / 'model_metadata.pkl',
+                        table_mode=True)
+print(json.dumps({'api_import_ms': (time.perf_counter() - start) * 1000}))
+"""
+
+def run(code: str, models_dir) -> dict:
+    env = {**os.environ, 'SALARY_API_MODELS_DIR': str(models_dir)}
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    models_dir = ensure_model_artifacts()
+    eager = [run(EAGER, models_dir) for _ in range(args.repeat)]
+    lazy = [run(LAZY, models_dir) for _ in range(args.repeat)]
+
+    print(f'median of {args.repeat} cold starts, ms')
+    print(f"{'eager: import until serving':<32}{np.median([r['api_import_ms'] for r in eager]):>10.1f}")
+    for phase in lazy[0]:
+        print(f"{'lazy: ' + phase:<32}{np.median([r[phase] for r in lazy]):>10.1f}")
+
+if __name__ == '__main__':
+    main()
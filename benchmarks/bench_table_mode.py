@@ -0,0 +1,57 @@
+"""
+Латентність одного запиту: звичайний SalaryPredictor.predict (pandas + sklearn),
+скомпільований пайплайн без pandas та table mode (lookup по передобчисленій сітці).
+
+Запуск:
+    python -m benchmarks.bench_table_mode --requests 2000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from models.salary_predictor import SalaryPredictor
+from benchmarks.common import ensure_model_artifacts, make_records
+
+def measure_latencies(func, records) -> np.ndarray:
+    """Латентність кожного виклику, мкс"""
+    latencies = np.empty(len(records))
+    for idx, record in enumerate(records):
+        start = time.perf_counter()
+        func(record)
+        latencies[idx] = time.perf_counter() - start
+    return latencies * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2_000)
+    args = parser.parse_args()
+
+    models_dir = ensure_model_artifacts()
+    paths = {'model_path': models_dir / 'best_model.pkl', 'metadata_path': models_dir / 'model_metadata.pkl'}
+    live = SalaryPredictor(compiled_inference=False, **paths)
+    compiled = SalaryPredictor(**paths)
+
+    start = time.perf_counter()
+    table = SalaryPredictor(table_mode=True, **paths)
+    print(f'table build + tolerance check: {time.perf_counter() - start:.2f} s')
+
+    records = make_records(args.requests)
+    live_predictions = [live.predict(pd.DataFrame([r]))[0] for r in records]
+    for name, predictor in [('compiled', compiled), ('table', table)]:
+        predictions = [predictor.predict_record(r) for r in records]
+        print(f'{name} mismatches vs live model: {int(np.sum(np.array(live_predictions) != predictions))}')
+
+    print(f"{'path':<32}{'p50, us':>10}{'p99, us':>10}")
+    for name, func in [
+        ('live predict(DataFrame)', lambda r: live.predict(pd.DataFrame([r]))),
+        ('live predict_record', live.predict_record),
+        ('compiled predict_record', compiled.predict_record),
+        ('compiled predict_record(tuple)', lambda r: compiled.predict_record(tuple(r.values()))),
+        ('table predict_record', table.predict_record),
+    ]:
+        latencies = measure_latencies(func, records)
+        print(f'{name:<32}{np.percentile(latencies, 50):>10.1f}{np.percentile(latencies, 99):>10.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Вибір моделі: вичерпний GridSearchCV проти successive halving / random search.
+Звітує wall time і найкращий R2 (test) для кожного режиму.
+
+Запуск:
+    python -m benchmarks.bench_training --modes grid halving --workers 4
+    python -m benchmarks.bench_training --models Ridge HistGBM XGBoost --time-budget 600
+    python -m benchmarks.bench_training --modes grid --no-cache   # без кешу препроцесора
+"""
+import argparse
+import time
+
+from src.utils.paths import DATA_DIR
+from src.pipeline import preprocces_data, prepare_training_data
+from src.models.train_model import run_training, SEARCH_MODES
+from src.models.configs.regression_models import REGRESSION_MODELS
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--modes', nargs='+', default=['grid', 'halving'], choices=SEARCH_MODES)
+    parser.add_argument('--models', nargs='+', default=list(REGRESSION_MODELS))
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--time-budget', type=float, default=None)
+    parser.add_argument('--no-cache', action='store_true', help='не кешувати препроцесор по fold\'ах')
+    args = parser.parse_args()
+
+    df = preprocces_data(DATA_DIR / 'raw/2025_june_raw.csv', save_data=False)
+    data_bundle, preprocessor = prepare_training_data(df, 'salary_usd', 0.8)
+    models = {name: REGRESSION_MODELS[name] for name in args.models}
+
+    summary = []
+    for mode in args.modes:
+        start = time.perf_counter()
+        best_model_info, results = run_training(data_bundle, preprocessor, save_best_model=False,
+                                                search_mode=mode, n_workers=args.workers,
+                                                time_budget=args.time_budget, models=models,
+                                                cache_preprocessing=not args.no_cache)
+        wall_time = time.perf_counter() - start
+        summary.append((mode, wall_time, best_model_info, results))
+
+    print(f"\n{'mode':<10}{'wall, s':>10}{'models':>8}{'best model':>20}{'best R2':>10}")
+    for mode, wall_time, best_model_info, results in summary:
+        n_models = sum(1 for r in results if r['dataset_var'] == 'test')
+        best_name = best_model_info['name'] if best_model_info else '-'
+        best_r2 = best_model_info['test_r2'] if best_model_info else float('nan')
+        print(f'{mode:<10}{wall_time:>10.1f}{n_models:>8}{best_name:>20}{best_r2:>10.2f}')
+
+    print(f"\n{'mode':<10}{'model':<20}{'fit, s':>10}{'R2 test':>10}")
+    for mode, _, _, results in summary:
+        for r in results:
+            if r['dataset_var'] == 'test':
+                print(f"{mode:<10}{r['model']:<20}{r['fit_time']:>10.1f}{r['R2']:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Латентність дерев'яних моделей: pipeline.predict (sklearn/XGBoost + препроцесинг)
+проти TreeEnsemble.predict (NumPy-обхід плоских масивів вузлів) на батчах 1..10k.
+Перед заміром перевіряється відхилення <= 1e-6.
+
+Запуск:
+    python -m benchmarks.bench_tree_ensemble --models rf gb hgb xgb dt
+"""
+import argparse
+import json
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+
+from src.utils.paths import CONFIG_DIR, DATA_DIR
+from src.data.categories import CATEGORICAL_COLUMNS
+from src.pipeline import preprocces_data, prepare_training_data
+from models.tree_ensemble import TreeEnsemble, export_tree_ensemble
+from benchmarks.common import time_call
+
+def make_regressors() -> dict:
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+    from xgboost import XGBRegressor
+
+    return {
+        'dt': DecisionTreeRegressor(max_depth=10, random_state=25),
+        'rf': RandomForestRegressor(n_estimators=300, max_depth=10, random_state=25),
+        'gb': GradientBoostingRegressor(n_estimators=300, random_state=25),
+        'hgb': HistGradientBoostingRegressor(max_iter=300, random_state=25),
+        'xgb': XGBRegressor(n_estimators=300, max_depth=7, random_state=25, n_jobs=1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', nargs='+', default=['dt', 'rf', 'gb', 'hgb', 'xgb'])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1_000, 10_000])
+    args = parser.parse_args()
+
+    df = preprocces_data(DATA_DIR / 'raw/2025_june_raw.csv', save_data=False)
+    data_bundle, preprocessor = prepare_training_data(df, 'salary_usd', 0.8)
+    allowed = json.load(open(CONFIG_DIR / 'allowed_values.json'))
+    categories = {col: allowed[col] for col in CATEGORICAL_COLUMNS}
+    X_test = data_bundle['X_test']
+
+    regressors = make_regressors()
+    print(f"{'model':<6}{'batch':>8}{'pipeline, ms':>15}{'numpy, ms':>12}{'speedup':>10}")
+    for name in args.models:
+        pipeline = Pipeline([('preprocessor', clone(preprocessor)), ('regressor', regressors[name])])
+        pipeline.fit(data_bundle['X_train'], data_bundle['y_train'])
+        engine = TreeEnsemble(export_tree_ensemble(pipeline, categories, list(X_test.columns)))
+
+        max_error = engine.check_tolerance(pipeline, X_test)
+        assert max_error <= 1e-6, f'{name}: max error {max_error}'
+
+        for batch_size in args.batch_sizes:
+            batch = X_test.iloc[np.resize(np.arange(len(X_test)), batch_size)].reset_index(drop=True)
+            repeat = max(3, min(200, 2_000 // batch_size))
+            pipeline_ms = time_call(pipeline.predict, batch, repeat=repeat) * 1000
+            engine_ms = time_call(engine.predict, batch, repeat=repeat) * 1000
+            print(f'{name:<6}{batch_size:>8}{pipeline_ms:>15.3f}{engine_ms:>12.3f}'
+                  f'{pipeline_ms / engine_ms:>9.1f}x', flush=True)
+
+if __name__ == '__main__':
+    main()
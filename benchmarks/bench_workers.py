@@ -0,0 +1,136 @@
+"""
+Пам'ять і пропускна здатність app.serve при 1/4/16 воркерах у двох режимах:
+- independent: кожен воркер розпаковує best_model.pkl сам
+- preload: модель завантажена до fork(), воркери ділять її сторінки
+
+Пам'ять - сума RSS (спільні сторінки рахуються в кожному процесі) і сума PSS
+(спільні сторінки діляться між процесами) по дереву процесів сервера.
+Навантаження - /predict/batch зі 100 рядків у кілька потоків, таблиця передбачень
+вимкнена, щоб кожен запит проходив через модель.
+
+Запуск:
+    python -m benchmarks.bench_workers --model rf --workers 1 4 16
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.paths import PROJECT_ROOT
+from benchmarks.common import build_model_artifacts, make_records
+
+MODES = ('independent', 'preload')
+
+def make_regressor(name: str):
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+
+    return {
+        'rf': RandomForestRegressor(n_estimators=300, random_state=25),
+        'gb': GradientBoostingRegressor(n_estimators=300, random_state=25),
+        'hgb': HistGradientBoostingRegressor(max_iter=300, random_state=25),
+    }[name]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def process_tree(pid: int) -> list:
+    children = Path(f'/proc/{pid}/task/{pid}/children').read_text().split()
+    return [pid] + [int(child) for child in children]
+
+def memory_mb(pids: list) -> tuple:
+    """(сума RSS, сума PSS) у МБ з /proc/<pid>/smaps_rollup"""
+    rss = pss = 0
+    for pid in pids:
+        for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines():
+            if line.startswith('Rss:'):
+                rss += int(line.split()[1])
+            elif line.startswith('Pss:'):
+                pss += int(line.split()[1])
+    return rss / 1024, pss / 1024
+
+def wait_ready(client, url: str, n_workers: int, timeout: float = 300):
+    """Чекає, поки /health/ready відповість 200 (запити розподіляються між воркерами)"""
+    deadline = time.monotonic() + timeout
+    ready = 0
+    while time.monotonic() < deadline and ready < 4 * n_workers:
+        try:
+            ready = ready + 1 if client.get(f'{url}/health/ready').status_code == 200 else 0
+        except Exception:
+            ready = 0
+        time.sleep(0.05)
+    if ready < 4 * n_workers:
+        raise TimeoutError('Server did not become ready')
+
+def load_test(url: str, duration: float, concurrency: int, batch: list) -> float:
+    """rows/sec для /predict/batch за duration секунд"""
+    import httpx
+
+    def worker():
+        rows = 0
+        with httpx.Client(timeout=60) as client:
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                client.post(f'{url}/predict/batch', json={'records': batch}).raise_for_status()
+                rows += len(batch)
+        return rows
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        rows = sum(pool.map(lambda _: worker(), range(concurrency)))
+    return rows / (time.perf_counter() - start)
+
+def run_server(artifacts_dir, mode: str, n_workers: int, duration: float, concurrency: int) -> dict:
+    import httpx
+
+    port = free_port()
+    env = {**os.environ,
+           'SALARY_API_MODELS_DIR': str(artifacts_dir),
+           'SALARY_API_TABLE_MODE': '0'}
+    command = [sys.executable, '-m', 'app.serve', '--port', str(port), '--workers', str(n_workers)]
+    if mode == 'preload':
+        command.append('--preload')
+
+    server = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    try:
+        with httpx.Client(timeout=60) as client:
+            wait_ready(client, url, n_workers)
+        rows_per_sec = load_test(url, duration, concurrency, make_records(100))
+        rss, pss = memory_mb(process_tree(server.pid))
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    return {'rss_mb': rss, 'pss_mb': pss, 'rows_per_sec': rows_per_sec}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', choices=['rf', 'gb', 'hgb'], default='rf')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--duration', type=float, default=5.0, help='секунд навантаження на конфігурацію')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as artifacts_dir:
+        build_model_artifacts(Path(artifacts_dir), regressor=make_regressor(args.model), model_name=args.model)
+        size_mb = os.path.getsize(Path(artifacts_dir) / 'best_model.pkl') / 1e6
+        print(f'model: {args.model}, best_model.pkl {size_mb:.1f} MB, cpus: {os.cpu_count()}')
+        print(f"{'mode':<14}{'workers':>8}{'RSS sum, MB':>14}{'PSS sum, MB':>14}{'rows/sec':>12}")
+
+        for n_workers in args.workers:
+            for mode in args.modes:
+                result = run_server(artifacts_dir, mode, n_workers, args.duration, args.concurrency)
+                print(f"{mode:<14}{n_workers:>8}{result['rss_mb']:>14.0f}"
+                      f"{result['pss_mb']:>14.0f}{result['rows_per_sec']:>12.0f}", flush=True)
+
+if __name__ == '__main__':
+    main()
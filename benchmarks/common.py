@@ -0,0 +1,86 @@
+import json
+import time
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.utils.paths import CONFIG_DIR
+from src.data.configs.experience_mapping import EXPERIENCE_RANGES
+
+# артефакти бенчмарків інференсу; models/ (продакшн-модель) бенчмарки не перезаписують
+BENCHMARK_MODELS_DIR = Path(tempfile.gettempdir()) / 'salary-benchmark-models'
+
+def make_clean_frame(n_rows: int, random_state: int = 25) -> pd.DataFrame:
+    """
+    Синтетичний датафрейм у форматі після мапінгу (seniority/experience/salary)
+    """
+    rng = np.random.default_rng(random_state)
+    levels = list(EXPERIENCE_RANGES.keys())
+
+    return pd.DataFrame({
+        'salary_usd': np.round(rng.lognormal(mean=7.8, sigma=0.7, size=n_rows)),
+        'seniority_level': rng.choice(levels, size=n_rows),
+        'experience_years': np.round(rng.uniform(0, 30, size=n_rows) * 4) / 4,
+    })
+
+def make_records(n_rows: int, random_state: int = 25) -> list:
+    """Валідні запити до API (dict на запис) зі значень allowed_values.json"""
+    rng = np.random.default_rng(random_state)
+    allowed = json.load(open(CONFIG_DIR / 'allowed_values.json'))
+
+    return [
+        {'job_category': str(rng.choice(allowed['job_category'])),
+         'seniority_level': str(rng.choice(allowed['seniority_level'])),
+         'english_level': str(rng.choice(allowed['english_level'])),
+         'experience_years': int(rng.integers(0, 20))}
+        for _ in range(n_rows)
+    ]
+
+def time_call(func, *args, repeat: int = 3, **kwargs) -> float:
+    """Найкращий час виконання (сек) серед 'repeat' запусків"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def build_model_artifacts(output_dir=None, input_csv=None, regressor=None, model_name='HistGBM'):
+    """
+    Швидке тренування пайплайну (за замовчуванням HistGBM з дефолтними параметрами)
+    на сирих даних і збереження best_model.pkl + model_metadata.pkl для бенчмарків інференсу.
+    """
+    import joblib
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.pipeline import Pipeline
+
+    from src.utils.paths import DATA_DIR
+    from src.pipeline import preprocces_data, prepare_training_data
+
+    output_dir = Path(output_dir or BENCHMARK_MODELS_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    input_csv = input_csv or DATA_DIR / 'raw/2025_june_raw.csv'
+
+    df = preprocces_data(input_csv, save_data=False)
+    data_bundle, preprocessor = prepare_training_data(df, 'salary_usd', 0.8)
+    pipeline = Pipeline([
+        ('preprocessor', preprocessor),
+        ('regressor', HistGradientBoostingRegressor(random_state=25) if regressor is None else regressor)
+    ]).fit(data_bundle['X_train'], data_bundle['y_train'])
+
+    test_r2 = pipeline.score(data_bundle['X_test'], data_bundle['y_test'])
+    joblib.dump(pipeline, output_dir / 'best_model.pkl')
+    joblib.dump({'model_name': model_name, 'test_R2': round(test_r2, 2), 'params': {}},
+                output_dir / 'model_metadata.pkl')
+    return output_dir
+
+def ensure_model_artifacts(output_dir=None) -> Path:
+    """
+    Директорія з артефактами для бенчмарків (за замовчуванням BENCHMARK_MODELS_DIR);
+    швидка модель тренується, якщо їх там ще немає
+    """
+    output_dir = Path(output_dir or BENCHMARK_MODELS_DIR)
+    if not (output_dir / 'best_model.pkl').exists():
+        build_model_artifacts(output_dir)
+    return output_dir
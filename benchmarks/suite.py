@@ -0,0 +1,263 @@
+"""
+Набір бенчмарків з JSON-базою для пошуку регресій. На синтетичному сирому CSV
+(benchmarks.synthetic, --rows рядків) вимірюються:
+- preprocessing: кожна функція src/data/preprocessing.py (ланцюжок як у
+  preprocces_data до графа) і preprocces_data цілком (граф і потоковий режим)
+- encoders: fit / transform TargetEncoder і FrequencyEncoder
+- training: run_training окремо для кожної моделі
+- serving: SalaryPredictor.predict на батчах 1..100k рядків
+
+Для кожного виміру зберігається найкращий час серед --repeat запусків
+(training - один запуск).
+
+Запуск:
+    python -m benchmarks.suite run --rows 20000 --output benchmarks/baseline.json
+    python -m benchmarks.suite run --groups preprocessing serving --baseline benchmarks/baseline.json
+    python -m benchmarks.suite compare benchmarks/baseline.json logs/benchmarks/<час>.json --threshold 0.2
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, UTC
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.utils.paths import LOGS_DIR, PROJECT_ROOT
+from src.data import preprocessing
+from src.data.feature_engineering import standardization_job_category
+from src.scripts.encoders import TargetEncoder, FrequencyEncoder
+from src.pipeline import preprocces_data, prepare_training_data
+from src.models.train_model import run_training
+from src.models.configs.regression_models import REGRESSION_MODELS
+from models.salary_predictor import SalaryPredictor
+from benchmarks.common import build_model_artifacts
+from benchmarks.synthetic import write_raw_csv
+
+GROUPS = ('preprocessing', 'encoders', 'training', 'serving')
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+RESULTS_DIR = LOGS_DIR / 'benchmarks'
+
+# ланцюжок функцій препроцесингу: (назва, df -> df)
+PREPROCESSING_STAGES = [
+    ('select_and_rename_features', preprocessing.select_and_rename_features),
+    ('standardization_seniority_features', preprocessing.standardization_seniority_features),
+    ('drop_unspecified_positions', preprocessing.drop_unspecified_positions),
+    ('standardization_job_category', standardization_job_category),
+    ('feature_balancing_category', preprocessing.feature_balancing_category),
+    ('preprocessing_feature_english', preprocessing.preprocessing_feature_english),
+    ('cleaning_outliers_experience', preprocessing.cleaning_outliers_experience),
+    ('cleaning_outliers_salary', preprocessing.cleaning_outliers_salary),
+    ('export_dataframe', lambda df: preprocessing.export_dataframe(df, save=False)),
+]
+
+def _best_time(func, make_input, repeat: int) -> tuple:
+    """
+    (найкращий час у сек, результат останнього запуску); make_input() готує
+    свіжий вхід для кожного запуску поза виміром (функції змінюють df на місці)
+    """
+    best, result = np.inf, None
+    for _ in range(repeat):
+        args = make_input()
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _entry(seconds: float, rows: int, **info) -> dict:
+    return {'seconds': round(seconds, 6), 'rows': rows,
+            'rows_per_s': round(rows / seconds) if seconds > 0 else None, **info}
+
+def bench_preprocessing(raw_csv, repeat: int = 3) -> tuple:
+    """Результати і оброблений датафрейм (вхід для encoders/training)"""
+    results = {}
+    seconds, df = _best_time(lambda: pd.read_csv(raw_csv, encoding='cp1251'), tuple, repeat)
+    results['read_csv'] = _entry(seconds, len(df))
+
+    for name, func in PREPROCESSING_STAGES:
+        rows = len(df)
+        seconds, df = _best_time(func, lambda: (df.copy(),), repeat)
+        results[name] = _entry(seconds, rows, rows_out=len(df))
+
+    seconds, processed = _best_time(lambda: preprocces_data(raw_csv, save_data=False), tuple, repeat)
+    results['preprocces_data'] = _entry(seconds, len(processed))
+    seconds, _ = _best_time(lambda: preprocces_data(raw_csv, save_data=False, chunksize=50_000), tuple, repeat)
+    results['preprocces_data_streaming'] = _entry(seconds, len(processed))
+
+    return results, processed
+
+def bench_encoders(df: pd.DataFrame, repeat: int = 5) -> dict:
+    X = df[['job_category', 'seniority_level', 'english_level']]
+    y = df['salary_usd']
+    results = {}
+    for name, encoder, fit_args in [('TargetEncoder', TargetEncoder(), (X, y)),
+                                    ('FrequencyEncoder', FrequencyEncoder(), (X,))]:
+        seconds, _ = _best_time(encoder.fit, lambda: fit_args, repeat)
+        results[f'{name}.fit'] = _entry(seconds, len(X))
+        seconds, _ = _best_time(encoder.transform, lambda: (X,), repeat)
+        results[f'{name}.transform'] = _entry(seconds, len(X))
+    return results
+
+def bench_training(df: pd.DataFrame, models: list = None, search_mode: str = 'halving') -> dict:
+    """run_training окремо для кожної моделі (один запуск: пошук займає хвилини)"""
+    data_bundle, preprocessor = prepare_training_data(df, 'salary_usd', 0.8)
+    results = {}
+    for name in models or list(REGRESSION_MODELS):
+        start = time.perf_counter()
+        _, model_results = run_training(data_bundle, preprocessor, save_best_model=False,
+                                        search_mode=search_mode, models={name: REGRESSION_MODELS[name]})
+        seconds = time.perf_counter() - start
+        test = next((r for r in model_results if r['dataset_var'] == 'test'), {})
+        results[name] = _entry(seconds, len(data_bundle['X_train']), search_mode=search_mode,
+                               fit_s=test.get('fit_time'), r2=test.get('R2'))
+    return results
+
+def bench_serving(raw_csv, models_dir, batch_sizes: list = BATCH_SIZES, min_calls: int = 3) -> dict:
+    """
+    SalaryPredictor.predict (шлях за замовчуванням) з моделлю HistGBM, натренованою
+    на тому ж синтетичному CSV; малі батчі повторюються, доки сумарно не набереться ~10k рядків
+    """
+    build_model_artifacts(Path(models_dir), input_csv=raw_csv)
+    predictor = SalaryPredictor(model_path=Path(models_dir) / 'best_model.pkl',
+                                metadata_path=Path(models_dir) / 'model_metadata.pkl')
+    predictor.warmup()
+
+    results = {}
+    for batch_size in batch_sizes:
+        batch = predictor._sample_inputs(batch_size, random_state=batch_size)
+        repeat = max(min_calls, min(1_000, 10_000 // batch_size))
+        seconds, _ = _best_time(predictor.predict, lambda: (batch,), repeat)
+        results[f'predict[{batch_size}]'] = _entry(seconds, batch_size, repeat=repeat)
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(rows: int = 20_000,
+              groups: list = GROUPS,
+              models: list = None,
+              batch_sizes: list = BATCH_SIZES,
+              search_mode: str = 'halving',
+              repeat: int = 3,
+              random_state: int = 25) -> dict:
+    """Звіт {метадані запуску, results: {'група/вимір': {seconds, rows, ...}}}"""
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        raise ValueError(f'Unknown benchmark groups {sorted(unknown)}, expected some of {GROUPS}')
+
+    report = {
+        'created_at': datetime.now(UTC).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': {'rows': rows, 'groups': list(groups), 'models': models, 'batch_sizes': list(batch_sizes),
+                    'search_mode': search_mode, 'repeat': repeat, 'random_state': random_state},
+        'results': {},
+    }
+    results = report['results']
+
+    with tempfile.TemporaryDirectory(prefix='bench_suite_') as tmp:
+        raw_csv = write_raw_csv(Path(tmp) / 'raw.csv', rows, random_state)
+
+        # encoders/training працюють на обробленому датафреймі
+        stage_results, df = bench_preprocessing(raw_csv, repeat)
+        if 'preprocessing' in groups:
+            results.update({f'preprocessing/{name}': entry for name, entry in stage_results.items()})
+        if 'encoders' in groups:
+            results.update({f'encoders/{name}': entry for name, entry in bench_encoders(df, repeat).items()})
+        if 'training' in groups:
+            results.update({f'training/{name}': entry
+                            for name, entry in bench_training(df, models, search_mode).items()})
+        if 'serving' in groups:
+            results.update({f'serving/{name}': entry
+                            for name, entry in bench_serving(raw_csv, tmp, batch_sizes, repeat).items()})
+
+    return report
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.2) -> list:
+    """
+    Виміри, присутні в обох звітах: [{name, baseline_s, current_s, change, regression}],
+    regression - час зріс більше ніж на threshold (частка від базового).
+    """
+    rows = []
+    for name, entry in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        before, after = baseline['results'][name]['seconds'], entry['seconds']
+        change = after / before - 1 if before else None
+        rows.append({'name': name, 'baseline_s': before, 'current_s': after,
+                     'change': None if change is None else round(change, 3),
+                     'regression': change is not None and change > threshold})
+    return rows
+
+def print_results(report: dict):
+    print(f"{'benchmark':<50}{'rows':>10}{'time, ms':>14}{'rows/s':>14}")
+    for name, entry in report['results'].items():
+        rows_per_s = entry['rows_per_s'] if entry['rows_per_s'] is not None else float('nan')
+        print(f"{name:<50}{entry['rows']:>10}{entry['seconds'] * 1e3:>14.3f}{rows_per_s:>14.0f}")
+
+def print_comparison(comparison: list, threshold: float):
+    print(f"{'benchmark':<50}{'baseline, ms':>14}{'current, ms':>14}{'change':>9}")
+    for row in comparison:
+        change = '' if row['change'] is None else format(row['change'], '+.0%')
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['name']:<50}{row['baseline_s'] * 1e3:>14.3f}{row['current_s'] * 1e3:>14.3f}{change:>9}{flag}")
+    n_regressions = sum(row['regression'] for row in comparison)
+    print(f'{n_regressions} regressions above {threshold:.0%}' if n_regressions else 'No regressions')
+
+def _load(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='виконати бенчмарки і зберегти JSON')
+    run.add_argument('--rows', type=int, default=20_000, help='рядків у синтетичному сирому CSV')
+    run.add_argument('--groups', nargs='+', default=list(GROUPS), choices=GROUPS)
+    run.add_argument('--models', nargs='+', default=None, help='моделі для training (за замовчуванням усі)')
+    run.add_argument('--batch-sizes', type=int, nargs='+', default=BATCH_SIZES)
+    run.add_argument('--search-mode', default='halving')
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--output', default=None, help='за замовчуванням logs/benchmarks/<час запуску>.json')
+    run.add_argument('--baseline', default=None, help='порівняти з цим JSON після запуску')
+    run.add_argument('--threshold', type=float, default=0.2)
+
+    compare = subparsers.add_parser('compare', help='регресії між двома JSON')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_suite(args.rows, args.groups, args.models, args.batch_sizes,
+                           args.search_mode, args.repeat)
+        output = Path(args.output) if args.output else RESULTS_DIR / f'{datetime.now(UTC):%Y%m%dT%H%M%S}.json'
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print_results(report)
+        print(f'Saved to {output}')
+        if args.baseline is None:
+            return 0
+        baseline, current = _load(args.baseline), report
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    comparison = compare_results(baseline, current, args.threshold)
+    print_comparison(comparison, args.threshold)
+    return 1 if any(row['regression'] for row in comparison) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
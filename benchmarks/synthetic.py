@@ -0,0 +1,138 @@
+"""
+Синтетичні сирі дані опитування для бенчмарків: усі колонки сирого CSV
+(реальні заголовки, cp1251), значення - з мапінгів src/data/configs.
+
+Запуск (файл на 100k рядків):
+    python -m benchmarks.synthetic --rows 100000 --output /tmp/raw_100k.csv
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.data.preprocessing import RAW_FEATURES, EXCLUDED_ENGLISH_LEVEL
+from src.data.configs.categories_mapping import JOB_CATEGORY_MAPPING
+from src.data.configs.seniority_mapping import SENIORITY_LEVEL_MAPPING
+from src.data.configs.experience_mapping import EXPERIENCE_RANGES
+from src.data.configs.salary_mapping import SALARY_RANGES
+
+RAW_COLUMNS = {name: raw for raw, name in RAW_FEATURES.items()}
+
+# колонки сирого CSV у порядку вивантаження; None - колонка з RAW_FEATURES
+SURVEY_COLUMNS = {
+    'Submitted at': None,
+    'Ваша основна зайнятість в ІТ зараз...': ['Працюю в ІТ', 'Фріланс', 'Власний бізнес'],
+    RAW_COLUMNS['salary_usd']: None,
+    'Всі бонуси (на місяць)': [0.0, 0.0, 0.0, 100.0, 500.0],
+    RAW_COLUMNS['seniority_level']: None,
+    'Категорія': None,
+    RAW_COLUMNS['position']: None,
+    'У якій сфері проєкт, в якому ви зараз працюєте?': ['Fintech', 'E-commerce', 'Healthcare', 'Gamedev'],
+    'Вкажіть вашу основну спеціалізацію': ['Back-end', 'Front-end', 'Fullstack', None],
+    'Чи використовуєте ви у своїй роботі мови програмування (одну чи декілька)?':
+        ['Так, використовую', 'Ні, не використовую'],
+    'Основна мова програмування': ['Python', 'Java', 'JavaScript', 'C#', None],
+    'Основний напрям роботи компанії, в якій працюєте': ['Продуктова', 'Аутсорсингова', 'Аутстафінгова'],
+    'Кількість спеціалістів у вашій компанії в Україні': ['до 50', '51-200', '201-1000', 'понад 1000'],
+    RAW_COLUMNS['experience_years']: None,
+    RAW_COLUMNS['english_level']: None,
+    'Де ви зараз живете?': ['В Україні', 'За кордоном'],
+    'За яким напрямом ви навчалися / навчаєтеся у виші?': ['Комп\'ютерні науки', 'Інженерія', 'Економіка'],
+    'Ваш вік': [22.0, 27.0, 31.0, 36.0, 44.0],
+}
+
+ENGLISH_LEVELS = ['Upper-Intermediate', 'Intermediate', 'Advanced', 'Pre-Intermediate', 'Elementary']
+ENGLISH_WEIGHTS = [0.46, 0.28, 0.15, 0.09, 0.02]
+
+def _positions_by_category() -> dict:
+    positions = {}
+    for position, category in JOB_CATEGORY_MAPPING.items():
+        positions.setdefault(category, []).append(position)
+    return positions
+
+def make_raw_survey(n_rows: int,
+                    random_state: int = 25,
+                    outlier_share: float = 0.05,
+                    noise_share: float = 0.02) -> pd.DataFrame:
+    """
+    Сирий датафрейм опитування на n_rows рядків.
+
+    - посада: ~половина - Software Engineering, ~15% - QA (як у реальному вивантаженні,
+      щоб балансування мало що відсікати), решта - рівномірно по інших категоріях
+    - досвід і зарплата - з typical_range рівня (EXPERIENCE_RANGES / SALARY_RANGES),
+      outlier_share рядків - з outlier_range / поза межами досвіду
+    - noise_share рядків отримують 'Немає тайтлу', EXCLUDED_ENGLISH_LEVEL
+      або порожню зарплату (ті, що відкидає препроцесинг)
+    """
+    rng = np.random.default_rng(random_state)
+    positions = _positions_by_category()
+    categories = list(positions)
+    weights = np.array([0.5 if c == 'Software Engineering' else 0.15 if c == 'QA & Testing' else 0.0
+                        for c in categories])
+    weights[weights == 0] = (1 - weights.sum()) / (weights == 0).sum()
+
+    category = rng.choice(categories, size=n_rows, p=weights)
+    position = np.empty(n_rows, dtype=object)
+    for name in categories:
+        rows = category == name
+        position[rows] = rng.choice(np.array(positions[name], dtype=object), size=rows.sum())
+
+    raw_titles = [title for title, level in SENIORITY_LEVEL_MAPPING.items() if level in SALARY_RANGES]
+    title = rng.choice(raw_titles, size=n_rows).astype(object)
+    level = pd.Series(title).map(SENIORITY_LEVEL_MAPPING).to_numpy()
+
+    salary = np.empty(n_rows)
+    experience = np.empty(n_rows)
+    outlier = rng.random(n_rows) < outlier_share
+    for name in SALARY_RANGES:
+        rows = level == name
+        n = rows.sum()
+        low, high = SALARY_RANGES[name]['typical_range']
+        out_low, out_high = SALARY_RANGES[name]['outlier_range']
+        salary[rows] = np.where(outlier[rows], rng.uniform(out_low * 0.5, out_high * 1.5, n),
+                                rng.uniform(low, high, n))
+        low, high = EXPERIENCE_RANGES[name]['typical_range']
+        experience[rows] = np.where(outlier[rows], rng.uniform(0, 30, n), rng.uniform(low, high, n))
+    salary = np.round(salary, -1)
+    experience = np.round(experience * 2) / 2 # крок 0.5 року, як в анкеті
+
+    english = rng.choice(ENGLISH_LEVELS, size=n_rows, p=ENGLISH_WEIGHTS).astype(object)
+
+    # рядки, що відкидаються препроцесингом
+    noise = rng.random(n_rows) < noise_share
+    kind = rng.integers(0, 3, size=n_rows)
+    title[noise & (kind == 0)] = 'Немає тайтлу'
+    english[noise & (kind == 1)] = EXCLUDED_ENGLISH_LEVEL
+    salary[noise & (kind == 2)] = np.nan
+
+    generated = {
+        'Submitted at': (pd.Timestamp('2025-05-20') + pd.to_timedelta(rng.integers(0, 14 * 86_400, n_rows), unit='s')
+                         ).strftime('%Y-%m-%d %H:%M:%S'),
+        RAW_COLUMNS['salary_usd']: salary,
+        RAW_COLUMNS['seniority_level']: title,
+        'Категорія': category,
+        RAW_COLUMNS['position']: position,
+        RAW_COLUMNS['experience_years']: experience,
+        RAW_COLUMNS['english_level']: english,
+    }
+    return pd.DataFrame({
+        col: generated[col] if values is None else rng.choice(np.array(values, dtype=object), size=n_rows)
+        for col, values in SURVEY_COLUMNS.items()
+    })
+
+def write_raw_csv(path, n_rows: int, random_state: int = 25, **kwargs):
+    """Сирий CSV у форматі вивантаження (cp1251); повертає шлях"""
+    make_raw_survey(n_rows, random_state, **kwargs).to_csv(path, index=False, encoding='cp1251')
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--seed', type=int, default=25)
+    args = parser.parse_args()
+
+    write_raw_csv(args.output, args.rows, args.seed)
+    print(f'{args.rows} rows -> {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""
+Пакетний скоринг великих файлів: вхід (CSV / Parquet / JSONL) читається чанками,
+кожен чанк валідується і передбачається векторно (SalaryPredictor.predict_batch),
+результат дописується у вихідний файл одразу. Пам'ять обмежена розміром чанку
+(і кількістю чанків у польоті при workers > 1), а не розміром файлу.
+
+- output: рядки, що пройшли валідацію - 'row' (номер рядка у вхідному файлі),
+  вхідні колонки і 'prediction'
+- rejects: невалідні рядки (пропуски, невідомі категорії, нечислові значення
+  числових фіч) - 'row', вхідні колонки і 'error' (опис як у /predict/batch);
+  файл створюється лише за наявності відмов
+Типи колонок виходу не залежать від чанку: числові фічі - float (нечислове
+значення у відмовах стає порожнім, оригінал - в 'error'), категоріальні - рядки.
+Формат виходу визначається розширенням; файли пишуться у *.tmp і з'являються
+під своїм ім'ям лише після успішного завершення.
+
+Запуск:
+    python -m models.bulk_scoring input.csv predictions.parquet --chunksize 50000 --workers 4
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.utils.paths import MODELS_DIR, CONFIG_DIR
+from src.utils.profiling import ResourceUsage
+from models.salary_predictor import SalaryPredictor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKSIZE = 50_000
+FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+ROW_COLUMN = 'row'
+PREDICTION_COLUMN = 'prediction'
+ERROR_COLUMN = 'error'
+
+def file_format(path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Unsupported file format '{suffix}', expected one of {sorted(FORMATS)}")
+    return FORMATS[suffix]
+
+def iter_chunks(path, chunksize: int = DEFAULT_CHUNKSIZE, encoding: str = 'utf-8'):
+    """DataFrame-чанки по chunksize рядків; весь файл у пам'ять не читається"""
+    fmt = file_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+
+    if fmt == 'csv':
+        reader = pd.read_csv(path, chunksize=chunksize, encoding=encoding)
+    else:
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype=False, encoding=encoding)
+    with reader:
+        yield from reader
+
+def feature_types(config_path=CONFIG_DIR / 'column_features.json') -> dict:
+    """{фіча моделі: 'numeric' | 'categorical'} з column_features.json"""
+    with open(config_path) as f:
+        return json.load(f)['types']
+
+def output_types(features: dict) -> dict:
+    """Типи (аліаси pyarrow) службових колонок і фіч у вихідних файлах"""
+    return {
+        ROW_COLUMN: 'int64', PREDICTION_COLUMN: 'int64', ERROR_COLUMN: 'string',
+        **{col: 'float64' if kind == 'numeric' else 'string' for col, kind in features.items()},
+    }
+
+def normalize_features(chunk: pd.DataFrame, features: dict) -> pd.DataFrame:
+    """
+    Фічі чанку у типах output_types: нечислові значення числових колонок -> NaN
+    (такі рядки вже у відмовах), нерядкові значення категоріальних -> str.
+    Колонки, що вже мають потрібний тип, не перетворюються.
+    """
+    converted = {}
+    for col, kind in features.items():
+        if col not in chunk.columns:
+            continue
+        column = chunk[col]
+        if kind == 'numeric':
+            if not pd.api.types.is_numeric_dtype(column):
+                converted[col] = pd.to_numeric(column, errors='coerce')
+        elif not pd.api.types.is_string_dtype(column):
+            converted[col] = column.astype(object).where(column.isnull(), column.astype(str))
+    return chunk.assign(**converted)
+
+class ChunkWriter:
+    """
+    Інкрементальний запис чанків у path.tmp (CSV / JSONL - дописуванням,
+    Parquet - row group на чанк); close() перейменовує файл у path, abort() - видаляє.
+
+    Схема Parquet фіксується до запису: column_types ({колонка: аліас pyarrow,
+    напр. 'float64'}) - для відомих колонок, для решти - типи першого чанку,
+    де цілі розширені до float64 (наступний чанк може мати дробові значення або NaN),
+    а колонки без жодного значення - рядкові.
+    """
+
+    def __init__(self, path, encoding: str = 'utf-8', column_types: dict = None):
+        self.path = Path(path)
+        self.format = file_format(path)
+        self.encoding = encoding
+        self.column_types = column_types or {}
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.rows = 0
+        self._file = None
+        self._parquet = None
+
+    def write(self, df: pd.DataFrame):
+        if self.format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.tmp_path, self._parquet_schema(df))
+            table = pa.Table.from_pandas(df, schema=self._parquet.schema, preserve_index=False)
+            self._parquet.write_table(table)
+        else:
+            first = self._file is None
+            if first:
+                self._file = open(self.tmp_path, 'w', encoding=self.encoding, newline='')
+            if self.format == 'csv':
+                df.to_csv(self._file, index=False, header=first)
+            else:
+                df.to_json(self._file, orient='records', lines=True, force_ascii=False)
+        self.rows += len(df)
+
+    def _parquet_schema(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        # без pandas-метаданих: вони записали б dtype першого чанку
+        schema = pa.Schema.from_pandas(df, preserve_index=False).remove_metadata()
+        for idx, field in enumerate(schema):
+            if field.name in self.column_types:
+                type_ = pa.type_for_alias(self.column_types[field.name])
+            elif pa.types.is_integer(field.type):
+                type_ = pa.float64()
+            elif pa.types.is_null(field.type):
+                type_ = pa.string()
+            else:
+                continue
+            schema = schema.set(idx, field.with_type(type_))
+        return schema
+
+    def _close_file(self) -> bool:
+        handle = self._parquet or self._file
+        if handle is not None:
+            handle.close()
+        return handle is not None
+
+    def close(self):
+        if self._close_file():
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self._close_file():
+            self.tmp_path.unlink(missing_ok=True)
+
+def split_chunk(chunk: pd.DataFrame, offset: int, predictions: np.ndarray, row_errors: pd.Series) -> tuple:
+    """(передбачені рядки, відмови) чанку з глобальними номерами рядків"""
+    chunk = chunk.reset_index(drop=True)
+    chunk.insert(0, ROW_COLUMN, np.arange(offset, offset + len(chunk)))
+    rejected = chunk.index.isin(row_errors.index)
+
+    scored = chunk[~rejected].assign(**{PREDICTION_COLUMN: predictions[~rejected].astype(np.int64)})
+    rejects = chunk[rejected].assign(**{ERROR_COLUMN: row_errors.reindex(chunk.index[rejected]).to_numpy()})
+    return scored, rejects
+
+# ---------- пул процесів ----------
+_worker_predictor = None
+
+def _init_worker(predictor_kwargs: dict):
+    global _worker_predictor
+    _worker_predictor = SalaryPredictor(**predictor_kwargs)
+
+def _predict_chunk(chunk: pd.DataFrame) -> tuple:
+    return _worker_predictor.predict_batch(chunk)
+
+def _scored_chunks(chunks, predictor_kwargs: dict, workers: int):
+    """
+    (чанк, predictions, row_errors) у порядку вхідного файлу. При workers > 1
+    чанки передбачаються у пулі процесів; у польоті щонайбільше 2 * workers чанків,
+    щоб читання не випереджало запис і пам'ять не росла.
+    """
+    if workers <= 1:
+        predictor = SalaryPredictor(**predictor_kwargs)
+        for chunk in chunks:
+            yield (chunk, *predictor.predict_batch(chunk))
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(predictor_kwargs,)) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append((chunk, pool.submit(_predict_chunk, chunk)))
+            if len(in_flight) >= 2 * workers:
+                chunk, future = in_flight.popleft()
+                yield (chunk, *future.result())
+        while in_flight:
+            chunk, future = in_flight.popleft()
+            yield (chunk, *future.result())
+
+def default_rejects_path(output_path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(f'{output_path.stem}_rejects{output_path.suffix}')
+
+def score_file(input_path,
+               output_path,
+               rejects_path=None,
+               chunksize: int = DEFAULT_CHUNKSIZE,
+               workers: int = 1,
+               encoding: str = 'utf-8',
+               **predictor_kwargs) -> dict:
+    """
+    Скоринг input_path у output_path (+ відмови у rejects_path, за замовчуванням
+    <output>_rejects.<ext>). predictor_kwargs передаються у SalaryPredictor
+    (model_path, metadata_path, table_mode, ...).
+
+    Повертає звіт: rows, scored, rejected, chunks, elapsed_s, rows_per_s, peak_rss_mb
+    (пік RSS головного процесу; воркери пулу сюди не входять).
+    """
+    predictor_kwargs.setdefault('model_path', MODELS_DIR / 'best_model.pkl')
+    predictor_kwargs.setdefault('metadata_path', MODELS_DIR / 'model_metadata.pkl')
+    rejects_path = rejects_path or default_rejects_path(output_path)
+    features = feature_types()
+    column_types = output_types(features)
+
+    writer = ChunkWriter(output_path, encoding, column_types)
+    rejects_writer = ChunkWriter(rejects_path, encoding, column_types)
+    rows = n_chunks = 0
+
+    try:
+        with ResourceUsage() as usage:
+            chunks = iter_chunks(input_path, chunksize, encoding)
+            for chunk, predictions, row_errors in _scored_chunks(chunks, predictor_kwargs, workers):
+                scored, rejects = split_chunk(normalize_features(chunk, features), rows, predictions, row_errors)
+                writer.write(scored)
+                if len(rejects):
+                    rejects_writer.write(rejects)
+                rows += len(chunk)
+                n_chunks += 1
+                logger.debug(f'Chunk {n_chunks}: {len(scored)} scored, {len(rejects)} rejected')
+    except BaseException:
+        writer.abort()
+        rejects_writer.abort()
+        raise
+    writer.close()
+    rejects_writer.close()
+
+    report = {
+        'rows': rows,
+        'scored': writer.rows,
+        'rejected': rejects_writer.rows,
+        'chunks': n_chunks,
+        'workers': workers,
+        'elapsed_s': round(usage.wall_s, 3),
+        'rows_per_s': round(rows / usage.wall_s) if usage.wall_s > 0 else None,
+        'peak_rss_mb': usage.as_dict()['peak_rss_mb'],
+    }
+    logger.info(f'Bulk scoring {input_path} -> {output_path}: {report}')
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='CSV / Parquet / JSONL з колонками фіч моделі')
+    parser.add_argument('output', help='CSV / Parquet / JSONL з передбаченнями')
+    parser.add_argument('--rejects', default=None, help='файл відмов (за замовчуванням <output>_rejects.<ext>)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--workers', type=int, default=1, help='процесів пулу для передбачення чанків')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--models-dir', type=Path, default=MODELS_DIR)
+    args = parser.parse_args(argv)
+
+    report = score_file(args.input, args.output, args.rejects, args.chunksize, args.workers, args.encoding,
+                        model_path=args.models_dir / 'best_model.pkl',
+                        metadata_path=args.models_dir / 'model_metadata.pkl')
+
+    print(f"Scored {report['scored']} of {report['rows']} rows ({report['rejected']} rejected) "
+          f"in {report['elapsed_s']:.2f} s: {report['rows_per_s']} rows/s, "
+          f"{report['chunks']} chunks, peak RSS {report['peak_rss_mb']} MB")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import threading
+from time import perf_counter_ns
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CompiledPipeline:
+    """
+    Інференс одного запису без pandas: fitted ColumnTransformer розгортається
+    у прості NumPy-операції над заздалегідь виділеним вектором ознак.
+
+    - числові гілки (StandardScaler) -> (x - mean) / scale
+    - категоріальні гілки (енкодер + scaler) -> таблиця {категорія: готове значення},
+      обчислена самим fitted трансформером на всіх допустимих значеннях
+
+    Після цього регресор викликається напряму на векторі ознак.
+    """
+
+    def __init__(self, pipeline, config_values: dict, config_features: dict):
+        preprocessor = pipeline.named_steps['preprocessor']
+        self.regressor = pipeline.named_steps['regressor']
+        self.feature_cols = list(config_features['columns'])
+        self.config_values = config_values
+
+        self.allowed = {
+            col: frozenset(config_values[col])
+            for col, col_type in config_features['types'].items() if col_type == 'categorical'
+        }
+
+        # (позиція в векторі ознак, позиція в записі, параметри)
+        self.numeric_steps = []
+        self.categorical_steps = []
+        # колонка -> фаза для PhaseMetrics (одна гілка ColumnTransformer на колонку)
+        self.phase_names = {}
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == 'remainder':
+                if transformer != 'drop':
+                    raise ValueError("Remainder columns are not supported")
+                continue
+
+            output = preprocessor.output_indices_[name]
+            if len(columns) != 1 or output.stop - output.start != 1:
+                raise ValueError(f"Branch '{name}' must map one column to one feature")
+
+            col = columns[0]
+            record_idx = self.feature_cols.index(col)
+            self.phase_names[col] = f'preprocess.{name}'
+
+            if col in self.allowed:
+                values = sorted(self.allowed[col])
+                encoded = transformer.transform(pd.DataFrame({col: values}))
+                table = dict(zip(values, np.asarray(encoded, dtype=float).ravel().tolist()))
+                self.categorical_steps.append((output.start, record_idx, col, table))
+            elif isinstance(transformer, StandardScaler):
+                mean = float(transformer.mean_[0]) if transformer.with_mean else 0.0
+                scale = float(transformer.scale_[0]) if transformer.with_std else 1.0
+                self.numeric_steps.append((output.start, record_idx, col, mean, scale))
+            else:
+                raise ValueError(f"Unsupported numeric transformer in branch '{name}': "
+                                 f"{type(transformer).__name__}")
+
+        self.n_features = max(step[0] for step in self.numeric_steps + self.categorical_steps) + 1
+        self._local = threading.local()
+
+    def transform_record(self, record, metrics=None) -> np.ndarray:
+        """
+        Вектор ознак (1, n_features) для dict або tuple (у порядку feature_cols).
+        Вектор виділяється один раз на потік і перевикористовується.
+        metrics - PhaseMetrics: час кожної гілки препроцесора як 'preprocess.<гілка>'.
+        """
+        start = perf_counter_ns() if metrics is not None else 0
+        if isinstance(record, dict):
+            record = tuple(record[col] for col in self.feature_cols)
+
+        features = getattr(self._local, 'features', None)
+        if features is None:
+            features = self._local.features = np.empty((1, self.n_features))
+
+        for position, record_idx, col, table in self.categorical_steps:
+            value = record[record_idx]
+            if value not in self.allowed[col]:
+                if value is None:
+                    raise ValueError('Missing values detected in input data')
+                raise ValueError(
+                    f"Invalid values in column '{col}': {[value]}. "
+                    f"Allowed values are: {self.config_values[col]}"
+                )
+            features[0, position] = table[value]
+            if metrics is not None:
+                start = metrics.record(self.phase_names[col], start)
+
+        for position, record_idx, col, mean, scale in self.numeric_steps:
+            value = record[record_idx]
+            if value is None or value != value: # None або NaN
+                raise ValueError('Missing values detected in input data')
+            features[0, position] = (float(value) - mean) / scale
+            if metrics is not None:
+                start = metrics.record(self.phase_names[col], start)
+
+        return features
+
+    def predict_record(self, record) -> float:
+        return float(self.regressor.predict(self.transform_record(record))[0])
+
+    def check_tolerance(self, pipeline, sample: pd.DataFrame) -> float:
+        """Максимальне відхилення від pipeline.predict на sample (DataFrame з feature_cols)"""
+        expected = np.asarray(pipeline.predict(sample[self.feature_cols]), dtype=float)
+        compiled = np.array([
+            self.predict_record(record)
+            for record in sample[self.feature_cols].itertuples(index=False, name=None)
+        ])
+        return float(np.max(np.abs(compiled - expected)))
@@ -0,0 +1,170 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+
+class PredictionCache:
+    """
+    Обмежений LRU-кеш сирих передбачень (float) з опційним TTL.
+
+    Ключ - (версія моделі, *нормалізовані ознаки) (див. SalaryPredictor.cache_key).
+    bind(version) при завантаженні нової моделі прибирає локальні записи інших
+    версій; у спільному backend версія є частиною ключа, тож старі записи просто
+    не читаються і зникають за TTL.
+
+    backend - опційний спільний рівень для кількох воркерів (RedisBackend або
+    DictBackend): промах локального кешу читається з нього, нові значення
+    записуються в обидва рівні.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = None, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self.version = None
+        self._entries = OrderedDict() # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def bind(self, version):
+        """Нова версія моделі: локальні записи попередньої версії більше не потрібні"""
+        with self._lock:
+            if version != self.version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.version = version
+
+    def get_many(self, keys: list) -> list:
+        """Значення для keys (None - промах в обох рівнях)"""
+        now = time.monotonic()
+        values = [None] * len(keys)
+        local_misses = []
+
+        with self._lock:
+            for idx, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is not None and entry[1] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    local_misses.append(idx)
+                    continue
+                self._entries.move_to_end(key)
+                values[idx] = entry[0]
+                self.hits += 1
+
+        if local_misses and self.backend is not None:
+            shared = self.backend.get_many([keys[idx] for idx in local_misses])
+            found = [(idx, value) for idx, value in zip(local_misses, shared) if value is not None]
+            for idx, value in found:
+                values[idx] = value
+            self._store([(keys[idx], value) for idx, value in found])
+            self.backend_hits += len(found)
+            local_misses = [idx for idx in local_misses if values[idx] is None]
+
+        with self._lock:
+            self.misses += len(local_misses)
+        return values
+
+    def get(self, key):
+        return self.get_many([key])[0]
+
+    def set_many(self, items: list):
+        """items - [(key, value)]; записуються локально і в backend"""
+        self._store(items)
+        if self.backend is not None and items:
+            self.backend.set_many(items, self.ttl)
+
+    def set(self, key, value: float):
+        self.set_many([(key, value)])
+
+    def _store(self, items: list):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.backend_hits + self.misses
+        return {
+            'version': self.version,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'backend': type(self.backend).__name__ if self.backend is not None else None,
+            'hits': self.hits,
+            'backend_hits': self.backend_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'hit_rate': round((self.hits + self.backend_hits) / lookups, 4) if lookups else None,
+        }
+
+def _serialize_key(prefix: str, key: tuple) -> str:
+    return f"{prefix}:{json.dumps(key, separators=(',', ':'), ensure_ascii=False)}"
+
+class RedisBackend:
+    """
+    Спільний рівень PredictionCache у Redis (або сумісному сервері).
+    client - redis.Redis або будь-що з mget і pipeline().set(name, value, ex=...).
+    """
+
+    def __init__(self, client, prefix: str = 'salary-prediction'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisBackend':
+        import redis # опційна залежність - лише для спільного кешу
+
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get_many(self, keys: list) -> list:
+        values = self.client.mget([_serialize_key(self.prefix, key) for key in keys])
+        return [None if value is None else float(value) for value in values]
+
+    def set_many(self, items: list, ttl: float = None):
+        pipeline = self.client.pipeline()
+        for key, value in items:
+            pipeline.set(_serialize_key(self.prefix, key), repr(float(value)),
+                         ex=int(ttl) if ttl is not None else None)
+        pipeline.execute()
+
+class DictBackend:
+    """Локальна заміна RedisBackend (один процес): для тестів і бенчмарків"""
+
+    def __init__(self):
+        self.data = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list) -> list:
+        now = time.monotonic()
+        with self._lock:
+            entries = [self.data.get(key) for key in keys]
+        return [entry[0] if entry is not None and (entry[1] is None or entry[1] > now) else None
+                for entry in entries]
+
+    def set_many(self, items: list, ttl: float = None):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            for key, value in items:
+                self.data[key] = (value, expires_at)
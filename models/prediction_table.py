@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from bisect import bisect_right
+from itertools import product
+import logging
+
+from src.data.categories import recode
+
+logger = logging.getLogger(__name__)
+
+# цілі роки досвіду, відповідає experience_years: int у app/schemas.InputData
+DEFAULT_EXPERIENCE_GRID = np.arange(0, 41, dtype=float)
+
+class PredictionTable:
+    """
+    Передобчислена сітка передбачень моделі:
+    усі комбінації категоріальних фіч з allowed_values.json x сітка experience_years.
+
+    Значення зберігаються у щільному масиві (job_category, seniority_level,
+    english_level, experience), тому lookup - це лише арифметика індексів без sklearn.
+    """
+
+    def __init__(self,
+                 model,
+                 config_values: dict,
+                 feature_cols: list,
+                 experience_grid=DEFAULT_EXPERIENCE_GRID,
+                 interpolate: bool = False):
+        self.feature_cols = feature_cols
+        self.categorical_cols = [c for c in feature_cols if c != 'experience_years']
+        self.categories = {col: list(config_values[col]) for col in self.categorical_cols}
+        self.experience_grid = np.asarray(sorted(experience_grid), dtype=float)
+        self.interpolate = interpolate
+
+        # категорія -> індекс осі; досвід -> індекс точки сітки
+        self.category_index = {
+            col: {value: idx for idx, value in enumerate(values)}
+            for col, values in self.categories.items()
+        }
+        self.experience_index = {value: idx for idx, value in enumerate(self.experience_grid.tolist())}
+
+        self.values = self._evaluate(model)
+
+    def _evaluate(self, model) -> np.ndarray:
+        """Один model.predict на повному декартовому добутку"""
+        axes = [self.categories[col] for col in self.categorical_cols] + [self.experience_grid.tolist()]
+        grid = pd.DataFrame(list(product(*axes)),
+                            columns=self.categorical_cols + ['experience_years'])
+
+        predictions = model.predict(grid[self.feature_cols])
+        shape = tuple(len(axis) for axis in axes)
+        logger.info(f"Prediction table built: shape {shape}, {predictions.size} points.")
+
+        return np.asarray(predictions, dtype=float).reshape(shape)
+
+    def lookup_one(self, record):
+        """
+        Передбачення для одного запису (dict або tuple у порядку feature_cols);
+        None, якщо досвід поза сіткою (або між точками сітки без interpolate).
+        KeyError для невідомої категорії.
+        """
+        if not isinstance(record, dict):
+            record = dict(zip(self.feature_cols, record))
+
+        row = self.values[tuple(self.category_index[col][record[col]] for col in self.categorical_cols)]
+        experience = float(record['experience_years'])
+
+        idx = self.experience_index.get(experience)
+        if idx is not None:
+            return float(row[idx])
+
+        grid = self.experience_grid
+        if not self.interpolate or not grid[0] < experience < grid[-1]:
+            return None
+
+        right = bisect_right(grid, experience)
+        weight = (experience - grid[right - 1]) / (grid[right] - grid[right - 1])
+        return float(row[right - 1] + weight * (row[right] - row[right - 1]))
+
+    def lookup(self, X: pd.DataFrame):
+        """
+        Векторизований lookup для валідного DataFrame.
+        Повертає (values, in_grid): для рядків поза сіткою values = NaN.
+        """
+        codes = tuple(recode(X[col], self.categories[col]) for col in self.categorical_cols)
+        experience = X['experience_years'].to_numpy(dtype=float)
+        grid = self.experience_grid
+
+        # позиція точки сітки зліва від досвіду
+        left = np.clip(np.searchsorted(grid, experience, side='right') - 1, 0, len(grid) - 1)
+        on_grid = grid[left] == experience
+
+        values = np.full(len(X), np.nan)
+        values[on_grid] = self.values[tuple(c[on_grid] for c in codes) + (left[on_grid],)]
+
+        between = ~on_grid & (experience > grid[0]) & (experience < grid[-1])
+        if self.interpolate and between.any():
+            row_codes = tuple(c[between] for c in codes)
+            left_b = left[between]
+            low = self.values[row_codes + (left_b,)]
+            high = self.values[row_codes + (left_b + 1,)]
+            weight = (experience[between] - grid[left_b]) / (grid[left_b + 1] - grid[left_b])
+            values[between] = low + weight * (high - low)
+
+        return values, ~np.isnan(values)
+
+    def check_tolerance(self, model, n_samples: int = 200, random_state: int = 25) -> float:
+        """
+        Максимальне абсолютне відхилення таблиці від моделі
+        на випадкових точках сітки; з interpolate половина точок - довільний
+        досвід між крайніми точками сітки (перевіряється сама інтерполяція).
+        """
+        rng = np.random.default_rng(random_state)
+        sample = pd.DataFrame({
+            col: rng.choice(self.categories[col], n_samples) for col in self.categorical_cols
+        })
+        grid = self.experience_grid
+        experience = rng.choice(grid, n_samples)
+        if self.interpolate and len(grid) > 1:
+            experience[::2] = rng.uniform(grid[0], grid[-1], len(experience[::2]))
+        sample['experience_years'] = experience
+        sample = sample[self.feature_cols]
+
+        table_values, _ = self.lookup(sample)
+        model_values = np.asarray(model.predict(sample), dtype=float)
+
+        return float(np.max(np.abs(table_values - model_values)))
@@ -7,32 +7,94 @@ from pathlib import Path
 import json
 from datetime import datetime, UTC
 import os
+import time
+from time import perf_counter_ns
+from itertools import compress, repeat
 
-from src.utils.paths import DATA_DIR, MODELS_DIR, LOGS_DIR
+from src.utils.paths import DATA_DIR, MODELS_DIR, LOGS_DIR, CONFIG_DIR
+from src.data.categories import category_dtypes, as_fixed_categorical
+from src.models.registry import artifact_version
+from sklearn.compose import ColumnTransformer
+from models.prediction_table import PredictionTable, DEFAULT_EXPERIENCE_GRID
+from models.compiled_inference import CompiledPipeline
+from models.tree_ensemble import TreeEnsemble, export_tree_ensemble
+
+# до цього розміру батчу NumPy-обхід дерев швидший за predict sklearn/XGBoost
+# (benchmarks/bench_tree_ensemble.py); більші батчі йдуть у модель
+TREE_MAX_BATCH = 256
 
 logging.basicConfig(level=logging.INFO,
                     format= "%(asctime)s | %(levelname)s | %(name)s | %(message)s")
 logger = logging.getLogger(__name__)
 
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
 class SalaryPredictor:
-    def __init__(self, model_path = MODELS_DIR/"best_model.pkl"):
+    def __init__(self,
+                 model_path = MODELS_DIR/"best_model.pkl",
+                 metadata_path = MODELS_DIR/"model_metadata.pkl",
+                 table_mode: bool = False,
+                 experience_grid = DEFAULT_EXPERIENCE_GRID,
+                 interpolate: bool = False,
+                 table_tolerance: float = 1e-6,
+                 compiled_inference: bool = True,
+                 tree_inference: bool = True,
+                 tree_max_batch: int = TREE_MAX_BATCH,
+                 prediction_cache = None,
+                 metrics = None):
+        """
+        table_mode=True: передобчислює передбачення на сітці (див. PredictionTable)
+        і відповідає на запити lookup'ом; досвід поза сіткою йде через модель.
+        compiled_inference=True: predict_record працює без pandas (див. CompiledPipeline).
+        tree_inference=True: дерев'яні моделі на батчах до tree_max_batch рядків
+        передбачаються NumPy-обходом плоских масивів (див. TreeEnsemble).
+        prediction_cache: models.prediction_cache.PredictionCache перед моделлю -
+        повторні записи (поза таблицею) не перераховуються; ключ містить версію моделі.
+        metrics: src.utils.metrics.PhaseMetrics - час фаз інференсу (validate, select,
+        lookup, table, cache, preprocess.<гілка ColumnTransformer>, regressor, format);
+        None - без інструментації.
+        load_times - тривалість етапів завантаження у мс (unpickle, configs, compile, table).
+        """
         self.model_path = model_path
+        self.metadata_path = metadata_path
         self.model = None
         self.metadata = None
+        self.version = None
         self.config_values = None
         self.config_features = None
         self.feature_cols = None
+        self.category_dtypes = None
+        self.table = None
+        self.compiled = None
+        self.tree = None
+        self.tree_max_batch = tree_max_batch
+        self.cache = prediction_cache
+        self.metrics = metrics
+        self.load_times = {}
 
         # load
         try:
             # model and metadata
+            start = time.perf_counter()
             self.model = joblib.load(model_path)
-            self.metadata = joblib.load(MODELS_DIR/"model_metadata.pkl")
+            self.metadata = joblib.load(metadata_path)
+            self.version = artifact_version(model_path, self.metadata)
+            self.load_times['unpickle_ms'] = _elapsed_ms(start)
 
             # configs and additional info about them
-            self.config_values = json.load(open('configs/allowed_values.json'))
-            self.config_features = json.load(open('configs/column_features.json'))
+            start = time.perf_counter()
+            with open(CONFIG_DIR / 'allowed_values.json') as f:
+                self.config_values = json.load(f)
+            with open(CONFIG_DIR / 'column_features.json') as f:
+                self.config_features = json.load(f)
             self.feature_cols = self.config_features['columns']
+            self.category_dtypes = {
+                col: dtype for col, dtype in category_dtypes(self.config_values).items()
+                if self.config_features['types'].get(col) == 'categorical'
+            }
+            self.load_times['configs_ms'] = _elapsed_ms(start)
+            self._numeric_cols = [col for col in self.feature_cols if col not in self.category_dtypes]
             logging.info("Model, metadata and configs succesfully loaded.")
         except FileNotFoundError as e:
             logging.error(f"Required file not found: {e.filename}")
@@ -41,7 +103,127 @@ class SalaryPredictor:
             logging.error(f"Error while loading model/metadata: {e}")
             raise
 
-    def validate_input(self, input_data):
+        if self.cache is not None:
+            self.cache.bind(self.version) # записи попередньої версії моделі недійсні
+        if compiled_inference:
+            start = time.perf_counter()
+            self.enable_compiled_inference()
+            self.load_times['compile_ms'] = _elapsed_ms(start)
+        if tree_inference:
+            start = time.perf_counter()
+            self.enable_tree_inference()
+            self.load_times['tree_ms'] = _elapsed_ms(start)
+        if table_mode:
+            start = time.perf_counter()
+            self.enable_table_mode(experience_grid, interpolate, table_tolerance)
+            self.load_times['table_ms'] = _elapsed_ms(start)
+
+    def enable_compiled_inference(self, tolerance: float = 1e-6) -> bool:
+        """
+        Компілює пайплайн для інференсу без pandas і перевіряє його проти моделі.
+        Непідтримуваний пайплайн або відхилення > tolerance - лишається звичайний шлях.
+        """
+        try:
+            compiled = CompiledPipeline(self.model, self.config_values, self.config_features)
+            max_error = compiled.check_tolerance(self.model, self._sample_inputs())
+        except Exception as e:
+            logging.info(f"Compiled inference not available: {e}")
+            self.compiled = None
+            return False
+
+        if max_error > tolerance:
+            logging.warning(f"Compiled inference disabled: max error {max_error:.3g} > tolerance {tolerance:.3g}")
+            self.compiled = None
+            return False
+
+        self.compiled = compiled
+        logging.info(f"Compiled inference enabled (max error {max_error:.3g}).")
+        return True
+
+    def enable_tree_inference(self, tolerance: float = 1e-6) -> bool:
+        """
+        Вмикає TreeEnsemble: масиви з tree_ensemble.npz поруч з моделлю (експорт
+        run_training) або, для старих артефактів, експорт з завантаженої моделі.
+        Перевіряється проти model.predict; відхилення > tolerance - лишається модель.
+        """
+        try:
+            tree_file = self.metadata.get('tree_ensemble')
+            if tree_file and (Path(self.model_path).parent / tree_file).exists():
+                tree = TreeEnsemble.load(Path(self.model_path).parent / tree_file)
+            else:
+                tree = TreeEnsemble(export_tree_ensemble(
+                    self.model, {col: self.config_values[col] for col in self.category_dtypes}, self.feature_cols))
+            max_error = tree.check_tolerance(self.model, self.validate_input(self._sample_inputs(200)))
+        except Exception as e:
+            logging.info(f"Tree inference not available: {e}")
+            self.tree = None
+            return False
+
+        if not max_error <= tolerance: # NaN - категорії, невідомі експорту
+            logging.warning(f"Tree inference disabled: max error {max_error:.3g} > tolerance {tolerance:.3g}")
+            self.tree = None
+            return False
+
+        self.tree = tree
+        logging.info(f"Tree inference enabled: {tree.n_trees} trees, depth {tree.depth} (max error {max_error:.3g}).")
+        return True
+
+    def _sample_inputs(self, n_samples: int = 50, random_state: int = 25) -> pd.DataFrame:
+        """Випадкові валідні входи для перевірки прискорених шляхів інференсу"""
+        rng = np.random.default_rng(random_state)
+        sample = {}
+        for col in self.feature_cols:
+            if self.config_features['types'][col] == 'categorical':
+                sample[col] = rng.choice(self.config_values[col], n_samples)
+            else:
+                sample[col] = rng.integers(0, 30, n_samples)
+        return pd.DataFrame(sample)
+
+    def warmup(self, n_samples: int = 8) -> float:
+        """
+        Синтетичні передбачення через усі шляхи інференсу (запис і батч), щоб
+        лінь-ініціалізація бібліотек не припадала на перший реальний запит.
+        Повертає тривалість у мс.
+        """
+        start = time.perf_counter()
+        # синтетичні запити не потрапляють у метрики
+        metrics, self.metrics = self.metrics, None
+        try:
+            sample = self._sample_inputs(n_samples)
+            self.predict_record(sample.iloc[0].to_dict())
+            self.predict_batch(sample)
+        finally:
+            self.metrics = metrics
+        return _elapsed_ms(start)
+
+    def enable_table_mode(self,
+                          experience_grid = DEFAULT_EXPERIENCE_GRID,
+                          interpolate: bool = False,
+                          tolerance: float = 1e-6) -> bool:
+        """
+        Будує таблицю передбачень і перевіряє її проти моделі.
+        Якщо відхилення перевищує tolerance - таблиця не вмикається.
+        """
+        table = PredictionTable(self.model, self.config_values, self.feature_cols,
+                                experience_grid, interpolate)
+        max_error = table.check_tolerance(self.model)
+
+        if max_error > tolerance:
+            logging.warning(f"Prediction table disabled: max error {max_error:.3g} > tolerance {tolerance:.3g}")
+            self.table = None
+            return False
+
+        self.table = table
+        logging.info(f"Table mode enabled (max error {max_error:.3g}).")
+        return True
+
+    def validate_input(self, input_data, collect_errors: bool = False):
+        """
+        collect_errors=False: перша ж помилка викидає ValueError.
+        collect_errors=True: помилки рівня рядка не викидаються, а повертаються
+        разом з даними як (input_data, row_errors) - див. collect_row_errors.
+        Повернуті дані мають категоріальні колонки у CategoricalDtype.
+        """
         # check for DataFrame type
         if not isinstance(input_data, pd.DataFrame):
             raise ValueError("Input data must be a pandas DataFrame")
@@ -51,32 +233,321 @@ class SalaryPredictor:
         if missing_cols:
             raise ValueError(f'Missing required columns: {missing_cols}')
 
+        # категоріальні колонки -> CategoricalDtype з allowed_values.json:
+        # рядки хешуються один раз, невідомі значення отримують код -1
+        X = input_data.assign(**{
+            col: as_fixed_categorical(input_data[col], dtype) for col, dtype in self.category_dtypes.items()
+        })
+        # числові колонки з нечисловими значеннями (напр. 'unknown' у CSV) -> float з NaN на їх місці
+        X = X.assign(**{
+            col: pd.to_numeric(input_data[col], errors='coerce')
+            for col in self._numeric_cols if not pd.api.types.is_numeric_dtype(input_data[col])
+        })
+
+        if collect_errors:
+            return X, self.collect_row_errors(input_data, X)
+
         # missing values check
         if input_data[self.feature_cols].isnull().any().any():
             raise ValueError(f'Missing values detected in input data')
 
-        for col, col_type in self.config_features['types'].items():
-            if col_type == 'categorical': # перевіряємо тільки категоріальні
-                allowed = self.config_values.get(col, []) # список дозволених значень для цієї колонки
-                invalid_mask = ~input_data[col].isin(allowed) # створення маски, True там де значення не входить у список
+        for col in self.category_dtypes:
+            invalid_mask = X[col].cat.codes.to_numpy() < 0 # True там де значення не входить у список
 
-                # якщо є хоча б одне невалідне значення
-                if invalid_mask.any():
-                    invalid_vals = input_data.loc[invalid_mask, col].tolist()
-                    # викидаємо помилку з поясненням
-                    raise ValueError(
-                        f"Invalid values in column '{col}': {invalid_vals}. "
-                        f"Allowed values are: {allowed}"
-                    )
+            # якщо є хоча б одне невалідне значення
+            if invalid_mask.any():
+                invalid_vals = input_data.loc[invalid_mask, col].tolist()
+                # викидаємо помилку з поясненням
+                raise ValueError(
+                    f"Invalid values in column '{col}': {invalid_vals}. "
+                    f"Allowed values are: {self.config_values.get(col, [])}"
+                )
 
-        return input_data
+        for col in self._numeric_cols:
+            invalid_mask = X[col].isnull().to_numpy()
+            if invalid_mask.any():
+                invalid_vals = input_data.loc[invalid_mask, col].tolist()
+                raise ValueError(f"Non-numeric values in column '{col}': {invalid_vals}")
+
+        return X
+
+    def collect_row_errors(self, input_data: pd.DataFrame, categorized: pd.DataFrame = None) -> pd.Series:
+        """
+        Векторизована перевірка всього батчу.
+        Повертає pd.Series з описом помилок лише для невалідних рядків
+        (індекс - позиція рядка у батчі).
+        categorized - input_data з категоріальними колонками, вже переведеними
+        у CategoricalDtype, і числовими - у float (див. validate_input),
+        щоб не перетворювати колонки вдруге.
+        """
+        X = input_data[self.feature_cols].reset_index(drop=True)
+        errors = pd.Series('', index=X.index, dtype=object)
+
+        null_mask = X.isnull()
+        for col in self.feature_cols:
+            errors[null_mask[col]] += f"Missing value in column '{col}'; "
+
+        for col, dtype in self.category_dtypes.items():
+            column = categorized[col] if categorized is not None else as_fixed_categorical(X[col], dtype)
+            invalid_mask = (column.cat.codes.to_numpy() < 0) & ~null_mask[col].to_numpy()
+
+            if invalid_mask.any():
+                errors[invalid_mask] += (
+                    "Invalid value '" + X.loc[invalid_mask, col].astype(str) +
+                    f"' in column '{col}'; "
+                )
+
+        for col in self._numeric_cols:
+            column = categorized[col] if categorized is not None else pd.to_numeric(X[col], errors='coerce')
+            invalid_mask = column.isnull().to_numpy() & ~null_mask[col].to_numpy()
+
+            if invalid_mask.any():
+                errors[invalid_mask] += (
+                    "Non-numeric value '" + X.loc[invalid_mask, col].astype(str) +
+                    f"' in column '{col}'; "
+                )
+
+        errors = errors[errors != '']
+        return errors.str.rstrip('; ')
 
     def predict(self, input_data):
         """
         input data: pd.DataFrame, вже підготовлені дані у форматі в якому очікує модель
         """
+        metrics = self.metrics
+        start = perf_counter_ns() if metrics is not None else 0
         X_valid = self.validate_input(input_data)
-        result = self.model.predict(X_valid[self.feature_cols])
+        if metrics is not None:
+            start = metrics.record('validate', start)
+        X = X_valid[self.feature_cols]
+        if metrics is not None:
+            metrics.record('select', start)
+
+        result = self._predict_raw(X)
+
+        start = perf_counter_ns() if metrics is not None else 0
+        result = self._format_predictions(result)
+        if metrics is not None:
+            metrics.record('format', start)
+        return result
+
+    def predict_record(self, record) -> int:
+        """
+        Передбачення для одного запису: dict з колонками feature_cols
+        або tuple у порядку feature_cols.
+        Порядок шляхів: таблиця (table mode) -> кеш -> скомпільований пайплайн -> predict.
+        """
+        prediction = self.lookup_record(record)
+        if prediction is not None:
+            return prediction
+
+        metrics = self.metrics
+        if self.compiled is not None:
+            features = self.compiled.transform_record(record, metrics)
+            start = perf_counter_ns() if metrics is not None else 0
+            if self.tree is not None:
+                # вектор ознак CompiledPipeline має ту саму розкладку, що й у TreeEnsemble
+                value = self.tree.predict_features(features)[0]
+            else:
+                value = float(self.compiled.regressor.predict(features)[0])
+            if metrics is not None:
+                metrics.record('regressor', start)
+        else:
+            if not isinstance(record, dict):
+                record = dict(zip(self.feature_cols, record))
+            start = perf_counter_ns() if metrics is not None else 0
+            X_valid = self.validate_input(pd.DataFrame([record]))
+            if metrics is not None:
+                start = metrics.record('validate', start)
+            X = X_valid[self.feature_cols]
+            if metrics is not None:
+                metrics.record('select', start)
+            value = self._evaluate_model(X)[0]
+
+        start = perf_counter_ns() if metrics is not None else 0
+        if self.cache is not None:
+            key = self.cache_key(record)
+            if key is not None:
+                self.cache.set(key, float(value))
+            if metrics is not None:
+                start = metrics.record('cache.store', start)
+        prediction = max(int(np.round(value)), 0)
+        if metrics is not None:
+            metrics.record('format', start)
+        return prediction
+
+    def lookup_record(self, record: dict):
+        """
+        Передбачення з таблиці (table mode) або кешу без виклику моделі.
+        None - немає ні в таблиці, ні в кеші, або запис невалідний.
+        """
+        metrics = self.metrics
+        start = perf_counter_ns() if metrics is not None else 0
+        value, valid = None, True
+        if self.table is not None:
+            try:
+                value = self.table.lookup_one(record)
+            except (KeyError, TypeError, ValueError):
+                valid = False # невалідний запис - помилку сформує validate_input
+
+        if value is None and valid and self.cache is not None:
+            key = self.cache_key(record)
+            if key is not None:
+                value = self.cache.get(key)
+
+        if value is not None:
+            value = max(int(np.round(value)), 0)
+        if metrics is not None:
+            metrics.record('lookup', start)
+        return value
+
+    def cache_key(self, record):
+        """
+        Ключ кешу для запису (dict або tuple у порядку feature_cols):
+        (версія моделі, *ознаки), категорії - рядки, числові - float (3 і 3.0 - один ключ).
+        None - запис не нормалізується (кешувати нічого).
+        """
+        values = record if not isinstance(record, dict) else [record.get(col) for col in self.feature_cols]
+        if len(values) != len(self.feature_cols):
+            return None
+        key = [self.version]
+        for col, value in zip(self.feature_cols, values):
+            if col in self.category_dtypes:
+                if not isinstance(value, str):
+                    return None
+            else:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    return None
+            key.append(value)
+        return tuple(key)
+
+    def _cache_keys(self, X: pd.DataFrame) -> list:
+        """cache_key для кожного рядка вже валідованого X (по колонках, без iterrows)"""
+        columns = [
+            X[col].astype(object).tolist() if col in self.category_dtypes
+            else X[col].to_numpy(dtype=float).tolist()
+            for col in self.feature_cols
+        ]
+        return list(zip(repeat(self.version, len(X)), *columns))
+
+    def predict_batch(self, input_data):
+        """
+        Передбачення для батчу з помилками на рівні рядків:
+        невалідні рядки не зупиняють батч, решта передбачається одним model.predict.
+
+        Повертає (predictions, row_errors): predictions - float масив у порядку
+        вхідних рядків (NaN для невалідних), row_errors - див. collect_row_errors.
+        """
+        metrics = self.metrics
+        start = perf_counter_ns() if metrics is not None else 0
+        X, row_errors = self.validate_input(input_data, collect_errors=True)
+        if metrics is not None:
+            start = metrics.record('validate', start)
+        X = X[self.feature_cols].reset_index(drop=True)
+
+        predictions = np.full(len(X), np.nan)
+        valid_mask = ~X.index.isin(row_errors.index)
+        if valid_mask.any():
+            X = X[valid_mask]
+            if metrics is not None:
+                metrics.record('select', start)
+            result = self._predict_raw(X)
+
+            start = perf_counter_ns() if metrics is not None else 0
+            predictions[valid_mask] = self._format_predictions(result)
+            if metrics is not None:
+                metrics.record('format', start)
+
+        return predictions, row_errors
+
+    def predict_records(self, data, columns: list = None):
+        """predict_batch для списку записів (dict) або dict колонок, як у /predict/batch"""
+        return self.predict_batch(pd.DataFrame(data, columns=columns))
+
+    def _predict_raw(self, X: pd.DataFrame):
+        """Сирі передбачення: таблиця (якщо увімкнена) + модель для рядків поза сіткою"""
+        if self.table is None:
+            return self._model_predict(X)
+
+        start = perf_counter_ns() if self.metrics is not None else 0
+        result, in_grid = self.table.lookup(X)
+        if self.metrics is not None:
+            self.metrics.record('table', start)
+        if not in_grid.all():
+            result[~in_grid] = self._model_predict(X[~in_grid])
+        return result
+
+    def _model_predict(self, X: pd.DataFrame) -> np.ndarray:
+        """Передбачення моделі з кешем: перераховуються лише рядки, яких немає в кеші"""
+        if self.cache is None or not len(X):
+            return self._evaluate_model(X)
+
+        metrics = self.metrics
+        start = perf_counter_ns() if metrics is not None else 0
+        keys = self._cache_keys(X)
+        cached = self.cache.get_many(keys)
+        missing = np.fromiter((value is None for value in cached), dtype=bool, count=len(cached))
+        if metrics is not None:
+            metrics.record('cache', start)
+        if not missing.any():
+            return np.array(cached, dtype=float)
+
+        result = np.array([np.nan if value is None else value for value in cached], dtype=float)
+        result[missing] = self._evaluate_model(X[missing])
+
+        start = perf_counter_ns() if metrics is not None else 0
+        self.cache.set_many(list(zip(compress(keys, missing), result[missing].tolist())))
+        if metrics is not None:
+            metrics.record('cache.store', start)
+        return result
+
+    def _evaluate_model(self, X: pd.DataFrame) -> np.ndarray:
+        """TreeEnsemble для невеликих батчів, інакше (і для невідомих експорту категорій) - модель"""
+        if self.tree is None or len(X) > self.tree_max_batch:
+            return self._pipeline_predict(X)
+
+        result = self.tree.predict(X, self.metrics)
+        unknown = np.isnan(result)
+        if unknown.any():
+            result[unknown] = self._pipeline_predict(X[unknown])
+        return result
+
+    def _pipeline_predict(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        model.predict. З metrics пайплайн (preprocessor, regressor) виконується покроково:
+        кожна гілка ColumnTransformer окремо ('preprocess.<гілка>'), потім 'regressor'.
+        Інший пайплайн міряється цілком як 'model'.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return self.model.predict(X)
+
+        start = perf_counter_ns()
+        steps = getattr(self.model, 'named_steps', {})
+        preprocessor = steps.get('preprocessor')
+        if (list(steps) != ['preprocessor', 'regressor'] or not isinstance(preprocessor, ColumnTransformer)
+                or preprocessor.sparse_output_
+                or any(isinstance(transformer, str) and transformer != 'drop'
+                       for _, transformer, _ in preprocessor.transformers_)):
+            result = self.model.predict(X)
+            metrics.record('model', start)
+            return result
+
+        # ColumnTransformer без sparse і passthrough = hstack виходів гілок у порядку transformers_
+        parts = []
+        for name, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str): # 'drop'
+                continue
+            parts.append(transformer.transform(X[columns]))
+            start = metrics.record(f'preprocess.{name}', start)
+
+        result = steps['regressor'].predict(np.hstack(parts))
+        metrics.record('regressor', start)
+        return result
+
+    def _format_predictions(self, result):
         # checking for compliance with the prediction format
         if not isinstance(result, (list, np.ndarray)):
             raise TypeError("Model predict returned unexpected type")
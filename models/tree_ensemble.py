@@ -0,0 +1,280 @@
+import json
+import numpy as np
+import pandas as pd
+import logging
+from time import perf_counter_ns
+
+from src.data.categories import recode
+from models.compiled_inference import CompiledPipeline
+
+logger = logging.getLogger(__name__)
+
+# цілі XGBoost з тотожним зв'язком (передбачення = сума листків)
+XGB_IDENTITY_OBJECTIVES = ('reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror')
+
+def _sklearn_tree(tree_):
+    """(feature, threshold, left, right, value) дерева sklearn; лівий нащадок - x <= threshold"""
+    return (tree_.feature, tree_.threshold, tree_.children_left,
+            tree_.children_right, tree_.value[:, 0, 0])
+
+def _hgb_tree(predictor):
+    nodes = predictor.nodes
+    if nodes['is_categorical'].any():
+        raise ValueError('Categorical splits are not supported')
+    left = np.where(nodes['is_leaf'], -1, nodes['left'].astype(np.int64))
+    right = np.where(nodes['is_leaf'], -1, nodes['right'].astype(np.int64))
+    return nodes['feature_idx'], nodes['num_threshold'], left, right, nodes['value']
+
+def _xgb_trees(regressor) -> tuple:
+    """Дерева і base_score бустера XGBoost з JSON-моделі (точні float32 значення)"""
+    model = json.loads(regressor.get_booster().save_raw('json'))['learner']
+    objective = model['objective']['name']
+    if objective not in XGB_IDENTITY_OBJECTIVES:
+        raise ValueError(f"XGBoost objective '{objective}' is not supported")
+    if model['gradient_booster']['name'] != 'gbtree':
+        raise ValueError(f"XGBoost booster '{model['gradient_booster']['name']}' is not supported")
+
+    trees = []
+    for tree in model['gradient_booster']['model']['trees']:
+        left = np.asarray(tree['left_children'], dtype=np.int64)
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        # XGBoost: x < split -> лівий; у float32 це те саме, що x <= попереднє число перед split
+        threshold = np.nextafter(conditions, np.float32(-np.inf))
+        trees.append((np.asarray(tree['split_indices']), threshold, left,
+                      np.asarray(tree['right_children']), conditions))
+
+    base_score = np.float32(model['learner_model_param']['base_score'].strip('[]'))
+    return trees, base_score
+
+def flatten_regressor(regressor) -> dict:
+    """
+    Дерева регресора у спільному форматі + як їх скласти:
+    prediction = base + scale * sum(листків).
+    float32_input - ознаки порівнюються з порогами у float32 (як у sklearn Tree і XGBoost);
+    float32_sum - листки сумуються послідовно у float32 (як у XGBoost).
+    """
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+
+    flat = {'base': 0.0, 'scale': 1.0, 'float32_input': True, 'float32_sum': False}
+
+    if isinstance(regressor, DecisionTreeRegressor):
+        flat['trees'] = [_sklearn_tree(regressor.tree_)]
+    elif isinstance(regressor, RandomForestRegressor):
+        flat['trees'] = [_sklearn_tree(tree.tree_) for tree in regressor.estimators_]
+        flat['scale'] = 1.0 / len(regressor.estimators_)
+    elif isinstance(regressor, GradientBoostingRegressor):
+        flat['trees'] = [_sklearn_tree(tree.tree_) for tree in regressor.estimators_[:, 0]]
+        flat['scale'] = float(regressor.learning_rate)
+        flat['base'] = float(regressor._raw_predict_init(np.zeros((1, regressor.n_features_in_)))[0, 0])
+    elif isinstance(regressor, HistGradientBoostingRegressor):
+        if type(regressor._loss.link).__name__ != 'IdentityLink':
+            raise ValueError(f"HistGBM loss '{regressor.loss}' is not supported")
+        flat['trees'] = [_hgb_tree(predictors[0]) for predictors in regressor._predictors]
+        flat['base'] = float(regressor._baseline_prediction.ravel()[0])
+        flat['float32_input'] = False
+    elif type(regressor).__name__ == 'XGBRegressor':
+        flat['trees'], flat['base'] = _xgb_trees(regressor)
+        flat['float32_sum'] = True
+    else:
+        raise ValueError(f'Unsupported regressor: {type(regressor).__name__}')
+
+    return flat
+
+def _concat_trees(trees: list) -> dict:
+    """
+    Суцільні масиви вузлів усіх дерев. Листок посилається сам на себе
+    (left = right = власний індекс), тому обхід - рівно depth кроків для всіх рядків.
+    """
+    sizes = [len(tree[0]) for tree in trees]
+    roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+    feature, threshold, left, right, value = (np.concatenate(parts) for parts in zip(*trees))
+    offsets = np.repeat(roots, sizes)
+    own = np.arange(len(feature), dtype=np.int64)
+
+    is_leaf = np.asarray(left) < 0
+    left = np.where(is_leaf, own, np.asarray(left, dtype=np.int64) + offsets)
+    right = np.where(is_leaf, own, np.asarray(right, dtype=np.int64) + offsets)
+    feature = np.where(is_leaf, 0, feature).astype(np.int64)
+
+    # глибина - найдовший шлях від кореня (ітеративно по рівнях)
+    depth, current = 0, roots
+    while not is_leaf[current].all():
+        current = np.unique(np.concatenate([left[current[~is_leaf[current]]],
+                                            right[current[~is_leaf[current]]]]))
+        depth += 1
+
+    return {
+        'feature': feature,
+        'threshold': np.asarray(threshold, dtype=np.float64),
+        'left': left,
+        'right': right,
+        'value': np.asarray(value, dtype=np.float64),
+        'roots': roots,
+        'depth': np.int64(depth),
+    }
+
+def export_tree_ensemble(pipeline, categories: dict, feature_cols: list) -> dict:
+    """
+    Плоский експорт fitted пайплайну (препроцесор + дерева) у NumPy-масиви для np.savez.
+
+    categories - {категоріальна колонка: список значень}, для яких рахуються
+    таблиці препроцесингу; feature_cols - порядок колонок на вході пайплайну.
+    """
+    flat = flatten_regressor(pipeline.named_steps['regressor'])
+    arrays = _concat_trees(flat['trees'])
+    arrays.update({
+        'base': np.float64(flat['base']),
+        'scale': np.float64(flat['scale']),
+        'float32_input': np.bool_(flat['float32_input']),
+        'float32_sum': np.bool_(flat['float32_sum']),
+    })
+
+    config_features = {
+        'columns': list(feature_cols),
+        'types': {col: 'categorical' if col in categories else 'numeric' for col in feature_cols},
+    }
+    compiled = CompiledPipeline(pipeline, categories, config_features)
+    arrays['n_features'] = np.int64(compiled.n_features)
+    arrays['categorical_columns'] = np.array([step[2] for step in compiled.categorical_steps], dtype=str)
+    arrays['numeric_columns'] = np.array([step[2] for step in compiled.numeric_steps], dtype=str)
+
+    for position, _, col, table in compiled.categorical_steps:
+        arrays[f'position__{col}'] = np.int64(position)
+        arrays[f'categories__{col}'] = np.array(list(table), dtype=str)
+        arrays[f'table__{col}'] = np.array(list(table.values()), dtype=np.float64)
+    for position, _, col, mean, scale in compiled.numeric_steps:
+        arrays[f'position__{col}'] = np.int64(position)
+        arrays[f'mean__{col}'] = np.float64(mean)
+        arrays[f'scale__{col}'] = np.float64(scale)
+
+    return arrays
+
+class TreeEnsemble:
+    """
+    Батчевий інференс дерев'яного ансамблю на чистому NumPy з масивів export_tree_ensemble.
+
+    Усі дерева обходяться одночасно: індекси вузлів (n_rows, n_trees) depth разів
+    замінюються на лівого/правого нащадка за порогом. Препроцесинг - таблиці
+    категорій і (x - mean) / scale, як у CompiledPipeline, але для цілого батчу.
+    """
+
+    # к-сть елементів (рядки x дерева) в одному блоці обходу
+    block_size = 32_768
+
+    def __init__(self, arrays):
+        arrays = dict(arrays)
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        # [left, right] кожного вузла підряд: нащадок = children[2 * node + (x > threshold)]
+        self.children = np.stack([arrays['left'], arrays['right']], axis=1).ravel()
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.depth = int(arrays['depth'])
+        self.base = float(arrays['base'])
+        self.scale = float(arrays['scale'])
+        self.float32_input = bool(arrays['float32_input'])
+        self.float32_sum = bool(arrays['float32_sum'])
+        self.n_features = int(arrays['n_features'])
+
+        self.categorical_steps = [
+            (int(arrays[f'position__{col}']), col, pd.Index(arrays[f'categories__{col}'].tolist()),
+             arrays[f'table__{col}'])
+            for col in arrays['categorical_columns'].tolist()
+        ]
+        # колонка -> (CategoricalDtype входу, його коди -> позиції категорій експорту)
+        self._category_maps = {}
+        self.numeric_steps = [
+            (int(arrays[f'position__{col}']), col, float(arrays[f'mean__{col}']), float(arrays[f'scale__{col}']))
+            for col in arrays['numeric_columns'].tolist()
+        ]
+
+    @classmethod
+    def load(cls, path) -> 'TreeEnsemble':
+        with np.load(path) as npz:
+            return cls({key: npz[key] for key in npz.files})
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def transform(self, X: pd.DataFrame):
+        """
+        Матриця ознак (n_rows, n_features) і маска рядків, які можна передбачити
+        (категорії відомі експорту). Пропуски у X мають бути відфільтровані раніше.
+        """
+        features = np.empty((len(X), self.n_features))
+        known = np.ones(len(X), dtype=bool)
+
+        for position, col, categories, table in self.categorical_steps:
+            codes = self._codes(X[col], col, categories)
+            known &= codes >= 0
+            features[:, position] = table.take(codes) # -1 -> останній, рядок відсіється маскою
+
+        for position, col, mean, scale in self.numeric_steps:
+            features[:, position] = (X[col].to_numpy(dtype=float) - mean) / scale
+
+        return features, known
+
+    def _codes(self, column: pd.Series, col: str, categories: pd.Index) -> np.ndarray:
+        """
+        Позиції значень у категоріях експорту. Для CategoricalDtype перекодування
+        категорій кешується - у SalaryPredictor dtype один і той самий на кожен запит.
+        """
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            return recode(column, categories)
+
+        cached = self._category_maps.get(col)
+        if cached is None or not (cached[0] is column.dtype or cached[0] == column.dtype):
+            # останній елемент відповідає NaN (код -1)
+            mapping = np.append(categories.get_indexer(column.cat.categories), -1)
+            self._category_maps[col] = cached = (column.dtype, mapping)
+        return cached[1].take(column.cat.codes.to_numpy())
+
+    def predict_features(self, features: np.ndarray) -> np.ndarray:
+        # блоки рядків, щоб проміжні масиви (rows, n_trees) вміщались у кеш
+        block = max(1, self.block_size // self.n_trees)
+        if len(features) > block:
+            return np.concatenate([self.predict_features(features[start:start + block])
+                                   for start in range(0, len(features), block)])
+
+        if self.float32_input:
+            features = features.astype(np.float32)
+
+        flat_features = features.ravel()
+        row_offsets = (np.arange(len(features)) * self.n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (len(features), self.n_trees))
+        for _ in range(self.depth):
+            values = flat_features.take(row_offsets + self.feature.take(nodes))
+            nodes = self.children.take(2 * nodes + (values > self.threshold.take(nodes)))
+
+        leaves = self.value.take(nodes)
+        if self.float32_sum:
+            result = np.full(len(features), self.base, dtype=np.float32)
+            for values in leaves.astype(np.float32).T:
+                result += values
+            return result.astype(np.float64)
+        return self.base + self.scale * leaves.sum(axis=1)
+
+    def predict(self, X: pd.DataFrame, metrics=None) -> np.ndarray:
+        """
+        Передбачення для батчу; NaN для рядків з невідомими експорту категоріями.
+        metrics - PhaseMetrics: фази 'preprocess' і 'regressor'.
+        """
+        start = perf_counter_ns() if metrics is not None else 0
+        features, known = self.transform(X)
+        if metrics is not None:
+            start = metrics.record('preprocess', start)
+
+        result = np.full(len(X), np.nan)
+        if known.any():
+            result[known] = self.predict_features(features[known])
+        if metrics is not None:
+            metrics.record('regressor', start)
+        return result
+
+    def check_tolerance(self, pipeline, sample: pd.DataFrame) -> float:
+        """Максимальне відхилення від pipeline.predict на sample"""
+        expected = np.asarray(pipeline.predict(sample), dtype=float)
+        return float(np.max(np.abs(self.predict(sample) - expected)))
@@ -0,0 +1,73 @@
+import json
+import numpy as np
+import pandas as pd
+
+from src.utils.paths import CONFIG_DIR
+
+# категоріальні фічі моделі (див. configs/column_features.json)
+CATEGORICAL_COLUMNS = ('job_category', 'seniority_level', 'english_level')
+
+def category_dtypes(config_values: dict) -> dict:
+    """{колонка: CategoricalDtype} з фіксованими категоріями у порядку allowed_values.json"""
+    return {col: pd.CategoricalDtype(list(config_values.get(col, []))) for col in CATEGORICAL_COLUMNS}
+
+def load_category_dtypes(path=CONFIG_DIR / 'allowed_values.json') -> dict:
+    """
+    Типи з configs/allowed_values.json; без конфігу (перший запуск пайплайну)
+    категорії беруться з даних, див. to_categorical.
+    """
+    try:
+        with open(path) as f:
+            return category_dtypes(json.load(f))
+    except FileNotFoundError:
+        return category_dtypes({})
+
+def recode(column, categories) -> np.ndarray:
+    """
+    Позиції значень колонки у списку categories (-1 для невідомих і NaN).
+    Для pd.Categorical перекодовується лише список категорій, а не рядки.
+    """
+    index = pd.Index(categories)
+    if isinstance(getattr(column, 'dtype', None), pd.CategoricalDtype):
+        # останній елемент відповідає NaN (код -1)
+        category_codes = index.get_indexer(column.cat.categories)
+        return np.append(category_codes, -1).take(column.cat.codes.to_numpy())
+    return index.get_indexer(np.asarray(column, dtype=object))
+
+def as_fixed_categorical(column: pd.Series, dtype: pd.CategoricalDtype) -> pd.Series:
+    """Колонка у точно такому dtype; значення поза категоріями -> NaN (код -1)"""
+    codes = recode(column, dtype.categories)
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=column.index, name=column.name)
+
+def categorize_column(column: pd.Series, dtype: pd.CategoricalDtype,
+                      drop_unused_extra: bool = False) -> pd.Series:
+    """
+    Колонка у CategoricalDtype з фіксованими категоріями dtype.
+
+    Рядки хешуються один раз (astype('category')), далі лише перекодування
+    невеликого списку категорій. Значення поза dtype (ще не відфільтровані або
+    нові для allowed_values.json) дописуються в кінець у відсортованому порядку,
+    тому коди дозволених значень стабільні між датасетами.
+    drop_unused_extra=True прибирає такі додаткові категорії, якщо їх вже немає в даних.
+    """
+    allowed = list(dtype.categories)
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype('category')
+
+    known = set(allowed)
+    extra = sorted((value for value in column.cat.categories if value not in known), key=str)
+    if drop_unused_extra and extra:
+        codes = column.cat.codes.to_numpy()
+        present = set(column.cat.categories[pd.unique(codes[codes >= 0])])
+        extra = [value for value in extra if value in present]
+
+    if list(column.cat.categories) != allowed + extra:
+        column = column.cat.set_categories(allowed + extra)
+    return column
+
+def to_categorical(df: pd.DataFrame, dtypes: dict, drop_unused_extra: bool = False) -> pd.DataFrame:
+    """Переводить наявні категоріальні колонки df на місці (див. categorize_column)"""
+    for col, dtype in dtypes.items():
+        if col in df.columns:
+            df[col] = categorize_column(df[col], dtype, drop_unused_extra)
+    return df
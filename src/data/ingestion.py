@@ -0,0 +1,112 @@
+import pandas as pd
+
+from src.data.preprocessing import (
+    RAW_FEATURES,
+    EXCLUDED_ENGLISH_LEVEL,
+    select_and_rename_features,
+    standardization_seniority_features,
+    drop_unspecified_positions,
+    score_experience_outliers,
+    score_salary_outliers,
+)
+from src.data.feature_engineering import standardization_job_category
+from src.data.categories import load_category_dtypes, to_categorical
+from src.utils.profiling import ResourceUsage
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# фіксовані типи для 5 потрібних колонок: решта сирого файлу не читається взагалі
+RAW_DTYPES = {
+    'salary_usd': 'float64',
+    'seniority_level': 'category',
+    'position': 'category',
+    'english_level': 'category',
+    'experience_years': 'float64',
+}
+
+# колонка з вердиктом рядкових фільтрів (english + викиди), див. process_chunk
+FILTER_COLUMN = 'passes_filters'
+
+def process_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stateless-етапи preprocces_data для одного чанку сирих даних.
+
+    Рядкові фільтри (english, викиди досвіду і зарплати) лише оцінюються:
+    у preprocces_data вони застосовуються після feature_balancing_category,
+    тому рядки не видаляються до балансування, а отримують FILTER_COLUMN.
+    """
+    df = select_and_rename_features(chunk)
+    df = standardization_seniority_features(df)
+    df = drop_unspecified_positions(df)
+    df = standardization_job_category(df)
+
+    df[FILTER_COLUMN] = (
+        (df['english_level'] != EXCLUDED_ENGLISH_LEVEL).to_numpy(dtype=bool)
+        & (score_experience_outliers(df['seniority_level'], df['experience_years']) < 0.5)
+        & (score_salary_outliers(df['seniority_level'], df['salary_usd']) < 0.5)
+    )
+
+    return df
+
+def concat_categorical(frames: list, dtypes: dict) -> pd.DataFrame:
+    """
+    pd.concat чанків без переходу категоріальних колонок в object: категорії
+    кожної колонки вирівнюються до спільних (дозволені + додаткові з усіх чанків,
+    відсортовані, як у categorize_column)
+    """
+    for col, dtype in dtypes.items():
+        known = set(dtype.categories)
+        extra = set().union(*(frame[col].cat.categories for frame in frames)) - known
+        categories = list(dtype.categories) + sorted(extra, key=str)
+        for frame in frames:
+            if list(frame[col].cat.categories) != categories:
+                frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames)
+
+def stream_raw_csv(input_csv,
+                   chunksize: int = DEFAULT_CHUNKSIZE,
+                   encoding: str = 'cp1251'):
+    """
+    Потокове читання сирого CSV: лише колонки RAW_FEATURES з фіксованими типами,
+    чанками по chunksize рядків. Пам'ять на чанк обмежена chunksize і не залежить
+    від розміру файлу; накопичуються лише рядки, що пройшли stateless-етапи,
+    з категоріальними колонками у фіксованих CategoricalDtype (allowed_values.json).
+
+    Повертає (df, report): к-сть рядків і чанків, час, розмір найбільшого сирого
+    чанку і накопичених рядків (memory_usage) та виміряний пік RSS процесу
+    і його приріст за час читання (див. src.utils.profiling.ResourceUsage).
+    """
+    raw_dtypes = {raw: RAW_DTYPES[name] for raw, name in RAW_FEATURES.items()}
+    dtypes = load_category_dtypes()
+
+    survivors = []
+    rows_read = 0
+    survivors_bytes = 0
+    peak_chunk_bytes = 0
+
+    with ResourceUsage() as usage:
+        reader = pd.read_csv(input_csv, encoding=encoding, usecols=list(RAW_FEATURES),
+                             dtype=raw_dtypes, chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                rows_read += len(chunk)
+                peak_chunk_bytes = max(peak_chunk_bytes, int(chunk.memory_usage(deep=True).sum()))
+
+                processed = to_categorical(process_chunk(chunk), dtypes)
+                survivors_bytes += int(processed.memory_usage(deep=True).sum())
+                survivors.append(processed)
+
+        df = concat_categorical(survivors, dtypes)
+
+    report = {
+        'rows_read': rows_read,
+        'rows_kept': len(df),
+        'chunks': len(survivors),
+        'elapsed_s': round(usage.wall_s, 3),
+        'peak_chunk_mb': round(peak_chunk_bytes / 1e6, 2),
+        'survivors_mb': round(survivors_bytes / 1e6, 2),
+        'peak_rss_mb': usage.as_dict()['peak_rss_mb'],
+        'rss_growth_mb': round(usage.peak_rss_mb - usage.rss_start_mb, 1) if usage.peak_rss_mb is not None else None,
+    }
+
+    return df, report
@@ -2,26 +2,32 @@ import pandas as pd
 import numpy as np
 
 from src.utils.paths import DATA_DIR
+from src.data.categories import load_category_dtypes, to_categorical, recode
 
 from src.data.configs.seniority_mapping import SENIORITY_LEVEL_MAPPING
 from src.data.configs.experience_mapping import EXPERIENCE_RANGES
 from src.data.configs.salary_mapping import SALARY_RANGES
 
-def select_and_rename_features(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Обирає ключові колонки з сирого датасету,
-    перейменовує їх у стандартні назви і видаляє NaN по цільовій зміні.
-    """
-
-    selected_features = {
+# сирі назви колонок опитування -> стандартні назви
+RAW_FEATURES = {
     'ЗАРПЛАТА / СУМАРНИЙ ДОХІД в IT у $$$ за місяць, лише ставка \nЧИСТИМИ - після сплати податків': 'salary_usd',
     'Тайтл': 'seniority_level',
     'Почніть вводити і оберіть вашу ОСНОВНУ посаду зі списку': 'position',
     'Знання англійської мови': 'english_level',
     'Загальний стаж роботи за нинішньою ІТ-спеціальністю': 'experience_years',
 }
-    df_selected = df[list(selected_features.keys())].copy()
-    df_selected.rename(columns=selected_features, inplace=True)
+
+# нерелевантний клас 'english_level', що видаляється
+EXCLUDED_ENGLISH_LEVEL = 'Не знаю взагалі'
+
+def select_and_rename_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Обирає ключові колонки з сирого датасету,
+    перейменовує їх у стандартні назви і видаляє NaN по цільовій зміні.
+    """
+
+    df_selected = df[list(RAW_FEATURES.keys())].copy()
+    df_selected.rename(columns=RAW_FEATURES, inplace=True)
     df_selected = df_selected.dropna(subset=['salary_usd'])
 
     return df_selected
@@ -42,146 +48,223 @@ def drop_unspecified_positions(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
+def stratified_sample_mask(df: pd.DataFrame,
+                           strata: list,
+                           scale: int,
+                           bins: dict = None,
+                           random_state: int = 25) -> np.ndarray:
+    """
+    Векторизований стратифікований семплінг за один прохід.
+
+    Квота страти: min(size, max(1, int(scale * size / len(df)))).
+    Рядки страти отримують випадковий ранг (cumcount по перемішаних рядках),
+    відбираються рядки з рангом < квоти. Рядки з NaN у стратах не відбираються.
+    bins - {колонка: к-сть квантильних бінів або список меж} замість сирих значень.
+    Повертає булеву маску відібраних рядків (детерміновано для random_state).
+    """
+    bins = bins or {}
+    keys = pd.DataFrame(index=df.index)
+    for col in strata:
+        if col not in bins:
+            keys[col] = df[col]
+        elif np.isscalar(bins[col]):
+            keys[col] = pd.qcut(df[col], q=bins[col], labels=False, duplicates='drop')
+        else:
+            keys[col] = pd.cut(df[col], bins=bins[col], labels=False, include_lowest=True)
+
+    group = keys.groupby(strata, sort=False, dropna=True, observed=True).ngroup().to_numpy()
+    group = np.where(np.isnan(group), -1, group).astype(np.int64)
+    valid = group >= 0
+
+    sizes = np.bincount(group[valid])
+    quota = np.minimum(sizes, np.maximum(1, (scale * sizes / len(df)).astype(np.int64)))
+
+    # ранг рядка всередині страти у випадковому порядку
+    permutation = np.random.default_rng(random_state).permutation(len(df))
+    shuffled = group[permutation]
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[permutation] = pd.Series(shuffled).groupby(shuffled).cumcount().to_numpy()
+
+    mask = np.zeros(len(df), dtype=bool)
+    mask[valid] = rank[valid] < quota[group[valid]]
+    return mask
+
+def balancing_mask(df: pd.DataFrame,
+                   se_scale: int = 100,
+                   qa_scale: int = 600,
+                   random_state: int = 25,
+                   salary_bins=None) -> np.ndarray:
+    """Маска рядків, що залишаються після feature_balancing_category"""
+
+    strata = ['seniority_level', 'salary_usd']
+    bins = {'salary_usd': salary_bins} if salary_bins is not None else None
+
+    category = df['job_category']
+    keep = ~category.isin(['Software Engineering', 'QA & Testing']).to_numpy()
+
+    for name, scale in [('Software Engineering', se_scale), ('QA & Testing', qa_scale)]:
+        in_category = (category == name).to_numpy()
+        keep[in_category] = stratified_sample_mask(df[in_category], strata, scale,
+                                                   bins=bins, random_state=random_state)
+
+    return keep
+
 def feature_balancing_category(df: pd.DataFrame,
                       se_scale: int = 100,
                       qa_scale: int = 600,
-                      random_state: int = 25
+                      random_state: int = 25,
+                      salary_bins=None
                       ) -> pd.DataFrame:
     """
     Балансування категорії 'job_category' шляхом стратифікованого семплінгу
     для Software Engineering та QA & Testing відносно 'seniority_level' і 'salary_usd'.
-    Працює без FutureWarning у старих версіях pandas.
+    salary_bins - страти по бінах зарплати (к-сть квантилів або межі) замість сирих значень.
     """
 
-    se_df = df[df['job_category'] == 'Software Engineering']
-    qa_df = df[df['job_category'] == 'QA & Testing']
-    other_df = df[~df['job_category'].isin(['Software Engineering', 'QA & Testing'])]
-
-    # Стратифікований семплінг Software Engineering
-    se_sampled = pd.concat([
-        x.sample(min(len(x), max(1, int(se_scale * len(x) / len(se_df)))), random_state=random_state)
-        for _, x in se_df.groupby(['seniority_level', 'salary_usd'])
-    ], ignore_index=True)
-
-    # Стратифікований семплінг QA & Testing
-    qa_sampled = pd.concat([
-        x.sample(min(len(x), max(1, int(qa_scale * len(x) / len(qa_df)))), random_state=random_state)
-        for _, x in qa_df.groupby(['seniority_level', 'salary_usd'])
-    ], ignore_index=True)
+    keep = balancing_mask(df, se_scale, qa_scale, random_state, salary_bins)
 
     # Об’єднання всіх груп
-    balanced_df = pd.concat([se_sampled, qa_sampled, other_df], ignore_index=True)
+    balanced_df = df[keep].reset_index(drop=True)
 
     return balanced_df
 
 def preprocessing_feature_english(df: pd.DataFrame) -> pd.DataFrame:
     """Очищення малозначимих фіч (мала к-сть + нерелевантний клас)"""
 
-    indices_english = df[df['english_level'] == 'Не знаю взагалі'].index
+    indices_english = df[df['english_level'] == EXCLUDED_ENGLISH_LEVEL].index
     df.drop(indices_english, inplace=True)
 
     return df
 
-def cleaning_outliers_experience(df: pd.DataFrame) -> pd.DataFrame:
-    """Очищення фіч 'experience_years' базуючись на 'seniority_level' """
-    df_copy = df.copy()
-    df_copy['is_outlier'] = False
-    df_copy['outlier_score'] = float(0.0)
-
-    def set_outlier_scores():
-        for index, row in df_copy.iterrows():
-            seniority = row['seniority_level']
-            experience = row['experience_years']
-
-            score = 0.0
-
-            if seniority in EXPERIENCE_RANGES:
-                rules = EXPERIENCE_RANGES[seniority]
-
-                # змінні для діапазонів
-                critical_outlier = rules['critical_outlier']
-                outlier_threshold = rules['outlier_threshold']
-                acceptable_threshold = rules['acceptable']
-                typical_range = rules['typical_range']
-
-                if 'max_outlier' in rules and experience > rules['max_outlier']:
-                    score = 1.0
-                elif typical_range[0] <= experience <= typical_range[1]:
-                    score = 0.0
-                elif acceptable_threshold[0] <= experience <= acceptable_threshold[1]:
-                    score = 0.25
-                elif experience < critical_outlier:
-                    score = 0.75
-                elif experience < outlier_threshold:
-                    score = 0.50
-                else:
-                    score = 1.0
-
-            if score >= 0.5:
-                df_copy.at[index, 'is_outlier'] = True
-            df_copy.at[index, 'outlier_score'] = score
-
-            # залишаю лише дані без викидів
-            df_normal = df_copy[df_copy['is_outlier'] == False]
-            df_normal = df_normal.drop(columns=['is_outlier', 'outlier_score'])
-
-        return df_normal
-
-    df_without_exp_outliers = set_outlier_scores()
-
-    return df_without_exp_outliers
-
-def cleaning_outliers_salary(df: pd.DataFrame) -> pd.DataFrame:
-    """Очищення фіч 'salary_usd' базуючись на 'seniority_level' """
-
-    df_copy = df.copy()
-    df_copy['is_outlier'] = False
-    df_copy['salary_score'] = float(0.0)
-
-    def set_outlier_scores():
-
-        for index, row in df_copy.iterrows():
-            seniority = row['seniority_level']
-            salary = row['salary_usd']
-
-            score = float(0.0)
-
-            if seniority in SALARY_RANGES:
-                rules = SALARY_RANGES[seniority]
+# ---------- векторизований скоринг викидів ----------
+def _compile_experience_rules(ranges: dict = EXPERIENCE_RANGES) -> dict:
+    """
+    Компілює EXPERIENCE_RANGES у NumPy-масиви порогів,
+    де позиція в масиві відповідає коду рівня у 'levels'.
+    """
+    levels = list(ranges.keys())
+    rules = [ranges[level] for level in levels]
+
+    return {
+        'levels': levels,
+        'typical_low': np.array([r['typical_range'][0] for r in rules], dtype=float),
+        'typical_high': np.array([r['typical_range'][1] for r in rules], dtype=float),
+        'acceptable_low': np.array([r['acceptable'][0] for r in rules], dtype=float),
+        'acceptable_high': np.array([r['acceptable'][1] for r in rules], dtype=float),
+        'critical_outlier': np.array([r['critical_outlier'] for r in rules], dtype=float),
+        'outlier_threshold': np.array([r['outlier_threshold'] for r in rules], dtype=float),
+        # відсутній 'max_outlier' == без верхньої межі
+        'max_outlier': np.array([r.get('max_outlier', np.inf) for r in rules], dtype=float),
+    }
+
+def _compile_salary_rules(ranges: dict = SALARY_RANGES) -> dict:
+    """
+    Компілює SALARY_RANGES у NumPy-масиви порогів (аналогічно до досвіду).
+    """
+    levels = list(ranges.keys())
+    rules = [ranges[level] for level in levels]
+
+    return {
+        'levels': levels,
+        'typical_low': np.array([r['typical_range'][0] for r in rules], dtype=float),
+        'typical_high': np.array([r['typical_range'][1] for r in rules], dtype=float),
+        'acceptable_low': np.array([r['acceptable'][0] for r in rules], dtype=float),
+        'acceptable_high': np.array([r['acceptable'][1] for r in rules], dtype=float),
+        'outlier_low': np.array([r['outlier_range'][0] for r in rules], dtype=float),
+        'outlier_high': np.array([r['outlier_range'][1] for r in rules], dtype=float),
+    }
+
+def _seniority_codes(seniority, levels: list) -> np.ndarray:
+    """Коди рівнів відносно 'levels'; -1 для рівнів поза правилами (у т.ч. NaN)"""
+    return recode(seniority, levels)
+
+def score_experience_outliers(seniority, experience, ranges: dict = EXPERIENCE_RANGES) -> np.ndarray:
+    """
+    Оцінка викидів 'experience_years' відносно 'seniority_level' за один прохід.
 
-                acceptable_threshold = rules['acceptable']
-                typical_range = rules['typical_range']
-                outlier_threshold = rules['outlier_range']
-                critical_range = rules['critical_range']
+    Шкала: 0 (типово), 0.25 (допустимо), 0.5 (підозріло),
+    0.75 (критично мало), 1.0 (викид). Рівні без правил отримують 0.
+    """
+    rules = _compile_experience_rules(ranges)
+    codes = _seniority_codes(seniority, rules['levels'])
+    known = codes >= 0
+    idx = np.where(known, codes, 0)
+    experience = np.asarray(experience, dtype=float)
+
+    # порядок умов повторює порядок перевірок у правилах
+    conditions = [
+        ~known,
+        experience > rules['max_outlier'][idx],
+        (rules['typical_low'][idx] <= experience) & (experience <= rules['typical_high'][idx]),
+        (rules['acceptable_low'][idx] <= experience) & (experience <= rules['acceptable_high'][idx]),
+        experience < rules['critical_outlier'][idx],
+        experience < rules['outlier_threshold'][idx],
+    ]
+    choices = [0.0, 1.0, 0.0, 0.25, 0.75, 0.5]
+
+    return np.select(conditions, choices, default=1.0)
+
+def score_salary_outliers(seniority, salary, ranges: dict = SALARY_RANGES) -> np.ndarray:
+    """
+    Оцінка викидів 'salary_usd' відносно 'seniority_level' за один прохід.
 
-                if typical_range[0] <= salary <= typical_range[1]:
-                    score = 0.0
-                elif acceptable_threshold[0] <= salary <= acceptable_threshold[1]:
-                    score = 0.25
-                elif outlier_threshold[0] <= salary <= outlier_threshold[1]:
-                    score = 0.75
-                elif critical_range[0] <= salary <= critical_range[1]:
-                    score = 1.0
-                else:
-                    score = 1.0
+    Шкала: 0 (типово), 0.25 (допустимо), 0.75 (підозріло), 1.0 (викид).
+    Рівні без правил отримують 0.
+    """
+    rules = _compile_salary_rules(ranges)
+    codes = _seniority_codes(seniority, rules['levels'])
+    known = codes >= 0
+    idx = np.where(known, codes, 0)
+    salary = np.asarray(salary, dtype=float)
+
+    conditions = [
+        ~known,
+        (rules['typical_low'][idx] <= salary) & (salary <= rules['typical_high'][idx]),
+        (rules['acceptable_low'][idx] <= salary) & (salary <= rules['acceptable_high'][idx]),
+        (rules['outlier_low'][idx] <= salary) & (salary <= rules['outlier_high'][idx]),
+    ]
+    choices = [0.0, 0.0, 0.25, 0.75]
+
+    return np.select(conditions, choices, default=1.0)
+
+def cleaning_outliers_experience(df: pd.DataFrame,
+                                 keep_scores: bool = False) -> pd.DataFrame:
+    """
+    Очищення фіч 'experience_years' базуючись на 'seniority_level'.
+    keep_scores=True залишає колонку 'outlier_score' для аудиту.
+    """
+    scores = score_experience_outliers(df['seniority_level'], df['experience_years'])
+    is_normal = scores < 0.5
 
-            if score >= 0.5:
-                df_copy.at[index, 'is_outlier'] = True
-            df_copy.at[index, 'salary_score'] = score
+    # залишаю лише дані без викидів
+    df_normal = df.loc[is_normal]
+    if keep_scores:
+        df_normal = df_normal.assign(outlier_score=scores[is_normal])
 
-            # залишаю лише дані без викидів
-            df_normal = df_copy[df_copy['is_outlier'] == False]
-            df_normal = df_normal.drop(columns=['is_outlier', 'salary_score']).reset_index(drop=True)
+    return df_normal
 
-        return df_normal
+def cleaning_outliers_salary(df: pd.DataFrame,
+                             keep_scores: bool = False) -> pd.DataFrame:
+    """
+    Очищення фіч 'salary_usd' базуючись на 'seniority_level'.
+    keep_scores=True залишає колонку 'salary_score' для аудиту.
+    """
+    scores = score_salary_outliers(df['seniority_level'], df['salary_usd'])
+    is_normal = scores < 0.5
 
-    df_with_salary_outliers = set_outlier_scores()
+    # залишаю лише дані без викидів
+    df_normal = df.loc[is_normal].reset_index(drop=True)
+    if keep_scores:
+        df_normal['salary_score'] = scores[is_normal]
 
-    return df_with_salary_outliers
+    return df_normal
 
 def export_dataframe(df: pd.DataFrame,
                      save: bool) -> pd.DataFrame:
-    """Сортує фічі у визначеному порядку та (опціонально) зберігає датафрейм у CSV."""
+    """
+    Сортує фічі у визначеному порядку, переводить категоріальні колонки
+    у CategoricalDtype (allowed_values.json) та (опціонально) зберігає датафрейм у CSV.
+    """
 
     def sort_features(df: pd.DataFrame) -> pd.DataFrame:
         """Впорядкування фічі у необхідному порядку"""
@@ -189,7 +272,7 @@ def export_dataframe(df: pd.DataFrame,
         cols = ['job_category', 'seniority_level', 'english_level', 'experience_years', 'salary_usd']
         return df[cols].copy()
 
-    df = sort_features(df)
+    df = to_categorical(sort_features(df), load_category_dtypes(), drop_unused_extra=True)
 
     if save:
         path = DATA_DIR / "processed/model_input_df.csv"
@@ -0,0 +1,243 @@
+import time
+import hashlib
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from src.data.configs.seniority_mapping import SENIORITY_LEVEL_MAPPING
+from src.data.configs.categories_mapping import JOB_CATEGORY_MAPPING
+from src.data.categories import CATEGORICAL_COLUMNS, load_category_dtypes, categorize_column
+from src.utils.profiling import profile_stage
+from src.data.preprocessing import (
+    RAW_FEATURES,
+    EXCLUDED_ENGLISH_LEVEL,
+    balancing_mask,
+    score_experience_outliers,
+    score_salary_outliers,
+)
+
+STAGE_KINDS = ('transform', 'filter', 'sample')
+
+class Stage:
+    """
+    Вузол графа препроцесингу.
+
+    kind:
+    - 'transform': рядкова функція df -> {колонка: значення} для outputs
+    - 'filter': рядкова функція df -> булева маска (True - рядок залишається)
+    - 'sample': функція df -> маска, що залежить від усього набору рядків
+      (напр. балансування), тому виконується на вже відфільтрованому фреймі
+    """
+
+    def __init__(self, name: str, func, inputs: list, outputs: list = (), kind: str = 'transform'):
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown stage kind '{kind}', expected one of {STAGE_KINDS}")
+        if kind != 'transform' and outputs:
+            raise ValueError(f"Stage '{name}' of kind '{kind}' can't produce columns")
+
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.kind = kind
+
+    def __repr__(self):
+        return f'Stage({self.name!r}, {self.kind}, {self.inputs} -> {self.outputs})'
+
+class StageGraph:
+    """
+    Виконавець лінійного графа стадій з оголошеними вхідними/вихідними колонками.
+
+    - transform-стадії, чиї outputs ніхто не використовує, відкидаються
+    - колонки видаляються з фрейму одразу після останнього використання
+    - маски послідовних filter-стадій об'єднуються і застосовуються один раз
+      (перед 'sample'-стадією або в кінці); transform-стадії рядкові, тому
+      рахуються на невідфільтрованому фреймі без проміжних копій
+    - cache (dict) - результат стадії за хешем її вхідних колонок
+    """
+
+    def __init__(self, stages: list, output_columns: list):
+        self.output_columns = list(output_columns)
+        self.stages = self._prune(list(stages))
+        self.required_columns = self._required_columns()
+
+    def _prune(self, stages: list) -> list:
+        """Відкидає transform-стадії без споживачів (обхід з кінця)"""
+        needed = set(self.output_columns)
+        kept = []
+        for stage in reversed(stages):
+            if stage.kind == 'transform' and not needed.intersection(stage.outputs):
+                continue
+            needed.difference_update(stage.outputs)
+            needed.update(stage.inputs)
+            kept.append(stage)
+        return kept[::-1]
+
+    def _required_columns(self) -> list:
+        """Колонки, які мають бути у вхідному фреймі (не створюються стадіями)"""
+        produced, required = set(), []
+        for stage in self.stages:
+            required += [col for col in stage.inputs if col not in produced and col not in required]
+            produced.update(stage.outputs)
+        required += [col for col in self.output_columns if col not in produced and col not in required]
+        return required
+
+    def _last_use(self) -> dict:
+        """колонка -> індекс останньої стадії, що її читає (len(stages) - вихід)"""
+        last_use = {}
+        for idx, stage in enumerate(self.stages):
+            for col in stage.inputs:
+                last_use[col] = idx
+        for col in self.output_columns:
+            last_use[col] = len(self.stages)
+        return last_use
+
+    @staticmethod
+    def _input_key(stage: Stage, df: pd.DataFrame) -> str:
+        hashed = pd.util.hash_pandas_object(df[stage.inputs], index=False).to_numpy()
+        return hashlib.sha1(stage.name.encode() + hashed.tobytes()).hexdigest()
+
+    def run(self, df: pd.DataFrame, cache: dict = None, track_memory: bool = False, profiler=None):
+        """
+        Виконує граф над df (володіє фреймом - змінює його на місці).
+        Повертає (результат, report) - список {stage, kind, rows, time_ms, peak_mb, cached}.
+        profiler - src.utils.profiling.StageProfiler: кожна стадія - окремий етап профілю.
+        """
+        missing = [col for col in self.required_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f'Missing input columns: {missing}')
+
+        df = df[self.required_columns]
+        last_use = self._last_use()
+        mask = None # відкладена маска об'єднаних фільтрів
+        report = []
+
+        for idx, stage in enumerate(self.stages):
+            if stage.kind == 'sample' and mask is not None:
+                df, mask = df[mask].reset_index(drop=True), None
+
+            with profile_stage(profiler, stage.name, kind=stage.kind) as profile_record:
+                df, mask, cached, elapsed_ms, peak_mb = self._run_stage(
+                    idx, stage, df, mask, cache, track_memory, last_use)
+                rows = profile_record['rows'] = len(df) if mask is None else int(mask.sum())
+
+            report.append({
+                'stage': stage.name,
+                'kind': stage.kind,
+                'rows': rows,
+                'time_ms': round(elapsed_ms, 2),
+                'peak_mb': peak_mb,
+                'cached': cached,
+            })
+
+        if mask is not None:
+            df = df[mask]
+
+        return df[self.output_columns].reset_index(drop=True), report
+
+    def _run_stage(self, idx: int, stage: Stage, df: pd.DataFrame, mask, cache: dict,
+                   track_memory: bool, last_use: dict):
+        """Одна стадія run(): (df, mask, cached, time_ms, peak_mb)"""
+        if track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+
+        key = self._input_key(stage, df) if cache is not None else None
+        cached = key is not None and key in cache
+        result = cache[key] if cached else stage.func(df)
+        if key is not None and not cached:
+            cache[key] = result
+
+        if stage.kind == 'transform':
+            for col in stage.outputs:
+                values = result[col]
+                # результат з кешу міг бути обчислений на фреймі з іншим індексом
+                df[col] = values.set_axis(df.index) if isinstance(values, pd.Series) else values
+        elif stage.kind == 'filter':
+            result = np.asarray(result, dtype=bool)
+            mask = result if mask is None else mask & result
+        else:
+            df = df[np.asarray(result, dtype=bool)].reset_index(drop=True)
+
+        # колонки, які більше ніхто не читає
+        for col in [col for col in df.columns if last_use.get(col, -1) <= idx]:
+            del df[col]
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        peak_mb = None
+        if track_memory:
+            peak_mb = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+            tracemalloc.stop()
+
+        return df, mask, cached, elapsed_ms, peak_mb
+
+# ---------- граф препроцесингу сирих даних ----------
+def _drop_missing_salary(df):
+    return df['salary_usd'].notna()
+
+def _map_seniority(df):
+    return {'seniority_level': df['seniority_level'].map(SENIORITY_LEVEL_MAPPING)}
+
+def _drop_unspecified(df):
+    return df['seniority_level'] != 'Not Specified'
+
+def _map_job_category(df):
+    return {'job_category': df['position'].map(JOB_CATEGORY_MAPPING)}
+
+def _drop_english(df):
+    return df['english_level'] != EXCLUDED_ENGLISH_LEVEL
+
+def _drop_experience_outliers(df):
+    return score_experience_outliers(df['seniority_level'], df['experience_years']) < 0.5
+
+def _drop_salary_outliers(df):
+    return score_salary_outliers(df['seniority_level'], df['salary_usd']) < 0.5
+
+def build_preprocessing_graph(category_dtypes: dict = None) -> StageGraph:
+    """
+    Етапи preprocces_data у вигляді графа. Одразу після мапінгу категоріальні
+    колонки переводяться у CategoricalDtype з категоріями allowed_values.json.
+    """
+    category_dtypes = category_dtypes or load_category_dtypes()
+
+    def categorize(df):
+        return {col: categorize_column(df[col], category_dtypes[col]) for col in CATEGORICAL_COLUMNS}
+
+    stages = [
+        Stage('drop_missing_salary', _drop_missing_salary, ['salary_usd'], kind='filter'),
+        Stage('map_seniority', _map_seniority, ['seniority_level'], ['seniority_level']),
+        Stage('drop_unspecified', _drop_unspecified, ['seniority_level'], kind='filter'),
+        Stage('map_job_category', _map_job_category, ['position'], ['job_category']),
+        Stage('categorize', categorize, list(CATEGORICAL_COLUMNS), list(CATEGORICAL_COLUMNS)),
+        Stage('balance_job_category', balancing_mask,
+              ['job_category', 'seniority_level', 'salary_usd'], kind='sample'),
+        Stage('drop_english', _drop_english, ['english_level'], kind='filter'),
+        Stage('drop_experience_outliers', _drop_experience_outliers,
+              ['seniority_level', 'experience_years'], kind='filter'),
+        Stage('drop_salary_outliers', _drop_salary_outliers,
+              ['seniority_level', 'salary_usd'], kind='filter'),
+    ]
+    output_columns = ['job_category', 'seniority_level', 'english_level', 'experience_years', 'salary_usd']
+
+    return StageGraph(stages, output_columns)
+
+def run_preprocessing_graph(input_csv, graph: StageGraph = None, cache: dict = None,
+                            track_memory: bool = False, encoding: str = 'cp1251', profiler=None):
+    """
+    Читає з сирого CSV лише колонки, потрібні графу, і виконує його.
+    Повертає (df, report). profiler - див. StageGraph.run.
+    """
+    graph = graph or build_preprocessing_graph()
+    raw_names = {name: raw for raw, name in RAW_FEATURES.items()}
+    usecols = [raw_names[col] for col in graph.required_columns]
+
+    start = time.perf_counter()
+    with profile_stage(profiler, 'read_csv', kind='source') as profile_record:
+        df = pd.read_csv(input_csv, encoding=encoding, usecols=usecols).rename(columns=RAW_FEATURES)
+        profile_record['rows'] = len(df)
+    source = {'stage': 'read_csv', 'kind': 'source', 'rows': len(df),
+              'time_ms': round((time.perf_counter() - start) * 1000, 2), 'peak_mb': None, 'cached': False}
+
+    df, report = graph.run(df, cache=cache, track_memory=track_memory, profiler=profiler)
+
+    return df, [source] + report
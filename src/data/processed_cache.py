@@ -0,0 +1,75 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+import pandas as pd
+
+from src.data.configs.seniority_mapping import SENIORITY_LEVEL_MAPPING
+from src.data.configs.categories_mapping import JOB_CATEGORY_MAPPING
+from src.data.configs.experience_mapping import EXPERIENCE_RANGES
+from src.data.configs.salary_mapping import SALARY_RANGES
+from src.data.categories import load_category_dtypes, to_categorical
+
+# збільшувати при зміні логіки етапів preprocces_data (мапінги враховуються автоматично)
+CACHE_VERSION = 3
+
+def mappings_fingerprint() -> str:
+    """Хеш мапінгів і категорій, від яких залежить результат препроцесингу"""
+    mappings = {
+        'categories': {col: list(dtype.categories) for col, dtype in load_category_dtypes().items()},
+        'seniority': SENIORITY_LEVEL_MAPPING,
+        'job_category': JOB_CATEGORY_MAPPING,
+        'experience': EXPERIENCE_RANGES,
+        'salary': SALARY_RANGES,
+    }
+    payload = json.dumps(mappings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def file_fingerprint(path) -> str:
+    """sha256 вмісту файлу (читається блоками, без завантаження в пам'ять)"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+def processed_cache_key(input_csv) -> str:
+    """Ключ кешу: вміст сирого файлу + мапінги + версія логіки"""
+    digest = hashlib.sha256()
+    digest.update(f'v{CACHE_VERSION}'.encode())
+    digest.update(file_fingerprint(input_csv).encode())
+    digest.update(mappings_fingerprint().encode())
+    return digest.hexdigest()[:32]
+
+def cache_path(cache_dir, key: str) -> Path:
+    return Path(cache_dir) / f'model_input_{key}.parquet'
+
+def read_parquet(path) -> pd.DataFrame:
+    """
+    Memory-mapped Parquet; категоріальні колонки повертаються у CategoricalDtype
+    з категоріями allowed_values.json, як після preprocces_data.
+    """
+    df = pd.read_parquet(path, memory_map=True)
+    return to_categorical(df, load_category_dtypes(), drop_unused_extra=True)
+
+def write_parquet(df: pd.DataFrame, path) -> Path:
+    """
+    Parquet з рядковими колонками як категоріями (словникове кодування Arrow).
+    Запис атомарний через тимчасовий файл.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    categorical = {col: 'category' for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])}
+    tmp_path = path.with_suffix('.tmp')
+    df.astype(categorical).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    return path
+
+def load_processed(cache_dir, key: str):
+    """Оброблені дані з кешу або None, якщо ключ не збігся"""
+    path = cache_path(cache_dir, key)
+    if not path.exists():
+        return None
+    return read_parquet(path)
+
+def save_processed(df: pd.DataFrame, cache_dir, key: str) -> Path:
+    return write_parquet(df, cache_path(cache_dir, key))
@@ -0,0 +1,139 @@
+import os
+import json
+import hashlib
+import time
+from pathlib import Path
+import pandas as pd
+
+from src.utils.paths import DATA_DIR
+from src.utils.logger import get_logger
+from src.data.categories import load_category_dtypes, to_categorical
+from src.data.processed_cache import (
+    CACHE_VERSION,
+    file_fingerprint,
+    mappings_fingerprint,
+    read_parquet,
+    write_parquet,
+)
+
+logger = get_logger(__name__)
+
+SNAPSHOT_COLUMN = 'snapshot'
+
+def discover_raw_snapshots(raw_dir=DATA_DIR / 'raw') -> list:
+    """Сирі вивантаження опитування (*.csv) у порядку назв"""
+    return sorted(Path(raw_dir).glob('*.csv'))
+
+class SnapshotStore:
+    """
+    Інкрементальне сховище оброблених даних: одна Parquet-партиція на сире
+    вивантаження (snapshot=<назва файлу>-<хеш шляху>/part.parquet) + manifest.json
+    з хешем вмісту, мапінгів і версією логіки для кожної партиції.
+
+    ingest обробляє лише нові або змінені файли, тому додавання одного
+    періоду коштує час на цей період, а не на всю історію. Кожне вивантаження
+    обробляється окремо (у т.ч. балансування категорій - в межах снапшоту).
+    """
+
+    def __init__(self, root=DATA_DIR / 'processed/snapshots'):
+        self.root = Path(root)
+        self.manifest_path = self.root / 'manifest.json'
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def snapshot_name(raw_csv) -> str:
+        """Назва файлу + хеш абсолютного шляху: x/2025.csv і y/2025.csv - різні снапшоти"""
+        path = Path(raw_csv).resolve()
+        return f'{path.stem}-{hashlib.sha1(str(path).encode()).hexdigest()[:8]}'
+
+    def partition_path(self, name: str) -> Path:
+        return self.root / f'{SNAPSHOT_COLUMN}={name}' / 'part.parquet'
+
+    def is_current(self, raw_csv, mappings: str) -> bool:
+        """
+        Чи актуальна партиція для файлу. Хеш вмісту рахується лише якщо
+        змінились розмір або mtime, тому незмінна історія не перечитується.
+        """
+        return self._check(raw_csv, mappings)[0]
+
+    def _check(self, raw_csv, mappings: str) -> tuple:
+        """(актуальна, хеш вмісту або None, якщо його не знадобилось рахувати)"""
+        entry = self.manifest.get(self.snapshot_name(raw_csv))
+        if entry is None or not self.partition_path(self.snapshot_name(raw_csv)).exists():
+            return False, None
+        if entry['mappings'] != mappings or entry['cache_version'] != CACHE_VERSION:
+            return False, None
+
+        stat = os.stat(raw_csv)
+        if (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            return True, None
+        content_hash = file_fingerprint(raw_csv)
+        return entry['content_hash'] == content_hash, content_hash
+
+    def ingest(self, raw_files, process) -> list:
+        """
+        Обробляє нові/змінені сирі файли і дописує їх партиції.
+        process(raw_csv) -> DataFrame - функція препроцесингу одного файлу
+        (зазвичай src.pipeline.preprocces_data). Повертає назви оброблених снапшотів.
+        """
+        mappings = mappings_fingerprint()
+        processed = []
+
+        for raw_csv in raw_files:
+            name = self.snapshot_name(raw_csv)
+            current, content_hash = self._check(raw_csv, mappings)
+            if current:
+                logger.info(f'Snapshot {name} is up to date, skipping')
+                continue
+
+            # хеш і stat - до обробки: manifest описує саме той вміст, що оброблено
+            start = time.perf_counter()
+            content_hash = content_hash or file_fingerprint(raw_csv)
+            stat = os.stat(raw_csv)
+            df = process(raw_csv)
+            df[SNAPSHOT_COLUMN] = name
+            write_parquet(df, self.partition_path(name))
+
+            self.manifest[name] = {
+                'source': str(raw_csv),
+                'content_hash': content_hash,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'mappings': mappings,
+                'cache_version': CACHE_VERSION,
+                'rows': len(df),
+            }
+            # manifest оновлюється після кожної партиції - перерваний ingest не втрачає готові
+            self._write_manifest()
+            processed.append(name)
+            logger.info(f'Snapshot {name} ingested: {len(df)} rows '
+                        f'in {time.perf_counter() - start:.2f}s')
+
+        return processed
+
+    def snapshots(self) -> list:
+        """Снапшоти у порядку першого інгесту"""
+        return list(self.manifest)
+
+    def load(self, snapshots: list = None) -> pd.DataFrame:
+        """Тренувальний датафрейм: конкатенація партицій (за замовчуванням усіх)"""
+        names = self.snapshots() if snapshots is None else list(snapshots)
+        if not names:
+            raise ValueError(f'No snapshots in store {self.root}')
+
+        df = pd.concat([read_parquet(self.partition_path(name)) for name in names], ignore_index=True)
+        # у партиціях можуть відрізнятись додаткові категорії - concat повертає рядки
+        return to_categorical(df, load_category_dtypes(), drop_unused_extra=True)
@@ -0,0 +1,99 @@
+import os
+import hashlib
+import functools
+import threading
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import joblib
+
+# сховища в пам'яті процесу: location -> {ключ: (Xt, fitted_transformer)}
+_MEMORY_STORES = {}
+
+class FoldCache:
+    """
+    Joblib.Memory-подібний кеш для Pipeline(memory=...): зберігає результат
+    fit_transform препроцесора для кожного fold'а.
+
+    joblib.Memory серіалізує весь DataFrame на кожному виклику, що на цих даних
+    коштує стільки ж, скільки сам fit препроцесора. Тут ключ - параметри
+    трансформера + векторизований хеш усіх колонок і індексу X
+    (pd.util.hash_pandas_object, категорії - за значеннями) + байти y.
+
+    Два рівні: dict у пам'яті процесу і файли у location (спільні
+    для процесів пулу і між запусками). Кожен файл - одне фактичне обчислення,
+    тож статистика кешу - n_computed(), а не лічильники окремого процесу.
+    """
+
+    def __init__(self, location):
+        self.location = str(location)
+        Path(self.location).mkdir(parents=True, exist_ok=True)
+
+    # GridSearchCV клонує pipeline разом із memory (deepcopy) - кеш має бути спільним
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        return {'location': self.location}
+
+    @property
+    def _store(self) -> dict:
+        return _MEMORY_STORES.setdefault(self.location, {})
+
+    def cache(self, func, ignore=None, **kwargs):
+        @functools.wraps(func)
+        def cached_func(transformer, X, y=None, *args, **func_kwargs):
+            key = self.make_key(transformer, X, y)
+
+            result = self._store.get(key)
+            if result is None:
+                path = Path(self.location) / f'{key}.pkl'
+                result = self._load(path)
+                if result is None:
+                    result = func(transformer, X, y, *args, **func_kwargs)
+                    self._dump(result, path)
+                self._store[key] = result
+            return result
+
+        return cached_func
+
+    @staticmethod
+    def _load(path: Path):
+        """Результат з диску; None - файлу немає або він не читається (= промах кешу)"""
+        if not path.exists():
+            return None
+        try:
+            return joblib.load(path)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _dump(result, path: Path):
+        """
+        Запис через тимчасовий файл процесу/потоку: процеси пулу рахують ті самі
+        fold'и одночасно, і читач бачить або повний файл, або жодного
+        """
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}-{threading.get_ident()}.tmp')
+        joblib.dump(result, tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def make_key(transformer, X, y) -> str:
+        digest = hashlib.sha1(joblib.hash(transformer).encode())
+        if isinstance(X, pd.DataFrame):
+            digest.update(repr((X.shape, list(X.columns))).encode())
+            # усі колонки: інакше зміна мапінгу категорій при тих самих числових
+            # колонках повертала б енкодер, навчений на старих категоріях
+            digest.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+        else:
+            digest.update(joblib.hash(X).encode())
+        if y is not None:
+            digest.update(np.ascontiguousarray(np.asarray(y)).tobytes())
+        return digest.hexdigest()
+
+    def n_computed(self) -> int:
+        """К-сть фактичних fit'ів по всіх процесах (= к-сть файлів у кеші)"""
+        return sum(1 for _ in Path(self.location).glob('*.pkl'))
+
+    def clear(self):
+        _MEMORY_STORES.pop(self.location, None)
@@ -0,0 +1,70 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime, UTC
+import joblib
+import numpy as np
+
+from src.utils.paths import MODELS_DIR
+
+MODEL_FILE = 'best_model.pkl'
+METADATA_FILE = 'model_metadata.pkl'
+TREE_ENSEMBLE_FILE = 'tree_ensemble.npz'
+
+def _dump_atomic(obj, path: Path, **kwargs):
+    """joblib.dump через тимчасовий файл: читач бачить або старий, або повний новий файл"""
+    tmp_path = path.with_suffix('.tmp')
+    joblib.dump(obj, tmp_path, **kwargs)
+    os.replace(tmp_path, path)
+
+def save_model_artifacts(pipeline, metadata: dict, models_dir=MODELS_DIR, tree_ensemble: dict = None) -> str:
+    """
+    Зберігає best_model.pkl і model_metadata.pkl з новою версією.
+    tree_ensemble - масиви models.tree_ensemble.export_tree_ensemble (tree_ensemble.npz),
+    None - файл попередньої моделі видаляється.
+    Метадані пишуться останніми - їх зміна є сигналом для ModelRegistryWatcher,
+    що нова модель вже повністю на диску. Повертає версію.
+    """
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+
+    # без стиснення: розпаковка не витрачає час на декомпресію
+    _dump_atomic(pipeline, models_dir / MODEL_FILE, compress=0)
+
+    metadata = dict(metadata)
+    if tree_ensemble is not None:
+        tmp_path = models_dir / (TREE_ENSEMBLE_FILE + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **tree_ensemble)
+        os.replace(tmp_path, models_dir / TREE_ENSEMBLE_FILE)
+        metadata['tree_ensemble'] = TREE_ENSEMBLE_FILE
+    else:
+        (models_dir / TREE_ENSEMBLE_FILE).unlink(missing_ok=True)
+
+    # версія - час + хеш моделі і метаданих (ті самі артефакти -> той самий хеш)
+    with open(models_dir / MODEL_FILE, 'rb') as f:
+        digest = hashlib.file_digest(f, 'sha256')
+    digest.update(json.dumps(metadata, sort_keys=True, default=str).encode())
+    digest = digest.hexdigest()
+    trained_at = datetime.now(UTC)
+    version = f'{trained_at:%Y%m%dT%H%M%S}-{digest[:8]}'
+
+    _dump_atomic({**metadata, 'version': version, 'trained_at': trained_at.isoformat()},
+                 models_dir / METADATA_FILE)
+    return version
+
+def artifact_version(model_path, metadata: dict) -> str:
+    """Версія з метаданих; для артефактів, збережених до появи версій, - mtime моделі"""
+    return metadata.get('version') or f'mtime-{os.stat(model_path).st_mtime_ns}'
+
+def metadata_stamp(metadata_path):
+    """(mtime_ns, size) файлу метаданих або None, якщо його немає - дешева перевірка змін"""
+    try:
+        stat = os.stat(metadata_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def read_version(model_path, metadata_path) -> str:
+    return artifact_version(model_path, joblib.load(metadata_path))
@@ -1,18 +1,221 @@
+import os
+import time
+import shutil
+import tempfile
 import numpy as np
 import pandas as pd
 import joblib
+import multiprocessing
+from multiprocessing.connection import wait as connection_wait
+from threadpoolctl import threadpool_limits
 
+from sklearn.base import clone
 from sklearn.pipeline import Pipeline
-from sklearn.model_selection import GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV, RandomizedSearchCV
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 
 from src.models.configs.regression_models import REGRESSION_MODELS
+from src.models.preprocessor_cache import FoldCache
+from src.models.registry import save_model_artifacts
 from src.utils.paths import MODELS_DIR
 from src.utils.logger import get_logger
+from src.utils.profiling import ResourceUsage, profile_stage, search_candidates
 
 logger = get_logger(__name__)
 
-def run_training(data_bundle, preprocessor, save_best_model: bool):
+SEARCH_MODES = ('grid', 'halving', 'random')
+
+def grid_size(params: dict) -> int:
+    """Кількість комбінацій гіперпараметрів у сітці"""
+    return int(np.prod([len(values) for values in params.values()]))
+
+def build_search(pipeline, params: dict, search_mode: str, n_jobs: int,
+                 n_iter: int = 20, random_state: int = 25):
+    """
+    Пошук гіперпараметрів:
+    - 'grid': вичерпний GridSearchCV
+    - 'halving': successive halving (HalvingGridSearchCV) по к-сті рядків
+    - 'random': RandomizedSearchCV з n_iter кандидатами
+    """
+    if search_mode == 'grid':
+        return GridSearchCV(pipeline, param_grid=params, scoring='r2', n_jobs=n_jobs)
+    if search_mode == 'halving':
+        return HalvingGridSearchCV(pipeline, param_grid=params, scoring='r2', n_jobs=n_jobs,
+                                   factor=3, random_state=random_state)
+    if search_mode == 'random':
+        return RandomizedSearchCV(pipeline, param_distributions=params, scoring='r2', n_jobs=n_jobs,
+                                  n_iter=min(n_iter, grid_size(params)), random_state=random_state)
+    raise ValueError(f"Unknown search_mode '{search_mode}', expected one of {SEARCH_MODES}")
+
+def count_preprocessor_fits(search) -> int:
+    """
+    К-сть викликів fit препроцесора за пошук: кандидати x fold'и (по всіх
+    ітераціях для halving) + refit найкращого на всьому train
+    """
+    n_splits = search.n_splits_
+    if hasattr(search, 'n_candidates_'):
+        n_candidate_fits = sum(search.n_candidates_)
+    else:
+        n_candidate_fits = len(search.cv_results_['params'])
+    return n_candidate_fits * n_splits + int(bool(search.refit))
+
+def fit_model_search(name, model, params, preprocessor, X_train, y_train,
+                     search_mode: str = 'grid', thread_budget: int = 1, cache_dir=None):
+    """
+    Пошук гіперпараметрів для однієї моделі (у поточному або окремому процесі).
+
+    thread_budget - к-сть паралельних CV-задач цієї моделі; кожна задача рахує
+    в один потік, щоб не було вкладеної oversubscription: n_jobs регресора
+    (XGBoost/RandomForest/KNN) = 1, а пули OpenMP/BLAS (HistGradientBoosting,
+    лінійна алгебра) обмежені threadpoolctl у поточному процесі і
+    inner_max_num_threads=1 у loky-воркерах CV.
+    cache_dir - кеш fitted препроцесора (FoldCache): параметри препроцесора не залежать
+    від гіперпараметрів регресора, тому на кожному fold'і він фітиться один раз
+    для всіх кандидатів і всіх моделей.
+    search.resource_usage_ - wall/CPU/пік RSS пошуку в процесі, що його виконав
+    (див. src.utils.profiling.ResourceUsage).
+    """
+    model = clone(model)
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+
+    memory = FoldCache(cache_dir) if cache_dir is not None else None
+    base_pipeline = Pipeline([
+        ('preprocessor', clone(preprocessor)),
+        ('regressor', model)
+    ], memory=memory)
+
+    search = build_search(base_pipeline, params, search_mode, n_jobs=thread_budget)
+
+    with ResourceUsage() as usage, threadpool_limits(limits=1), \
+            joblib.parallel_config(backend='loky', inner_max_num_threads=1):
+        search.fit(X_train, y_train)
+    search.resource_usage_ = usage.as_dict()
+
+    return name, search, usage.wall_s
+
+def calculate_metrics(name, var, ground_truth, predictions, best_params=None):
+    R2 = r2_score(ground_truth, predictions)
+    MAE = mean_absolute_error(ground_truth, predictions)
+    RMSE = np.sqrt(mean_squared_error(ground_truth, predictions))
+    REL_MAE = MAE / np.mean(predictions) * 100
+
+    return {
+        'model': name,
+        'dataset_var': var,
+        'R2': round(R2, 2),
+        'MAE': round(MAE, 1),
+        'RMSE': round(RMSE, 1),
+        'REL_MAE': round(REL_MAE, 1),
+        **({'best_params': best_params} if var == 'test' else {})
+    }
+
+def _run_sequential(candidates, fit_kwargs, thread_budget):
+    """Моделі по черзі в поточному процесі (без ліміту часу)"""
+    for name, (model, params) in candidates:
+        try:
+            yield fit_model_search(name, model, params, thread_budget=thread_budget, **fit_kwargs)
+        except Exception as e:
+            logger.exception(f"Error during training model {name}: {e}")
+
+def _fit_in_process(conn, name, model, params, fit_kwargs):
+    """Пошук однієї моделі в окремому процесі; результат або текст помилки - у conn"""
+    try:
+        conn.send((True, fit_model_search(name, model, params, **fit_kwargs)))
+    except Exception as e:
+        conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+def _run_in_processes(candidates, fit_kwargs, n_workers, thread_budget, deadline):
+    """
+    Кожна модель - у власному процесі, одночасно щонайбільше n_workers.
+    Після дедлайну моделі, що не стартували, пропускаються, а процеси,
+    що ще рахують, зупиняються (terminate) - бюджет обмежує і один довгий пошук.
+    """
+    queue = list(candidates)
+    running = {} # conn -> (name, process)
+    try:
+        while queue or running:
+            while queue and len(running) < n_workers and (deadline is None or time.perf_counter() < deadline):
+                name, (model, params) = queue.pop(0)
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_fit_in_process, name=f'fit-{name}',
+                    args=(sender, name, model, params, {'thread_budget': thread_budget, **fit_kwargs}))
+                process.start()
+                sender.close()
+                running[receiver] = (name, process)
+            if not running:
+                break
+
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            for conn in connection_wait(list(running), timeout=timeout):
+                name, process = running.pop(conn)
+                try:
+                    ok, result = conn.recv()
+                except EOFError:
+                    ok, result = False, 'worker process exited without a result'
+                conn.close()
+                process.join()
+                if ok:
+                    yield result
+                else:
+                    logger.error(f"Error during training model {name}: {result}")
+
+            if deadline is not None and time.perf_counter() >= deadline and (running or queue):
+                dropped = [name for name, _ in running.values()] + [name for name, _ in queue]
+                logger.warning(f"Time budget exhausted, dropping models: {sorted(dropped)}")
+                break
+    finally:
+        for conn, (_, process) in running.items():
+            process.terminate()
+            process.join()
+            conn.close()
+
+def export_tree_inference(pipeline, X: pd.DataFrame):
+    """
+    Плоскі NumPy-масиви дерев'яного ансамблю і препроцесингу для інференсу без
+    sklearn/XGBoost (models.tree_ensemble). Таблиці категорій - за значеннями X.
+    None - модель не дерев'яна або не підтримується.
+    """
+    from models.tree_ensemble import export_tree_ensemble
+
+    categories = {
+        col: sorted(X[col].dropna().astype(str).unique())
+        for col in X.columns if not pd.api.types.is_numeric_dtype(X[col])
+    }
+    try:
+        arrays = export_tree_ensemble(pipeline, categories, list(X.columns))
+    except ValueError as e:
+        logger.info(f"Tree ensemble export skipped: {e}")
+        return None
+
+    logger.info(f"Tree ensemble exported: {len(arrays['roots'])} trees, {len(arrays['feature'])} nodes")
+    return arrays
+
+def run_training(data_bundle, preprocessor, save_best_model: bool,
+                 search_mode: str = 'grid',
+                 n_workers: int = 1,
+                 thread_budget: int = None,
+                 time_budget: float = None,
+                 models: dict = None,
+                 cache_preprocessing: bool = True,
+                 profiler = None):
+    """
+    Тренування і вибір найкращої моделі.
+
+    search_mode : 'grid' | 'halving' | 'random' (див. build_search)
+    n_workers : к-сть моделей, що тренуються одночасно (окремі процеси при n_workers > 1)
+    thread_budget : к-сть CV-задач на модель; за замовчуванням cpu_count // n_workers
+    time_budget : загальний ліміт часу на пошук (сек); моделі рахуються в окремих процесах,
+        ті, що не встигли, зупиняються або пропускаються
+    models : підмножина REGRESSION_MODELS (за замовчуванням усі)
+    cache_preprocessing : кешувати fitted препроцесор по fold'ах (див. fit_model_search)
+    profiler : src.utils.profiling.StageProfiler - етапи search (з ресурсами пошуку кожної
+        моделі і часом кандидатів з cv_results_), evaluate і save_artifacts
+    """
     logger.info("Starting model training pipeline...")
 
     try:
@@ -24,85 +227,110 @@ def run_training(data_bundle, preprocessor, save_best_model: bool):
         logger.error(f"Missing data key in data_bundle: {e}")
         raise
 
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search_mode '{search_mode}', expected one of {SEARCH_MODES}")
+
+    models = models if models is not None else REGRESSION_MODELS
+    n_workers = max(1, min(n_workers, len(models)))
+    thread_budget = thread_budget or max(1, (os.cpu_count() or 1) // n_workers)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    # у пулі найбільші сітки стартують першими, щоб не залишились хвостом наприкінці
+    candidates = list(models.items())
+    if n_workers > 1:
+        candidates.sort(key=lambda item: grid_size(item[1][1]), reverse=True)
+    # тимчасовий кеш на диску спільний для всіх моделей і процесів пулу
+    cache_dir = tempfile.mkdtemp(prefix='preprocessor_cache_') if cache_preprocessing else None
+    fit_kwargs = {'preprocessor': preprocessor, 'X_train': X_train, 'y_train': y_train,
+                  'search_mode': search_mode, 'cache_dir': cache_dir}
+
+    logger.info(f"Search mode: {search_mode}, workers: {n_workers}, "
+                f"threads per model: {thread_budget}, time budget: {time_budget}")
+
+    try:
+        with profile_stage(profiler, 'search', search_mode=search_mode, n_workers=n_workers):
+            # з бюджетом часу навіть одна модель рахується в окремому процесі, який можна зупинити
+            if n_workers == 1 and deadline is None:
+                fitted = _run_sequential(candidates, fit_kwargs, thread_budget)
+            else:
+                fitted = _run_in_processes(candidates, fit_kwargs, n_workers, thread_budget, deadline)
+            fitted = {name: (grid, fit_time) for name, grid, fit_time in fitted}
+
+            if profiler is not None:
+                # пошук кожної моделі виміряний у процесі, що його виконав (у пулі - паралельно)
+                for name, (grid, _) in fitted.items():
+                    profiler.add(name, grid.resource_usage_, n_splits=grid.n_splits_,
+                                 best_params={key: str(value) for key, value in grid.best_params_.items()},
+                                 candidates=search_candidates(grid))
+
+        if cache_dir is not None and fitted:
+            requested = sum(count_preprocessor_fits(grid) for grid, _ in fitted.values())
+            computed = FoldCache(cache_dir).n_computed()
+            logger.info(
+                f"Preprocessor cache: {requested} fits requested, {computed} computed, "
+                f"hit rate {1 - computed / requested:.1%}"
+            )
+    finally:
+        if cache_dir is not None:
+            FoldCache(cache_dir).clear()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
     results = []
     best_test_r2 = -np.inf
     best_model_info = None
 
-    for name, (model, params) in REGRESSION_MODELS.items():
+    # оцінка у порядку REGRESSION_MODELS, щоб вибір при однаковому R2 не залежав від порядку завершення
+    with profile_stage(profiler, 'evaluate'):
+        for name in models:
+            if name not in fitted:
+                continue
+            grid, fit_time = fitted[name]
 
-        try:
-            base_pipeline = Pipeline([
-                ('preprocessor', preprocessor),
-                ('regressor', model)
-            ])
-
-            grid = GridSearchCV(
-                estimator=base_pipeline,
-                param_grid=params,
-                scoring='r2',
-                n_jobs=-1
-            )
-            grid.fit(X_train, y_train)
+            try:
+                y_pred_test = grid.predict(X_test)
+                y_pred_train = grid.predict(X_train)
+            except Exception as e:
+                logger.exception(f"Error during training model {name}: {e}")
+                continue  # пропускає модель, щоб не зупиняти весь пайплайн
 
-            y_pred_test = grid.predict(X_test)
-            y_pred_train = grid.predict(X_train)
+            # Метрики
+            train_results = calculate_metrics(name, 'train', y_train, y_pred_train)
+            test_results = calculate_metrics(name, 'test', y_test, y_pred_test, grid.best_params_)
+            test_results['fit_time'] = round(fit_time, 1)
 
-        except Exception as e:
-            logger.exception(f"Error during training model {name}: {e}")
-            continue  # пропускає модель, щоб не зупиняти весь пайплайн
-
-        # Метрики
-        def calculate_metrics(var, ground_truth, predictions):
-            R2 = r2_score(ground_truth, predictions)
-            MAE = mean_absolute_error(ground_truth, predictions)
-            RMSE = np.sqrt(mean_squared_error(ground_truth, predictions))
-            REL_MAE = MAE / np.mean(predictions) * 100
-
-            return {
-                'model': name,
-                'dataset_var': var,
-                'R2': round(R2, 2),
-                'MAE': round(MAE, 1),
-                'RMSE': round(RMSE, 1),
-                'REL_MAE': round(REL_MAE, 1),
-                **({'best_params': grid.best_params_} if var == 'test' else {})
-            }
-
-        train_results = calculate_metrics('train', y_train, y_pred_train)
-        test_results = calculate_metrics('test', y_test, y_pred_test)
-
-        results.extend([train_results, test_results])
-
-        current_test_r2 = test_results['R2']
-        if current_test_r2 > best_test_r2:
-            best_test_r2 = current_test_r2
-            best_model_info = {
-                'name': name,
-                'pipeline': grid.best_estimator_,
-                'preprocessor': grid.best_estimator_.named_steps['preprocessor'],
-                'regressor': grid.best_estimator_.named_steps['regressor'],
-                'test_r2': current_test_r2,
-                'best_params': grid.best_params_
-            }
-
-        logger.info(f"Training for model {name} completed successfully.")
+            results.extend([train_results, test_results])
+
+            current_test_r2 = test_results['R2']
+            if current_test_r2 > best_test_r2:
+                best_test_r2 = current_test_r2
+                best_model_info = {
+                    'name': name,
+                    'pipeline': grid.best_estimator_,
+                    'preprocessor': grid.best_estimator_.named_steps['preprocessor'],
+                    'regressor': grid.best_estimator_.named_steps['regressor'],
+                    'test_r2': current_test_r2,
+                    'best_params': grid.best_params_
+                }
+
+            logger.info(f"Training for model {name} completed successfully in {fit_time:.1f}s.")
 
     #  Збереження кращої моделі
     if save_best_model and best_model_info:
-        try:
-            joblib.dump(best_model_info['pipeline'], MODELS_DIR / "best_model.pkl")
-            joblib.dump(best_model_info['preprocessor'], MODELS_DIR / 'preprocessor.pkl')
-
-            metadata = {
-                'model_name': best_model_info['name'],
-                'test_R2': best_model_info['test_r2'],
-                'params': best_model_info['best_params']
-            }
-            joblib.dump(metadata, MODELS_DIR / "model_metadata.pkl")
-            logger.info(f"Best model and metadata saved to {MODELS_DIR}")
-        except Exception as e:
-            logger.exception(f"Failed to save model artifacts: {e}")
-            raise
+        with profile_stage(profiler, 'save_artifacts'):
+            try:
+                joblib.dump(best_model_info['preprocessor'], MODELS_DIR / 'preprocessor.pkl')
+
+                metadata = {
+                    'model_name': best_model_info['name'],
+                    'test_R2': best_model_info['test_r2'],
+                    'params': best_model_info['best_params']
+                }
+                tree_ensemble = export_tree_inference(best_model_info['pipeline'], pd.concat([X_train, X_test]))
+                version = save_model_artifacts(best_model_info['pipeline'], metadata, MODELS_DIR, tree_ensemble)
+                logger.info(f"Best model and metadata saved to {MODELS_DIR} (version {version})")
+            except Exception as e:
+                logger.exception(f"Failed to save model artifacts: {e}")
+                raise
 
     if best_model_info:
         logger.info(
@@ -1,17 +1,13 @@
+import time
+import argparse
 import pandas as pd
 
 from src.utils.paths import DATA_DIR
-from src.data.preprocessing import (
-    select_and_rename_features,
-    standardization_seniority_features,
-    drop_unspecified_positions,
-    feature_balancing_category,
-    preprocessing_feature_english,
-    cleaning_outliers_experience,
-    cleaning_outliers_salary,
-    export_dataframe,
-)
-from src.data.feature_engineering import standardization_job_category
+from src.data.preprocessing import feature_balancing_category, export_dataframe
+from src.data.preprocessing_graph import run_preprocessing_graph
+from src.data.ingestion import stream_raw_csv, FILTER_COLUMN
+from src.data.processed_cache import processed_cache_key, load_processed, save_processed
+from src.data.snapshots import SnapshotStore, SNAPSHOT_COLUMN
 
 from src.models.prepare_training_data import (
     preparing_and_split,
@@ -20,34 +16,84 @@ from src.models.prepare_training_data import (
 from src.models.train_model import run_training
 from src.models.exctract_configs import build_configs
 from src.utils.logger import get_logger
+from src.utils.profiling import StageProfiler, profile_stage
 
 logger = get_logger(__name__)
 
+PROCESSED_CACHE_DIR = DATA_DIR / 'processed/cache'
+SNAPSHOT_STORE_DIR = DATA_DIR / 'processed/snapshots'
+
 # ---------- препроцессинг та підготовка даних ----------
-def preprocces_data(input_csv, save_data: bool):
-    """Обробка сирих даних (preprocessing + feature engineering)"""
+def preprocces_data(input_csv, save_data: bool, chunksize: int = None, cache_dir=None, profiler=None):
+    """
+    Обробка сирих даних (preprocessing + feature engineering).
+
+    chunksize - потоковий режим: сирий CSV читається чанками лише по потрібних
+    колонках (див. src.data.ingestion), результат ідентичний повному читанню.
+    cache_dir - Parquet-кеш оброблених даних за хешем сирого файлу і мапінгів
+    (див. src.data.processed_cache); при збігу ключа препроцесинг пропускається.
+    profiler - src.utils.profiling.StageProfiler: кожна функція препроцесингу - окремий етап.
+    """
+
+    if cache_dir is not None:
+        start = time.perf_counter()
+        with profile_stage(profiler, 'load_processed_cache') as profile_record:
+            cache_key = processed_cache_key(input_csv)
+            df = load_processed(cache_dir, cache_key)
+            profile_record['hit'] = df is not None
+        if df is not None:
+            logger.info(f'Processed data loaded from cache {cache_key} '
+                        f'in {(time.perf_counter() - start) * 1000:.1f} ms')
+            return export_dataframe(df, save_data)
+        logger.info(f'Processed data cache miss for key {cache_key}')
+
+    if chunksize:
+        with profile_stage(profiler, 'stream_raw_csv'):
+            df, report = stream_raw_csv(input_csv, chunksize=chunksize)
+        logger.info(f'Streaming ingestion: {report}')
+
+        # stateful етап - на всіх рядках, далі рядкові фільтри, оцінені по чанках
+        with profile_stage(profiler, 'feature_balancing_category'):
+            df = feature_balancing_category(df)
+        with profile_stage(profiler, 'row_filters'):
+            df = df[df.pop(FILTER_COLUMN)].reset_index(drop=True)
+    else:
+        df, report = run_preprocessing_graph(input_csv, profiler=profiler)
+        for stage in report:
+            logger.info(f"Stage {stage['stage']:<26} rows {stage['rows']:>7}  {stage['time_ms']:>8.1f} ms")
 
-    # load data
-    df = pd.read_csv(input_csv, encoding='cp1251')
+    # sort and export
+    with profile_stage(profiler, 'export_dataframe'):
+        df = export_dataframe(df, save_data)
 
-    # preprocessing
-    df = select_and_rename_features(df) # вибірка ключових фіч та коректні назви
-    df = standardization_seniority_features(df) # стандартизація фічів
-    df = drop_unspecified_positions(df)
+    if cache_dir is not None:
+        with profile_stage(profiler, 'save_processed_cache'):
+            path = save_processed(df, cache_dir, cache_key)
+        logger.info(f'Processed data cached to {path}')
 
-    # feature engineering
-    df = standardization_job_category(df)
+    return df
 
-    # preprocessing 2
-    df = feature_balancing_category(df)
-    df = preprocessing_feature_english(df)
-    df = cleaning_outliers_experience(df)
-    df = cleaning_outliers_salary(df)
+def ingest_snapshots(raw_files, save_data: bool, chunksize: int = None,
+                     store_root=SNAPSHOT_STORE_DIR, profiler=None):
+    """
+    Інкрементальна обробка кількох сирих вивантажень: нові/змінені файли
+    проходять preprocces_data і дописуються у SnapshotStore, далі -
+    об'єднання партицій саме цих файлів (колонка 'snapshot' прибирається);
+    снапшоти попередніх запусків, яких немає в raw_files, не потрапляють у дані.
+    profiler - етапи препроцесингу кожного файлу (див. preprocces_data).
+    """
+    store = SnapshotStore(store_root)
 
-    # sort and export
-    df = export_dataframe(df, save_data)
+    def process(raw_csv):
+        with profile_stage(profiler, f'snapshot_{store.snapshot_name(raw_csv)}'):
+            return preprocces_data(raw_csv, save_data=False, chunksize=chunksize, profiler=profiler)
 
-    return df
+    store.ingest(raw_files, process=process)
+    with profile_stage(profiler, 'load_snapshots'):
+        df = store.load([store.snapshot_name(raw_csv) for raw_csv in raw_files])
+    df = df.drop(columns=[SNAPSHOT_COLUMN])
+
+    return export_dataframe(df, save_data)
 
 # ---------- підготовка даних ----------
 def prepare_training_data(df,
@@ -61,9 +107,9 @@ def prepare_training_data(df,
     return data_bundle, train_preprocessor
 
 # ---------- тренування моделі ----------
-def start_training_model(data_bundle, preprocessor, save_model: bool):
-    """Блок тренування моделі"""
-    run_training(data_bundle, preprocessor, save_best_model=save_model)
+def start_training_model(data_bundle, preprocessor, save_model: bool, **search_options):
+    """Блок тренування моделі (search_options передаються у run_training)"""
+    run_training(data_bundle, preprocessor, save_best_model=save_model, **search_options)
 
 # ---------- підготовка та побудова конфігів ----------
 def preparing_and_exporting_configs(df):
@@ -72,48 +118,101 @@ def preparing_and_exporting_configs(df):
 # ---------- main pipeline function ----------
 def main(save_data: bool = False,
                  save_model: bool = False,
-                 save_configs: bool = False
+                 save_configs: bool = False,
+                 search_mode: str = 'grid',
+                 n_workers: int = 1,
+                 time_budget: float = None,
+                 chunksize: int = None,
+                 use_cache: bool = True,
+                 raw_files: list = None,
+                 profile: bool = False,
+                 profile_dir = None
                  ):
+    """
+    raw_files - список сирих вивантажень для інкрементального тренування на їх
+    об'єднанні (див. ingest_snapshots); за замовчуванням лише 2025_june_raw.csv.
+    profile - wall/CPU/пік RSS кожного етапу (функції препроцесингу, спліт, пошук
+    кожної моделі з часом кандидатів, експорт конфігів) у profile_dir
+    (за замовчуванням logs/profiles/<час запуску>): profile.json і profile.folded
+    для flamegraph (див. src.utils.profiling).
+    """
     logger.info("=== Start pipeline ===")
+    profiler = None
+    if profile:
+        profiler = StageProfiler(profile_dir, options={
+            'save_data': save_data, 'save_model': save_model, 'save_configs': save_configs,
+            'search_mode': search_mode, 'n_workers': n_workers, 'time_budget': time_budget,
+            'chunksize': chunksize, 'use_cache': use_cache, 'raw_files': [str(path) for path in raw_files or []],
+        })
+    status = 'failed'
 
     try:
         logger.info('Loading data and preprocessing data from CSV...')
-        df = preprocces_data(input_csv=DATA_DIR / 'raw/2025_june_raw.csv',
-                             save_data=save_data)
+        with profile_stage(profiler, 'preprocess'):
+            if raw_files:
+                df = ingest_snapshots(raw_files, save_data=save_data, chunksize=chunksize,
+                                      profiler=profiler)
+            else:
+                df = preprocces_data(input_csv=DATA_DIR / 'raw/2025_june_raw.csv',
+                                     save_data=save_data,
+                                     chunksize=chunksize,
+                                     cache_dir=PROCESSED_CACHE_DIR if use_cache else None,
+                                     profiler=profiler)
         logger.info(f'Preprocessing complete. Data shape: {df.shape}')
 
         logger.info('Stage 1: Splitting and feature preparation...')
-        data_bundle, preprocessor = prepare_training_data(df=df,
-                                                          target_column='salary_usd',
-                                                          train_size=0.80)
+        with profile_stage(profiler, 'split'):
+            data_bundle, preprocessor = prepare_training_data(df=df,
+                                                              target_column='salary_usd',
+                                                              train_size=0.80)
         logger.info('Data split complete.')
 
         logger.info('Stage 2: model training')
-        model_pipeline = start_training_model(data_bundle,
-                                              preprocessor=preprocessor,
-                                              save_model=save_model)
+        with profile_stage(profiler, 'training'):
+            model_pipeline = start_training_model(data_bundle,
+                                                  preprocessor=preprocessor,
+                                                  save_model=save_model,
+                                                  search_mode=search_mode,
+                                                  n_workers=n_workers,
+                                                  time_budget=time_budget,
+                                                  profiler=profiler)
         logger.info('Training complete.')
 
         if save_configs:
 
             logger.info('Stage 4: bulding and saving configs by dataset')
-            preparing_and_exporting_configs(df=df)
+            with profile_stage(profiler, 'export_configs'):
+                preparing_and_exporting_configs(df=df)
             logger.info('Configs successfully exctracted.')
 
+        status = 'ok'
 
     except Exception as e:
         logger.exception('Pipeline failed: {e}')
         raise e
 
+    finally:
+        if profiler is not None:
+            report_path = profiler.write(status=status)
+            logger.info(f'Profile written to {report_path.parent}')
+
     logger.info('=== Pipeline finished successfully ===')
     return model_pipeline
 
 # ---------- Точка входу ----------
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Training pipeline')
+    parser.add_argument('--profile', action='store_true',
+                        help='звіт по етапах (wall/CPU/пік RSS) і flamegraph-профіль у logs/profiles')
+    parser.add_argument('--profile-dir', default=None)
+    args = parser.parse_args()
+
     try:
         main(save_data=True,
              save_model=True,
-             save_configs=True)
+             save_configs=True,
+             profile=args.profile,
+             profile_dir=args.profile_dir)
     except Exception as e:
         logger.exception(f'Pipeline failed with error')
         raise
@@ -10,6 +10,64 @@ from sklearn.base import BaseEstimator, RegressorMixin, clone
 from sklearn.linear_model import LogisticRegression, LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 
+def _is_categorical(column) -> bool:
+    return isinstance(getattr(column, 'dtype', None), pd.CategoricalDtype)
+
+def _factorize_column(column):
+    """Коди і унікальні значення колонки; для pd.Categorical - по готових кодах"""
+    if _is_categorical(column):
+        return pd.factorize(column)
+    return pd.factorize(np.asarray(column, dtype=object))
+
+def _columns(X) -> list:
+    """Колонки входу: Series для DataFrame (зберігає dtype, у т.ч. category), інакше - зрізи масиву"""
+    if isinstance(X, pd.DataFrame):
+        return [X.iloc[:, col_idx] for col_idx in range(X.shape[1])]
+    X = np.asarray(X)
+    return [X[:, col_idx] for col_idx in range(X.shape[1])]
+
+def _lookup_column(mapping: dict, column, handle_unknown='value', fill_value=0):
+    """
+    Векторизований lookup однієї колонки за fitted mapping.
+
+    Колонка кодується через pd.factorize, mapping застосовується лише до
+    унікальних категорій, а результат збирається одним take по кодах.
+    Невідомі категорії заповнюються fill_value або викликають помилку.
+    Для pd.Categorical рядки не хешуються: mapping застосовується до категорій,
+    результат збирається по готових кодах.
+    """
+    if _is_categorical(column):
+        categories = column.cat.categories
+        codes = column.cat.codes.to_numpy()
+
+        if handle_unknown != 'value':
+            used = categories[pd.unique(codes[codes >= 0])]
+            unknown = [category for category in used if category not in mapping]
+            if unknown or (codes < 0).any():
+                raise ValueError(f"Невідома категорія: {unknown[0] if unknown else np.nan}")
+
+        unique_values = np.array([mapping.get(category, fill_value) for category in categories] + [fill_value])
+        return unique_values.take(codes)
+
+    # коротка колонка (рядків не більше ніж категорій): прямий lookup без factorize
+    if len(column) <= len(mapping):
+        if handle_unknown != 'value':
+            for category in column:
+                if category not in mapping:
+                    raise ValueError(f"Невідома категорія: {category}")
+        return np.array([mapping.get(category, fill_value) for category in column])
+
+    codes, uniques = pd.factorize(np.asarray(column, dtype=object))
+
+    if handle_unknown != 'value':
+        unknown = [category for category in uniques if category not in mapping]
+        if unknown or (codes < 0).any():
+            raise ValueError(f"Невідома категорія: {unknown[0] if unknown else np.nan}")
+
+    # пропуски мають код -1, тому останній елемент (fill_value) відповідає NaN
+    unique_values = np.array([mapping.get(category, fill_value) for category in uniques] + [fill_value])
+    return unique_values.take(codes)
+
 class TargetEncoder(BaseEstimator, TransformerMixin):
     """
     Target Encoder з підтримкою cross-validation та smoothing для уникнення overfitting
@@ -40,12 +98,10 @@ class TargetEncoder(BaseEstimator, TransformerMixin):
         if y is None:
             raise ValueError("Target encoder потребує цільової змінної y")
 
-        X = self._validate_input(X)
-
         # Convert y to numpy array and ensure continuous indexing
         if hasattr(y, 'values'):
             y = y.values
-        y = np.asarray(y)
+        y = np.asarray(y, dtype=float)
 
         # Зберігаємо глобальне середнє
         self.global_mean_ = np.mean(y)
@@ -53,69 +109,83 @@ class TargetEncoder(BaseEstimator, TransformerMixin):
         # Для кожної колонки створюємо mapping
         self.encodings_ = {}
 
-        for col_idx in range(X.shape[1]):
-            col_data = X[:, col_idx]
-
-            # Основний mapping (без CV)
-            df = pd.DataFrame({'category': col_data, 'target': y})
-            category_stats = df.groupby('category')['target'].agg(['mean', 'count']).reset_index()
+        for col_idx, col_data in enumerate(_columns(X)):
+            # Основний mapping (без CV): суми і кількості по кодах категорій
+            codes, uniques = _factorize_column(col_data)
+            has_category = codes >= 0
+            sums = np.bincount(codes[has_category], weights=y[has_category], minlength=len(uniques))
+            counts = np.bincount(codes[has_category], minlength=len(uniques))
 
             # Smoothing: (count * category_mean + smoothing * global_mean) / (count + smoothing)
             smoothed_means = (
-                (category_stats['count'] * category_stats['mean'] +
-                 self.smoothing * self.global_mean_) /
-                (category_stats['count'] + self.smoothing)
+                (counts * (sums / counts) + self.smoothing * self.global_mean_) /
+                (counts + self.smoothing)
             )
 
-            basic_mapping = dict(zip(category_stats['category'], smoothed_means))
+            basic_mapping = dict(zip(uniques, smoothed_means))
 
-            # CV mapping для уникнення overfitting
-            cv_mapping = self._create_cv_mapping(col_data, y)
+            # out-of-fold encoding для уникнення overfitting
+            cv_encoding = self._create_cv_mapping(col_data, y)
 
             self.encodings_[col_idx] = {
                 'basic': basic_mapping,
-                'cv': cv_mapping
+                'cv': cv_encoding
             }
 
         return self
 
     def _create_cv_mapping(self, categories, targets):
         """
-        Створює CV-based mapping для уникнення data leakage
+        Створює out-of-fold encoding для уникнення data leakage.
+
+        Повертає масив float довжиною n_rows: значення для кожного рядка
+        обчислене лише на train-частині його fold'а. Суми і кількості по
+        категоріях рахуються через np.bincount один раз для всіх fold'ів,
+        train-статистика = загальна - validation fold.
         """
-        cv_mapping = {}
         kf = KFold(n_splits=self.cv, shuffle=True, random_state=42)
 
-        # Ensure inputs are numpy arrays
-        categories = np.asarray(categories)
-        targets = np.asarray(targets)
+        targets = np.asarray(targets, dtype=float)
+        n_rows = len(targets)
 
-        for train_idx, val_idx in kf.split(categories):
-            # Use numpy indexing instead of pandas .iloc
-            train_categories = categories[train_idx]
-            train_targets = targets[train_idx]
+        # коди категорій; пропуски (-1) не мають статистики, як і в groupby
+        codes, uniques = _factorize_column(categories)
+        n_categories = len(uniques)
+        has_category = codes >= 0
 
-            # Create train fold global mean
-            fold_global_mean = np.mean(train_targets)
+        # номер validation fold'а для кожного рядка
+        fold_ids = np.empty(n_rows, dtype=int)
+        for fold_idx, (_, val_idx) in enumerate(kf.split(codes)):
+            fold_ids[val_idx] = fold_idx
 
-            # Створюємо mapping на train fold
-            df_train = pd.DataFrame({'category': train_categories, 'target': train_targets})
-            fold_stats = df_train.groupby('category')['target'].agg(['mean', 'count']).reset_index()
+        # суми/кількості (fold x категорія) для validation частин
+        flat_idx = fold_ids[has_category] * n_categories + codes[has_category]
+        fold_sums = np.bincount(flat_idx, weights=targets[has_category],
+                                minlength=self.cv * n_categories).reshape(self.cv, n_categories)
+        fold_counts = np.bincount(flat_idx,
+                                  minlength=self.cv * n_categories).reshape(self.cv, n_categories)
 
-            fold_smoothed = (
-                (fold_stats['count'] * fold_stats['mean'] +
-                 self.smoothing * fold_global_mean) /
-                (fold_stats['count'] + self.smoothing)
-            )
+        # train-статистика fold'а = загальна - validation
+        train_sums = fold_sums.sum(axis=0) - fold_sums
+        train_counts = fold_counts.sum(axis=0) - fold_counts
+
+        # глобальне середнє train-частини кожного fold'а
+        val_target_sums = np.bincount(fold_ids, weights=targets, minlength=self.cv)
+        val_sizes = np.bincount(fold_ids, minlength=self.cv)
+        fold_global_means = (targets.sum() - val_target_sums) / (n_rows - val_sizes)
 
-            fold_mapping = dict(zip(fold_stats['category'], fold_smoothed))
+        # smoothing; категорії, відсутні у train fold'і, отримують середнє fold'а
+        fold_smoothed = np.where(
+            train_counts > 0,
+            (train_sums + self.smoothing * fold_global_means[:, None]) /
+            (train_counts + self.smoothing),
+            fold_global_means[:, None]
+        )
 
-            # Зберігаємо для validation індексів
-            for idx in val_idx:
-                category = categories[idx]
-                cv_mapping[idx] = fold_mapping.get(category, fold_global_mean)
+        cv_encoding = fold_global_means[fold_ids]
+        cv_encoding[has_category] = fold_smoothed[fold_ids[has_category], codes[has_category]]
 
-        return cv_mapping
+        return cv_encoding
 
     def transform(self, X, use_cv=False):
         """
@@ -126,22 +196,13 @@ class TargetEncoder(BaseEstimator, TransformerMixin):
         use_cv : bool, default=False
             Використовувати CV mapping (тільки для тренувальних даних)
         """
-        X = self._validate_input(X)
-        result = np.zeros_like(X, dtype=float)
+        columns = _columns(X)
+        result = np.zeros((len(X), len(columns)), dtype=float)
 
-        for col_idx in range(X.shape[1]):
+        for col_idx, column in enumerate(columns):
             mapping = self.encodings_[col_idx]['basic']
-
-            for row_idx in range(X.shape[0]):
-                category = X[row_idx, col_idx]
-
-                if category in mapping:
-                    result[row_idx, col_idx] = mapping[category]
-                else:
-                    if self.handle_unknown == 'value':
-                        result[row_idx, col_idx] = self.fill_value
-                    else:
-                        raise ValueError(f"Невідома категорія: {category}")
+            result[:, col_idx] = _lookup_column(mapping, column,
+                                                self.handle_unknown, self.fill_value)
 
         return result
 
@@ -157,29 +218,21 @@ class TargetEncoder(BaseEstimator, TransformerMixin):
         """
         Спеціальна трансформація з CV mapping для fit_transform
         """
-        X = self._validate_input(X)
-        result = np.zeros_like(X, dtype=float)
+        columns = _columns(X)
+        result = np.zeros((len(X), len(columns)), dtype=float)
 
-        for col_idx in range(X.shape[1]):
-            cv_mapping = self.encodings_[col_idx]['cv']
+        for col_idx, column in enumerate(columns):
+            cv_encoding = self.encodings_[col_idx]['cv']
             basic_mapping = self.encodings_[col_idx]['basic']
 
-            for row_idx in range(X.shape[0]):
-                if row_idx in cv_mapping:
-                    result[row_idx, col_idx] = cv_mapping[row_idx]
-                else:
-                    category = X[row_idx, col_idx]
-                    result[row_idx, col_idx] = basic_mapping.get(category, self.global_mean_)
+            # базовий mapping (невідомі -> глобальне середнє), поверх нього out-of-fold значення
+            result[:, col_idx] = _lookup_column(basic_mapping, column,
+                                                fill_value=self.global_mean_)
 
-        return result
+            n_cv_rows = min(len(cv_encoding), len(X))
+            result[:n_cv_rows, col_idx] = cv_encoding[:n_cv_rows]
 
-    def _validate_input(self, X):
-        """
-        Валідація та конвертація вхідних даних
-        """
-        if hasattr(X, 'values'):  # pandas DataFrame/Series
-            return X.values
-        return np.asarray(X)
+        return result
 
 
 class FrequencyEncoder(BaseEstimator, TransformerMixin):
@@ -203,15 +256,13 @@ class FrequencyEncoder(BaseEstimator, TransformerMixin):
         """
         Навчання encoder'а - підрахунок частот
         """
-        X = self._validate_input(X)
-
         self.frequency_maps_ = {}
 
-        for col_idx in range(X.shape[1]):
-            col_data = X[:, col_idx]
-            # Підраховуємо частоти
-            unique, counts = np.unique(col_data, return_counts=True)
-            self.frequency_maps_[col_idx] = dict(zip(unique, counts))
+        for col_idx, col_data in enumerate(_columns(X)):
+            # Підраховуємо частоти по кодах категорій
+            codes, uniques = _factorize_column(col_data)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            self.frequency_maps_[col_idx] = dict(zip(uniques, counts))
 
         return self
 
@@ -219,33 +270,16 @@ class FrequencyEncoder(BaseEstimator, TransformerMixin):
         """
         Трансформація категорій у частоти
         """
-        X = self._validate_input(X)
-        result = np.zeros_like(X, dtype=int)
+        columns = _columns(X)
+        result = np.zeros((len(X), len(columns)), dtype=int)
 
-        for col_idx in range(X.shape[1]):
+        for col_idx, column in enumerate(columns):
             freq_map = self.frequency_maps_[col_idx]
-
-            for row_idx in range(X.shape[0]):
-                category = X[row_idx, col_idx]
-
-                if category in freq_map:
-                    result[row_idx, col_idx] = freq_map[category]
-                else:
-                    if self.handle_unknown == 'value':
-                        result[row_idx, col_idx] = self.fill_value
-                    else:
-                        raise ValueError(f"Невідома категорія: {category}")
+            result[:, col_idx] = _lookup_column(freq_map, column,
+                                                self.handle_unknown, self.fill_value)
 
         return result
 
-    def _validate_input(self, X):
-        """
-        Валідація та конвертація вхідних даних
-        """
-        if hasattr(X, 'values'):  # pandas DataFrame/Series
-            return X.values
-        return np.asarray(X)
-
 
 class TwoStageRegressor(BaseEstimator, RegressorMixin):
     def __init__(self, classifier=None, reg_low=None, reg_high=None, threshold=0.95):
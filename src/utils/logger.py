@@ -1,4 +1,6 @@
+import os
 import logging
+from pathlib import Path
 from src.utils.paths import LOGS_DIR
 
 def get_logger(name: str):
@@ -17,8 +19,9 @@ def get_logger(name: str):
     """
 
     # === Етап 1: Ініціалізація шляху до логів ===
-    log_dir = LOGS_DIR
-    log_dir.mkdir(exist_ok=True)  # створює директорію, якщо її немає
+    # SALARY_LOG_DIR - інша директорія (тести пишуть у tmp, а не в logs/ репозиторію)
+    log_dir = Path(os.environ.get('SALARY_LOG_DIR', LOGS_DIR))
+    log_dir.mkdir(parents=True, exist_ok=True)  # створює директорію, якщо її немає
     log_file = log_dir / "pipeline.log"
 
     # === Етап 2: Створення логера ===
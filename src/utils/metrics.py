@@ -0,0 +1,135 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from time import perf_counter_ns
+import numpy as np
+
+# межі бакетів за замовчуванням: час у мілісекундах
+DEFAULT_MS_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+# фази інференсу: час у мікросекундах
+DEFAULT_US_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+class Histogram:
+    """
+    Гістограма з фіксованими бакетами (семантика Prometheus: бакет 'le' рахує
+    всі спостереження <= межі, останній бакет '+Inf').
+    Не потокобезпечна: одночасні observe синхронізує власник (див. PhaseMetrics).
+    """
+
+    def __init__(self, buckets=DEFAULT_MS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def observe_many(self, values, scale: float = 1.0):
+        """observe для пачки значень (помножених на scale) одним проходом NumPy"""
+        values = np.asarray(values, dtype=float) * scale
+        # side='left' - та сама семантика бакетів, що й bisect_left в observe
+        counts = np.bincount(np.searchsorted(self.buckets, values, side='left'), minlength=len(self.counts))
+        self.counts = [total + int(count) for total, count in zip(self.counts, counts)]
+        self.sum += float(values.sum())
+        self.count += len(values)
+
+    def snapshot(self) -> dict:
+        """Кумулятивні лічильники по бакетах + сума і кількість"""
+        cumulative = {}
+        total = 0
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            total += count
+            cumulative[str(bound)] = total
+
+        return {'buckets': cumulative, 'sum': self.sum, 'count': self.count}
+
+class PhaseMetrics:
+    """
+    Гістограми тривалості фаз інференсу (мкс), по одній на фазу.
+
+        start = perf_counter_ns()
+        ...
+        start = metrics.record('validate', start)
+
+    record лише дописує тривалість у буфер фази (один виклик таймера, list.append) і
+    повертає той самий момент часу як початок наступної фази. У гістограми буфер
+    зводиться пачкою через NumPy - при заповненні (flush_size) або при читанні
+    histograms(). record блокувань не бере; зведення фази виконується під її lock,
+    тож два одночасні flush (record в потоці виконавця і /metrics) не перетирають
+    одне одного. Загубитись може лише спостереження, дописане в буфер, який
+    у цей момент вже забрав flush, - прийнятно для розподілу латентності.
+    """
+
+    def __init__(self, buckets=DEFAULT_US_BUCKETS, flush_size: int = 4096):
+        self.buckets = tuple(sorted(buckets))
+        self.flush_size = flush_size
+        self.reset()
+
+    def reset(self):
+        self._histograms = {}
+        self._buffers = defaultdict(list) # фаза -> тривалості в нс, ще не зведені в гістограму
+        self._flush_locks = defaultdict(threading.Lock)
+
+    def record(self, phase: str, start_ns: int) -> int:
+        now = perf_counter_ns()
+        buffer = self._buffers[phase]
+        buffer.append(now - start_ns)
+        if len(buffer) >= self.flush_size:
+            self._flush(phase)
+        return now
+
+    def _flush(self, phase: str):
+        with self._flush_locks[phase]:
+            buffer, self._buffers[phase] = self._buffers[phase], []
+            histogram = self._histograms.get(phase)
+            if histogram is None:
+                histogram = self._histograms.setdefault(phase, Histogram(self.buckets))
+            if buffer:
+                histogram.observe_many(buffer, scale=1e-3) # нс -> мкс
+
+    def histograms(self) -> dict:
+        """Фаза -> Histogram (мкс) з усіма записаними спостереженнями"""
+        for phase in list(self._buffers):
+            self._flush(phase)
+        return dict(sorted(self._histograms.items()))
+
+    def snapshot(self) -> dict:
+        return {phase: histogram.snapshot() for phase, histogram in self.histograms().items()}
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + '}'
+
+def prometheus_histogram(name: str, help_text: str, histograms: dict, scale: float = 1.0) -> list:
+    """
+    Рядки текстового формату Prometheus для histograms: {(label, value), ...: Histogram}
+    (ключ - tuple пар міток). scale переводить одиниці гістограми в базові
+    (мкс -> секунди: 1e-6).
+    """
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for labels, histogram in histograms.items():
+        labels = dict(labels)
+        total = 0
+        for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+            total += count
+            le = bound if bound == '+Inf' else repr(bound * scale)
+            lines.append(f'{name}_bucket{_format_labels({**labels, "le": le})} {total}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum * scale!r}')
+        lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+    return lines
+
+def prometheus_metric(name: str, help_text: str, metric_type: str, samples: dict) -> list:
+    """Рядки counter/gauge: samples - {(label, value), ...: число}"""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+    for labels, value in samples.items():
+        lines.append(f'{name}{_format_labels(dict(labels))} {value!r}')
+    return lines
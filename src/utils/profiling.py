@@ -0,0 +1,272 @@
+"""
+Профілювання етапів тренувального пайплайну (src.pipeline.main(profile=True)).
+
+Запуск порівняння двох звітів:
+    python -m src.utils.profiling compare logs/profiles/<old>/profile.json logs/profiles/<new>/profile.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, UTC
+from pathlib import Path
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+from src.utils.paths import LOGS_DIR
+
+PROFILES_DIR = LOGS_DIR / 'profiles'
+REPORT_FILE = 'profile.json'
+FOLDED_FILE = 'profile.folded'
+
+def current_rss_mb() -> float:
+    """Поточний RSS процесу (Linux /proc); інакше - пік RSS від старту процесу"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 2**20 if sys.platform == 'darwin' else max_rss / 2**10 # байти на macOS, КБ на Linux
+
+def _children_cpu_s() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+class ResourceUsage:
+    """
+    Ресурси блоку коду: with ResourceUsage() as usage: ...; usage.as_dict()
+
+    wall_s - реальний час, cpu_s - CPU усіх потоків процесу, children_cpu_s - CPU
+    дочірніх процесів, що завершились за цей час (воркери loky/ProcessPool, які
+    живуть далі, сюди не потрапляють), peak_rss_mb - пік RSS процесу (фоновий
+    потік опитує RSS кожні sample_interval сек).
+    """
+
+    def __init__(self, sample_interval: float = 0.01):
+        self.sample_interval = sample_interval
+        self.wall_s = self.cpu_s = self.children_cpu_s = None
+        self.rss_start_mb = self.rss_end_mb = self.peak_rss_mb = None
+
+    def __enter__(self):
+        self.rss_start_mb = self.peak_rss_mb = current_rss_mb()
+        self._stop = threading.Event()
+        self._sampler = None
+        if self.rss_start_mb is not None:
+            self._sampler = threading.Thread(target=self._sample, name='rss-sampler', daemon=True)
+            self._sampler.start()
+
+        self._children_cpu = _children_cpu_s()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            self.peak_rss_mb = max(self.peak_rss_mb, current_rss_mb())
+
+    def __exit__(self, *exc):
+        self.wall_s = time.perf_counter() - self._wall
+        self.cpu_s = time.process_time() - self._cpu
+        self.children_cpu_s = _children_cpu_s() - self._children_cpu
+
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self.rss_end_mb = current_rss_mb()
+            self.peak_rss_mb = max(self.peak_rss_mb, self.rss_end_mb)
+
+    def as_dict(self) -> dict:
+        return {
+            'wall_s': round(self.wall_s, 4),
+            'cpu_s': round(self.cpu_s, 4),
+            'children_cpu_s': round(self.children_cpu_s, 4),
+            'rss_start_mb': _round(self.rss_start_mb),
+            'rss_end_mb': _round(self.rss_end_mb),
+            'peak_rss_mb': _round(self.peak_rss_mb),
+        }
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+def search_candidates(search) -> list:
+    """Час fit/score кожного кандидата з cv_results_ (секунди на fold, сума по fold'ах)"""
+    cv_results = search.cv_results_
+    n_splits = search.n_splits_
+    candidates = []
+    for idx, params in enumerate(cv_results['params']):
+        candidate = {
+            'params': {key: _jsonable(value) for key, value in params.items()},
+            'mean_fit_s': round(float(cv_results['mean_fit_time'][idx]), 4),
+            'std_fit_s': round(float(cv_results['std_fit_time'][idx]), 4),
+            'mean_score_s': round(float(cv_results['mean_score_time'][idx]), 4),
+            'std_score_s': round(float(cv_results['std_score_time'][idx]), 4),
+            'total_s': round(float(cv_results['mean_fit_time'][idx] + cv_results['mean_score_time'][idx]) * n_splits, 4),
+            'mean_test_score': round(float(cv_results['mean_test_score'][idx]), 4),
+            'rank': int(cv_results['rank_test_score'][idx]),
+        }
+        # successive halving: ітерація і к-сть рядків кандидата
+        for key in ('iter', 'n_resources'):
+            if key in cv_results:
+                candidate[key] = int(cv_results[key][idx])
+        candidates.append(candidate)
+    return candidates
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, 'item'): # numpy-скаляри
+        return value.item()
+    return repr(value)
+
+class StageProfiler:
+    """
+    Дерево вкладених етапів з ResourceUsage кожного:
+
+        with profiler.stage('preprocess'):
+            with profiler.stage('read_csv') as record:
+                ...
+                record['rows'] = len(df)
+
+    write() зберігає в run_dir profile.json (дерево етапів + метадані запуску)
+    і profile.folded - згорнуті стеки 'main;preprocess;read_csv <мкс>' для
+    flamegraph.pl / speedscope / inferno (вага - self wall time етапу).
+    """
+
+    def __init__(self, run_dir=None, name: str = 'main', **run_info):
+        started_at = datetime.now(UTC)
+        self.run_dir = Path(run_dir) if run_dir is not None else PROFILES_DIR / f'{started_at:%Y%m%dT%H%M%S}'
+        self.run_info = {
+            'started_at': started_at.isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            **run_info,
+        }
+        self.root = {'name': name, 'children': []}
+        self._stack = [self.root]
+        self._usage = ResourceUsage().__enter__()
+
+    @contextmanager
+    def stage(self, name: str, **info):
+        record = {'name': name, **info, 'children': []}
+        self._stack[-1]['children'].append(record)
+        self._stack.append(record)
+        usage = ResourceUsage()
+        try:
+            with usage:
+                yield record
+        finally:
+            self._stack.pop()
+            record.update(usage.as_dict())
+
+    def add(self, name: str, usage: dict, **info) -> dict:
+        """Етап, виміряний деінде (напр. в процесі пулу), - дочірній до поточного"""
+        record = {'name': name, **info, **usage, 'children': []}
+        self._stack[-1]['children'].append(record)
+        return record
+
+    def write(self, **extra) -> Path:
+        """Закриває кореневий етап і пише звіти; повертає шлях до profile.json"""
+        if self.root.get('wall_s') is None:
+            self._usage.__exit__(None, None, None)
+            self.root.update(self._usage.as_dict())
+
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        report = {**self.run_info, **extra, 'stages': self.root}
+        with open(self.run_dir / REPORT_FILE, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=_jsonable)
+        with open(self.run_dir / FOLDED_FILE, 'w') as f:
+            f.writelines(f'{stack} {weight}\n' for stack, weight in folded_stacks(self.root))
+        return self.run_dir / REPORT_FILE
+
+def profile_stage(profiler, name: str, **info):
+    """profiler.stage(name) або, без профілювання (profiler=None), порожній контекст з dict"""
+    return profiler.stage(name, **info) if profiler is not None else nullcontext({})
+
+def _frame(name: str) -> str:
+    return str(name).replace(';', ',').replace(' ', '_').replace('\n', '_')
+
+def folded_stacks(record: dict, prefix: str = ''):
+    """
+    (стек, вага в мкс) для кожного етапу: вага - власний wall time, без дочірніх.
+    Кандидати пошуку (record['candidates']) - дочірні кадри моделі з вагою total_s.
+    """
+    stack = f'{prefix};{_frame(record["name"])}' if prefix else _frame(record['name'])
+    children = [(child['name'], child.get('wall_s') or 0.0, child) for child in record['children']]
+    children += [
+        ('candidate_' + ','.join(f'{key}={value}' for key, value in candidate['params'].items()),
+         candidate['total_s'], None)
+        for candidate in record.get('candidates', [])
+    ]
+
+    self_s = max((record.get('wall_s') or 0.0) - sum(wall_s for _, wall_s, _ in children), 0.0)
+    if self_s > 0:
+        yield stack, int(self_s * 1e6)
+    for name, wall_s, child in children:
+        if child is not None:
+            yield from folded_stacks(child, stack)
+        elif wall_s > 0:
+            yield f'{stack};{_frame(name)}', int(wall_s * 1e6)
+
+def flatten_stages(record: dict, prefix: str = '') -> dict:
+    """'main/preprocess/read_csv' -> запис етапу (для порівняння запусків)"""
+    path = f'{prefix}/{record["name"]}' if prefix else record['name']
+    flat = {path: record}
+    for child in record['children']:
+        flat.update(flatten_stages(child, path))
+    return flat
+
+def compare_profiles(baseline: dict, current: dict, threshold: float = 0.2, min_wall_s: float = 0.5) -> list:
+    """
+    Етапи, у яких wall time зріс більше ніж на threshold (частка) і щонайменше на
+    min_wall_s секунд (короткі етапи шумлять). Повертає
+    [{stage, baseline_s, current_s, change}], відсортовані за абсолютним приростом.
+    """
+    old, new = flatten_stages(baseline['stages']), flatten_stages(current['stages'])
+    regressions = []
+    for path, record in new.items():
+        if path not in old or record.get('wall_s') is None or old[path].get('wall_s') is None:
+            continue
+        before, after = old[path]['wall_s'], record['wall_s']
+        if after - before >= min_wall_s and after > before * (1 + threshold):
+            regressions.append({'stage': path, 'baseline_s': before, 'current_s': after,
+                                'change': round(after / before - 1, 3) if before else None})
+    return sorted(regressions, key=lambda item: item['current_s'] - item['baseline_s'], reverse=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compare = subparsers.add_parser('compare', help='регресії wall time між двома profile.json')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.2)
+    compare.add_argument('--min-wall', type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    regressions = compare_profiles(baseline, current, args.threshold, args.min_wall)
+    for item in regressions:
+        print(f"{item['stage']:<60}{item['baseline_s']:>10.2f}s ->{item['current_s']:>10.2f}s  "
+              f"{'' if item['change'] is None else format(item['change'], '+.0%')}")
+    if not regressions:
+        print('No regressions')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import os
+import json
+import tempfile
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+
+# до імпорту модулів src: get_logger пише pipeline.log у tmp, а не в logs/ репозиторію
+# (змінна успадковується і серверами/бенчмарками, що тести запускають у підпроцесах)
+os.environ.setdefault('SALARY_LOG_DIR', str(Path(tempfile.gettempdir()) / 'salary-test-logs'))
+
+from src.utils.paths import CONFIG_DIR
+from src.models.prepare_training_data import preparing_and_split, preparing_features_for_training
+
+def make_model_input_frame(n_rows: int = 400, random_state: int = 25) -> pd.DataFrame:
+    """Синтетичний датафрейм у форматі data/processed/model_input_df.csv"""
+    rng = np.random.default_rng(random_state)
+    allowed = json.load(open(CONFIG_DIR / 'allowed_values.json'))
+
+    df = pd.DataFrame({
+        'job_category': rng.choice(allowed['job_category'], n_rows),
+        'seniority_level': rng.choice(allowed['seniority_level'], n_rows),
+        'english_level': rng.choice(allowed['english_level'], n_rows),
+        'experience_years': rng.integers(0, 20, n_rows).astype(float),
+    })
+    df['salary_usd'] = 500 + 250 * df['experience_years'] + rng.normal(0, 300, n_rows)
+    return df
+
+@pytest.fixture(scope='session')
+def model_artifacts(tmp_path_factory):
+    """best_model.pkl + model_metadata.pkl, натреновані на синтетичних даних"""
+    output_dir = tmp_path_factory.mktemp('models')
+
+    data_bundle = preparing_and_split(make_model_input_frame(), 'salary_usd', 0.8)
+    pipeline = Pipeline([
+        ('preprocessor', preparing_features_for_training(data_bundle)),
+        ('regressor', Ridge())
+    ]).fit(data_bundle['X_train'], data_bundle['y_train'])
+
+    joblib.dump(pipeline, output_dir / 'best_model.pkl')
+    joblib.dump({'model_name': 'Ridge', 'test_R2': 0.5, 'params': {}}, output_dir / 'model_metadata.pkl')
+    return output_dir
+
+@pytest.fixture
+def predictor(model_artifacts):
+    from models.salary_predictor import SalaryPredictor
+
+    return SalaryPredictor(model_path=model_artifacts / 'best_model.pkl',
+                           metadata_path=model_artifacts / 'model_metadata.pkl')
@@ -0,0 +1,162 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api as api
+from app.lifecycle import ModelLoader
+from src.utils.paths import PROJECT_ROOT
+
+RECORD = {'job_category': 'QA & Testing',
+          'seniority_level': 'Junior',
+          'english_level': 'Intermediate',
+          'experience_years': 2}
+
+def wait_until_loaded(client, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get('/health/ready')
+        if response.json()['status'] in ('ready', 'failed'):
+            return response
+        time.sleep(0.05)
+    raise TimeoutError('Model loading timed out')
+
+@pytest.fixture
+def use_loader(monkeypatch):
+    def use(loader):
+        monkeypatch.setattr(api, 'loader', loader)
+        monkeypatch.setattr(api, 'coalescer', None)
+    return use
+
+def test_import_does_not_load_heavy_modules():
+    code = ("import sys, app.api, app.gradio; "
+            "print(sorted(m for m in ('pandas', 'sklearn', 'xgboost', 'joblib', 'gradio') if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == '[]'
+
+def test_lifespan_loads_model_and_reports_startup(model_artifacts, use_loader):
+    use_loader(ModelLoader(model_path=model_artifacts / 'best_model.pkl',
+                           metadata_path=model_artifacts / 'model_metadata.pkl',
+                           table_mode=True))
+
+    with TestClient(api.app) as client:
+        assert client.get('/health/live').status_code == 200
+
+        response = wait_until_loaded(client)
+        assert response.status_code == 200
+        assert {'import_ms', 'unpickle_ms', 'configs_ms', 'table_ms',
+                'warmup_ms', 'total_ms'} <= set(response.json()['startup_ms'])
+
+        prediction = client.post('/predict', json=RECORD).json()['prediction']
+        assert prediction == api.loader.get().predict_record(RECORD)
+
+def test_metrics_endpoint_exposes_phases(model_artifacts, use_loader, monkeypatch):
+    from src.utils.metrics import PhaseMetrics
+
+    metrics = PhaseMetrics()
+    monkeypatch.setattr(api, 'phase_metrics', metrics)
+    use_loader(ModelLoader(model_path=model_artifacts / 'best_model.pkl',
+                           metadata_path=model_artifacts / 'model_metadata.pkl',
+                           metrics=metrics))
+
+    with TestClient(api.app) as client:
+        wait_until_loaded(client)
+        assert client.post('/predict', json=RECORD).status_code == 200
+        response = client.get('/metrics')
+
+    assert response.status_code == 200 and response.headers['content-type'].startswith('text/plain')
+    assert 'salary_model_ready 1' in response.text
+    assert 'salary_inference_phase_seconds_count{phase="parse"} 1' in response.text
+    assert 'salary_inference_phase_seconds_count{phase="lookup"} 1' in response.text
+
+def test_failed_loading_is_not_ready(tmp_path, use_loader):
+    use_loader(ModelLoader(model_path=tmp_path / 'missing.pkl', metadata_path=tmp_path / 'missing.pkl'))
+
+    with TestClient(api.app) as client:
+        response = wait_until_loaded(client)
+        assert response.status_code == 503
+        assert 'FileNotFoundError' in response.json()['error']
+
+        assert client.get('/health/live').status_code == 200
+        assert client.post('/predict', json=RECORD).status_code == 503
+
+def test_invalid_category_is_client_error(model_artifacts, use_loader):
+    use_loader(ModelLoader(model_path=model_artifacts / 'best_model.pkl',
+                           metadata_path=model_artifacts / 'model_metadata.pkl'))
+
+    with TestClient(api.app) as client:
+        wait_until_loaded(client)
+        response = client.post('/predict', json={**RECORD, 'english_level': 'Fluent'})
+
+    assert response.status_code == 422 and 'Fluent' in response.json()['detail']
+
+def test_shared_cache_lookup_runs_off_event_loop(model_artifacts, use_loader):
+    import asyncio
+    from models.prediction_cache import PredictionCache, DictBackend
+
+    class LoopCheckingBackend(DictBackend):
+        on_loop = []
+
+        def get_many(self, keys):
+            try:
+                asyncio.get_running_loop()
+                self.on_loop.append(True)
+            except RuntimeError:
+                self.on_loop.append(False)
+            return super().get_many(keys)
+
+    use_loader(ModelLoader(model_path=model_artifacts / 'best_model.pkl',
+                           metadata_path=model_artifacts / 'model_metadata.pkl',
+                           prediction_cache=PredictionCache(backend=LoopCheckingBackend())))
+
+    with TestClient(api.app) as client:
+        wait_until_loaded(client)
+        assert client.post('/predict', json=RECORD).status_code == 200
+
+    assert LoopCheckingBackend.on_loop and not any(LoopCheckingBackend.on_loop)
+
+def test_batch_records_report_null_fields_per_row(model_artifacts, use_loader):
+    use_loader(ModelLoader(model_path=model_artifacts / 'best_model.pkl',
+                           metadata_path=model_artifacts / 'model_metadata.pkl'))
+    records = [RECORD, {**RECORD, 'english_level': None}, {key: RECORD[key] for key in RECORD if key != 'job_category'}]
+
+    with TestClient(api.app) as client:
+        wait_until_loaded(client)
+        response = client.post('/predict/batch', json={'records': records})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['predictions'][0] == api.loader.get().predict_record(RECORD)
+    assert body['predictions'][1:] == [None, None] and set(body['errors']) == {'1', '2'}
+
+def test_prefork_server_with_preload(model_artifacts):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    env = {**os.environ, 'SALARY_API_MODELS_DIR': str(model_artifacts)}
+    server = subprocess.Popen([sys.executable, '-m', 'app.serve', '--port', str(port), '--workers', '2', '--preload'],
+                              cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f'http://127.0.0.1:{port}', timeout=30) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    response = client.get('/health/ready')
+                    break
+                except httpx.TransportError:
+                    assert time.monotonic() < deadline and server.poll() is None
+                    time.sleep(0.1)
+
+            # модель завантажена до fork(): воркер готовий з першого запиту
+            assert response.status_code == 200
+            assert client.post('/predict', json=RECORD).status_code == 200
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
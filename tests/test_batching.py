@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import pandas as pd
+import pytest
+
+from app.batching import PredictionCoalescer, QueueFullError
+from src.utils.metrics import Histogram
+
+RECORD = {'job_category': 'QA & Testing',
+          'seniority_level': 'Junior',
+          'english_level': 'Intermediate',
+          'experience_years': 2}
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(1, 5))
+    for value in [0.5, 1, 3, 10]:
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == {'1': 2, '5': 3, '+Inf': 4}
+    assert snapshot['count'] == 4 and snapshot['sum'] == 14.5
+
+def test_coalescer_batches_concurrent_requests(predictor):
+    coalescer = PredictionCoalescer(predictor, max_batch_size=8, max_wait_ms=50)
+    records = [{**RECORD, 'experience_years': years} for years in range(16)]
+
+    async def run():
+        results = await asyncio.gather(*(coalescer.submit(r) for r in records))
+        await coalescer.stop()
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == predictor.predict(pd.DataFrame(records)).tolist()
+    assert coalescer.stats()['batch_size']['count'] == 2
+
+def test_coalescer_isolates_invalid_records(predictor):
+    coalescer = PredictionCoalescer(predictor, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(coalescer.submit(RECORD),
+                                       coalescer.submit({**RECORD, 'english_level': 'Fluent'}),
+                                       return_exceptions=True)
+        await coalescer.stop()
+        return results
+
+    valid, invalid = asyncio.run(run())
+
+    assert valid == predictor.predict(pd.DataFrame([RECORD]))[0]
+    assert isinstance(invalid, ValueError) and 'Fluent' in str(invalid)
+
+def test_coalescer_rejects_when_queue_full(predictor):
+    release = threading.Event()
+
+    class SlowPredictor:
+        def predict_batch(self, input_data):
+            release.wait(timeout=5)
+            return predictor.predict_batch(input_data)
+
+    coalescer = PredictionCoalescer(SlowPredictor(), max_batch_size=1, max_wait_ms=0, max_queue_size=1)
+
+    async def run():
+        # перший запит зайнятий у predict_batch, другий займає єдине місце в черзі
+        first = asyncio.ensure_future(coalescer.submit(RECORD))
+        while coalescer.batch_size.count == 0:
+            await asyncio.sleep(0.001)
+        second = asyncio.ensure_future(coalescer.submit(RECORD))
+        await asyncio.sleep(0.001)
+
+        with pytest.raises(QueueFullError):
+            await coalescer.submit(RECORD)
+
+        release.set()
+        await asyncio.gather(first, second)
+        await coalescer.stop()
+
+    asyncio.run(run())
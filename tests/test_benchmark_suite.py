@@ -0,0 +1,41 @@
+import json
+import pandas as pd
+
+from src.data.preprocessing import RAW_FEATURES
+from benchmarks.synthetic import make_raw_survey, write_raw_csv
+from benchmarks import suite
+
+def test_synthetic_survey_uses_raw_headers_and_cp1251(tmp_path):
+    path = write_raw_csv(tmp_path / 'raw.csv', n_rows=500)
+
+    raw = pd.read_csv(path, encoding='cp1251')
+
+    assert len(raw) == 500 and set(RAW_FEATURES) <= set(raw.columns)
+    pd.testing.assert_frame_equal(make_raw_survey(500).iloc[:, :3], raw.iloc[:, :3], check_dtype=False)
+
+def test_compare_results_flags_slower_benchmarks():
+    def report(**seconds):
+        return {'results': {name: {'seconds': value} for name, value in seconds.items()}}
+
+    comparison = suite.compare_results(report(a=1.0, b=1.0, gone=1.0), report(a=1.1, b=1.5, new=1.0), threshold=0.2)
+
+    assert [(row['name'], row['change'], row['regression']) for row in comparison] == [
+        ('a', 0.1, False), ('b', 0.5, True)]
+
+def test_run_and_compare_cli(tmp_path, capsys):
+    output = tmp_path / 'current.json'
+
+    assert suite.main(['run', '--rows', '2000', '--groups', 'preprocessing', 'encoders', 'serving',
+                       '--batch-sizes', '1', '10', '--repeat', '1', '--output', str(output)]) == 0
+
+    report = json.loads(output.read_text())
+    assert report['options']['rows'] == 2000
+    assert {'preprocessing/read_csv', 'preprocessing/cleaning_outliers_salary',
+            'encoders/TargetEncoder.transform', 'serving/predict[10]'} <= set(report['results'])
+    assert all(entry['seconds'] > 0 for entry in report['results'].values())
+
+    baseline = {**report, 'results': {name: {**entry, 'seconds': entry['seconds'] / 2}
+                                      for name, entry in report['results'].items()}}
+    (tmp_path / 'baseline.json').write_text(json.dumps(baseline))
+    assert suite.main(['compare', str(tmp_path / 'baseline.json'), str(output)]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.bulk_scoring import score_file
+
+VALID_ROW = {'job_category': 'Software Engineering',
+             'seniority_level': 'Middle',
+             'english_level': 'Upper-Intermediate',
+             'experience_years': 4}
+
+def make_input(predictor, n_rows: int = 250) -> pd.DataFrame:
+    df = predictor._sample_inputs(n_samples=n_rows, random_state=3)
+    df.insert(0, 'id', np.arange(n_rows) * 10)
+    df.loc[7, 'english_level'] = 'Fluent'
+    df.loc[120, 'seniority_level'] = None
+    return df
+
+def score(model_artifacts, input_path, output_path, **kwargs) -> dict:
+    return score_file(input_path, output_path, model_path=model_artifacts / 'best_model.pkl',
+                      metadata_path=model_artifacts / 'model_metadata.pkl', **kwargs)
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'jsonl'])
+def test_score_file_writes_predictions_and_rejects(tmp_path, predictor, model_artifacts, fmt):
+    df = make_input(predictor)
+    input_path = tmp_path / f'input.{fmt}'
+    if fmt == 'csv':
+        df.to_csv(input_path, index=False)
+    elif fmt == 'parquet':
+        df.to_parquet(input_path)
+    else:
+        df.to_json(input_path, orient='records', lines=True)
+
+    report = score(model_artifacts, input_path, tmp_path / f'output.{fmt}', chunksize=100)
+
+    read = {'csv': pd.read_csv, 'parquet': pd.read_parquet,
+            'jsonl': lambda path: pd.read_json(path, lines=True)}[fmt]
+    output, rejects = read(tmp_path / f'output.{fmt}'), read(tmp_path / f'output_rejects.{fmt}')
+    expected, _ = predictor.predict_batch(df)
+
+    assert (report['rows'], report['scored'], report['rejected'], report['chunks']) == (250, 248, 2, 3)
+    assert report['rows_per_s'] > 0
+    assert list(rejects['row']) == [7, 120] and list(rejects['id']) == [70, 1200]
+    assert "'Fluent'" in rejects['error'][0] and 'seniority_level' in rejects['error'][1]
+    np.testing.assert_array_equal(output['row'], np.delete(np.arange(250), [7, 120]))
+    np.testing.assert_array_equal(output['prediction'], expected[~np.isnan(expected)])
+    assert not list(tmp_path.glob('*.tmp'))
+
+def test_process_pool_matches_sequential(tmp_path, predictor, model_artifacts):
+    make_input(predictor).to_csv(tmp_path / 'input.csv', index=False)
+
+    score(model_artifacts, tmp_path / 'input.csv', tmp_path / 'sequential.csv', chunksize=40)
+    report = score(model_artifacts, tmp_path / 'input.csv', tmp_path / 'pool.csv', chunksize=40, workers=2)
+
+    assert report['chunks'] == 7
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'pool.csv'), pd.read_csv(tmp_path / 'sequential.csv'))
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'pool_rejects.csv'),
+                                  pd.read_csv(tmp_path / 'sequential_rejects.csv'))
+
+def test_failed_run_leaves_no_partial_output(tmp_path, model_artifacts):
+    # у другому чанку немає колонки english_level - помилка всього файлу, а не рядків
+    rows = [VALID_ROW] * 10 + [{**VALID_ROW, 'english_level': None}] * 10
+    pd.DataFrame(rows).to_json(tmp_path / 'input.jsonl', orient='records', lines=True)
+    lines = (tmp_path / 'input.jsonl').read_text().replace(',"english_level":null', '')
+    (tmp_path / 'input.jsonl').write_text(lines)
+
+    with pytest.raises(ValueError, match='Missing required columns'):
+        score(model_artifacts, tmp_path / 'input.jsonl', tmp_path / 'output.jsonl', chunksize=10)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['input.jsonl']
+
+def test_parquet_output_tolerates_dtype_change_between_chunks(tmp_path, model_artifacts):
+    # перший чанк: experience_years і id цілі, другий - дробові та з пропуском
+    rows = ([{**VALID_ROW, 'id': 1}] * 10 +
+            [{**VALID_ROW, 'id': None, 'experience_years': 2.5}] * 10)
+    pd.DataFrame(rows)[:10].to_csv(tmp_path / 'input.csv', index=False)
+    pd.DataFrame(rows)[10:].to_csv(tmp_path / 'input.csv', index=False, header=False, mode='a')
+
+    report = score(model_artifacts, tmp_path / 'input.csv', tmp_path / 'output.parquet', chunksize=10)
+
+    output = pd.read_parquet(tmp_path / 'output.parquet')
+    assert (report['chunks'], report['scored']) == (2, 20)
+    assert list(output['experience_years']) == [4.0] * 10 + [2.5] * 10
+    assert output['id'].isnull().sum() == 10
+
+def test_non_numeric_values_go_to_rejects(tmp_path, predictor, model_artifacts):
+    rows = [VALID_ROW] * 5 + [{**VALID_ROW, 'experience_years': 'unknown'}] + [VALID_ROW] * 4
+    pd.DataFrame(rows).to_csv(tmp_path / 'input.csv', index=False)
+
+    report = score(model_artifacts, tmp_path / 'input.csv', tmp_path / 'output.parquet', chunksize=4)
+
+    rejects = pd.read_parquet(tmp_path / 'output_rejects.parquet')
+    assert (report['scored'], report['rejected']) == (9, 1)
+    assert list(rejects['row']) == [5]
+    assert "'unknown'" in rejects['error'][0] and 'experience_years' in rejects['error'][0]
+    with pytest.raises(ValueError, match='Non-numeric'):
+        predictor.predict(pd.DataFrame(rows))
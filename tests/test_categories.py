@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from src.data.categories import recode, as_fixed_categorical, categorize_column
+
+DTYPE = pd.CategoricalDtype(['Junior', 'Middle', 'Senior'])
+
+def test_categorize_column_keeps_allowed_codes_stable():
+    column = pd.Series(['Senior', 'Not Specified', 'Junior', None, 'Senior'])
+
+    result = categorize_column(column, DTYPE)
+    assert list(result.cat.categories) == ['Junior', 'Middle', 'Senior', 'Not Specified']
+    assert result.cat.codes.tolist() == [2, 3, 0, -1, 2]
+
+    # додаткова категорія зникає, коли відфільтрована
+    filtered = categorize_column(result[result != 'Not Specified'], DTYPE, drop_unused_extra=True)
+    assert filtered.dtype == DTYPE
+
+def test_recode_categorical_and_strings_agree():
+    values = pd.Series(['Middle', 'Lead', None, 'Junior'])
+
+    expected = [1, -1, -1, 0]
+    np.testing.assert_array_equal(recode(values, DTYPE.categories), expected)
+    np.testing.assert_array_equal(recode(values.astype('category'), DTYPE.categories), expected)
+
+    fixed = as_fixed_categorical(values, DTYPE)
+    assert fixed.dtype == DTYPE and fixed.cat.codes.tolist() == expected
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import KFold
+
+from src.scripts.encoders import TargetEncoder, FrequencyEncoder
+
+X_TRAIN = pd.DataFrame({'level': ['Junior', 'Junior', 'Middle', 'Senior', 'Senior', 'Senior']})
+Y_TRAIN = pd.Series([1000.0, 1200.0, 2500.0, 4000.0, 5000.0, 4500.0])
+
+def test_frequency_transform_counts_and_unknown():
+    encoder = FrequencyEncoder(fill_value=-1).fit(X_TRAIN)
+
+    # довга колонка (factorize) і коротка (прямий lookup) дають однаковий результат
+    X_long = pd.DataFrame({'level': ['Senior', 'Lead', 'Junior', 'Middle', None] * 3})
+    X_short = X_long.iloc[:2]
+
+    np.testing.assert_array_equal(encoder.transform(X_long).ravel(), [3, -1, 2, 1, -1] * 3)
+    np.testing.assert_array_equal(encoder.transform(X_short).ravel(), [3, -1])
+
+def test_target_transform_uses_smoothed_means():
+    encoder = TargetEncoder(smoothing=1.0, fill_value=0).fit(X_TRAIN, Y_TRAIN)
+    global_mean = Y_TRAIN.mean()
+
+    X = pd.DataFrame({'level': ['Junior', 'Lead', 'Junior', 'Senior']})
+    expected_junior = (2 * 1100.0 + global_mean) / 3
+    expected_senior = (3 * 4500.0 + global_mean) / 4
+
+    np.testing.assert_allclose(encoder.transform(X).ravel(),
+                               [expected_junior, 0, expected_junior, expected_senior])
+
+@pytest.mark.parametrize('encoder', [FrequencyEncoder(handle_unknown='error'),
+                                     TargetEncoder(handle_unknown='error')])
+def test_unknown_category_raises(encoder):
+    encoder.fit(X_TRAIN, Y_TRAIN)
+
+    with pytest.raises(ValueError, match='Lead'):
+        encoder.transform(pd.DataFrame({'level': ['Junior', 'Lead', 'Middle', 'Senior']}))
+
+def reference_cv_encoding(categories, targets, smoothing, cv):
+    """Out-of-fold encoding через groupby на кожному fold'і (попередня реалізація)"""
+    result = np.empty(len(targets))
+    for train_idx, val_idx in KFold(n_splits=cv, shuffle=True, random_state=42).split(categories):
+        train = pd.DataFrame({'category': categories[train_idx], 'target': targets[train_idx]})
+        fold_mean = train['target'].mean()
+        stats = train.groupby('category')['target'].agg(['mean', 'count'])
+        smoothed = (stats['count'] * stats['mean'] + smoothing * fold_mean) / (stats['count'] + smoothing)
+        result[val_idx] = [smoothed.get(c, fold_mean) for c in categories[val_idx]]
+    return result
+
+def test_cv_encoding_matches_per_fold_groupby():
+    rng = np.random.default_rng(7)
+    # рідкісні категорії потрапляють лише в один fold
+    categories = np.array(list(rng.choice(['a', 'b', 'c'], 300)) + ['rare_1', 'rare_2'], dtype=object)
+    targets = rng.normal(size=len(categories))
+
+    encoder = TargetEncoder(smoothing=2.0, cv=5)
+    result = encoder.fit_transform(pd.DataFrame({'level': categories}), targets)
+
+    expected = reference_cv_encoding(categories, targets, smoothing=2.0, cv=5)
+    assert isinstance(encoder.encodings_[0]['cv'], np.ndarray)
+    np.testing.assert_allclose(result.ravel(), expected, rtol=1e-10)
+
+def test_categorical_input_matches_strings():
+    dtype = pd.CategoricalDtype(['Lead', 'Senior', 'Middle', 'Junior'])
+    X_cat = X_TRAIN.astype({'level': dtype})
+    X_new = pd.DataFrame({'level': ['Senior', 'Lead', 'Junior', None] * 3})
+
+    for encoder in [TargetEncoder(cv=2), FrequencyEncoder()]:
+        expected = encoder.fit_transform(X_TRAIN, Y_TRAIN)
+        np.testing.assert_allclose(encoder.fit_transform(X_cat, Y_TRAIN), expected)
+        np.testing.assert_allclose(encoder.transform(X_new.astype({'level': dtype})),
+                                   encoder.transform(X_new))
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api as api
+from app.executor import InferenceExecutor, ExecutorOverloadedError, InferenceTimeoutError, predict_batch
+from app.lifecycle import ModelLoader
+
+RECORD = {'job_category': 'QA & Testing',
+          'seniority_level': 'Junior',
+          'english_level': 'Intermediate',
+          'experience_years': 2}
+RECORDS = [{**RECORD, 'experience_years': years} for years in range(10)]
+
+def make_loader(model_artifacts) -> ModelLoader:
+    loader = ModelLoader(model_path=model_artifacts / 'best_model.pkl',
+                         metadata_path=model_artifacts / 'model_metadata.pkl')
+    loader.load()
+    return loader
+
+def wait_for(release: threading.Event):
+    def func(predictor):
+        release.wait(timeout=5)
+        return predictor.version
+    return func
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_executor_modes_match_predictor(model_artifacts, predictor, mode):
+    loader = make_loader(model_artifacts)
+    executor = InferenceExecutor(loader, mode=mode, max_workers=2, timeout=60,
+                                 **loader.predictor_kwargs).start()
+
+    async def run():
+        await executor.warmup()
+        return await asyncio.gather(*(executor.run(predict_batch, RECORDS[i::2]) for i in range(2)))
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    for i, (predictions, row_errors) in enumerate(results):
+        assert predictions.tolist() == predictor.predict(pd.DataFrame(RECORDS[i::2])).tolist()
+        assert row_errors.empty
+    assert executor.stats()['completed'] == 2 and executor.stats()['in_flight'] == 0
+
+def test_executor_rejects_when_full(model_artifacts):
+    release = threading.Event()
+    executor = InferenceExecutor(make_loader(model_artifacts), max_workers=1, max_queue=1).start()
+
+    async def run():
+        # перша задача виконується, друга чекає в черзі пулу, третя - понад ліміт
+        running = [asyncio.ensure_future(executor.run(wait_for(release))) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(ExecutorOverloadedError):
+            await executor.run(wait_for(release))
+        release.set()
+        return await asyncio.gather(*running)
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert executor.stats()['rejected'] == 1 and executor.stats()['completed'] == 2
+
+def test_executor_timeout_frees_slot_after_task(model_artifacts):
+    release = threading.Event()
+    executor = InferenceExecutor(make_loader(model_artifacts), max_workers=1, max_queue=0).start()
+
+    async def run():
+        with pytest.raises(InferenceTimeoutError):
+            await executor.run(wait_for(release), timeout=0.05)
+        # задача ще виконується і займає слот
+        with pytest.raises(ExecutorOverloadedError):
+            await executor.run(wait_for(release))
+        release.set()
+        while executor.in_flight:
+            await asyncio.sleep(0.01)
+        return await executor.run(wait_for(release))
+
+    try:
+        assert asyncio.run(run()) is not None
+    finally:
+        executor.shutdown()
+
+    assert executor.stats()['timeouts'] == 1
+
+def test_api_sheds_load_and_times_out(model_artifacts, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(api, 'loader', ModelLoader(model_path=model_artifacts / 'best_model.pkl',
+                                                   metadata_path=model_artifacts / 'model_metadata.pkl',
+                                                   table_mode=False))
+    monkeypatch.setattr(api, 'EXECUTOR_WORKERS', 1)
+    monkeypatch.setattr(api, 'EXECUTOR_QUEUE', 0)
+    monkeypatch.setattr(api, 'REQUEST_TIMEOUT', 0.2)
+    monkeypatch.setattr(api, 'WAIT_FOR_MODEL', True)
+
+    with TestClient(api.app) as client:
+        response = client.post('/predict/batch', json={'records': RECORDS})
+        assert response.status_code == 200
+        assert response.json()['predictions'] == api.loader.get().predict(pd.DataFrame(RECORDS)).tolist()
+
+        # єдиний слот пулу зайнятий задачею, що не встигає за REQUEST_TIMEOUT
+        def slow_predict_batch(predictor, *args):
+            release.wait(timeout=5)
+            return predict_batch(predictor, *args)
+
+        monkeypatch.setattr(api, 'run_predict_batch', slow_predict_batch)
+        assert client.post('/predict/batch', json={'records': RECORDS}).status_code == 504
+        assert client.post('/predict', json=RECORD).status_code == 429
+        assert client.post('/predict/batch', json={'records': RECORDS}).status_code == 429
+        release.set()
+        while api.executor.in_flight:
+            time.sleep(0.01)
+
+        stats = client.get('/predict/executor').json()
+        assert stats['mode'] == 'thread' and stats['rejected'] == 2 and stats['timeouts'] == 1
+        assert 'salary_executor_rejected_total 2' in client.get('/metrics').text
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from src.utils.paths import DATA_DIR
+from src.data.preprocessing import RAW_FEATURES
+from src.data.ingestion import stream_raw_csv, FILTER_COLUMN
+from src.pipeline import preprocces_data
+
+RAW_CSV = DATA_DIR / 'raw/2025_june_raw.csv'
+
+def test_streaming_matches_full_read():
+    expected = preprocces_data(RAW_CSV, save_data=False)
+    streamed = preprocces_data(RAW_CSV, save_data=False, chunksize=1000)
+
+    pd.testing.assert_frame_equal(streamed, expected)
+
+def test_stream_raw_csv_reads_only_needed_columns():
+    df, report = stream_raw_csv(RAW_CSV, chunksize=5000)
+
+    assert set(df.columns) == set(RAW_FEATURES.values()) - {'position'} | {'job_category', FILTER_COLUMN}
+    assert report['chunks'] == 3
+    assert report['rows_read'] == len(pd.read_csv(RAW_CSV, encoding='cp1251', usecols=[0]))
+    assert report['rows_kept'] == len(df) <= report['rows_read']
+
+def test_stream_raw_csv_keeps_categorical_dtypes():
+    df, report = stream_raw_csv(RAW_CSV, chunksize=1000)
+
+    for col in ('job_category', 'seniority_level', 'english_level'):
+        assert isinstance(df[col].dtype, pd.CategoricalDtype)
+    assert report['survivors_mb'] < report['rows_kept'] * df.shape[1] * 8 / 1e6
+    assert report['peak_rss_mb'] >= report['rss_growth_mb'] >= 0
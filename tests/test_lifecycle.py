@@ -0,0 +1,122 @@
+import os
+import threading
+import joblib
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api as api
+from app.lifecycle import ModelLoader, ModelRegistryWatcher
+import src.models.registry as registry_module
+from src.models.registry import save_model_artifacts, read_version
+
+RECORD = {'job_category': 'QA & Testing',
+          'seniority_level': 'Junior',
+          'english_level': 'Intermediate',
+          'experience_years': 2}
+
+@pytest.fixture
+def registry(tmp_path, model_artifacts):
+    pipeline = joblib.load(model_artifacts / 'best_model.pkl')
+    version = save_model_artifacts(pipeline, {'model_name': 'Ridge', 'test_R2': 0.5, 'params': {}}, tmp_path)
+    return tmp_path, pipeline, version
+
+def make_loader(models_dir) -> ModelLoader:
+    return ModelLoader(warmup=True, drain_timeout=10,
+                       model_path=models_dir / 'best_model.pkl',
+                       metadata_path=models_dir / 'model_metadata.pkl')
+
+def publish(models_dir, pipeline, test_r2: float) -> str:
+    version = save_model_artifacts(pipeline, {'model_name': 'Ridge', 'test_R2': test_r2, 'params': {}}, models_dir)
+    # mtime файлової системи може не встигнути змінитись між двома записами
+    stat = os.stat(models_dir / 'model_metadata.pkl')
+    os.utime(models_dir / 'model_metadata.pkl', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    return version
+
+def test_save_model_artifacts_versions(registry):
+    models_dir, _, version = registry
+
+    assert read_version(models_dir / 'best_model.pkl', models_dir / 'model_metadata.pkl') == version
+    assert make_loader(models_dir).load().version == version
+    assert not list(models_dir.glob('*.tmp'))
+
+def test_watcher_reloads_new_version(registry):
+    models_dir, pipeline, version = registry
+    loader = make_loader(models_dir)
+    old = loader.load()
+    watcher = ModelRegistryWatcher(loader)
+
+    assert not watcher.check()
+
+    new_version = publish(models_dir, pipeline, test_r2=0.7)
+    assert watcher.check()
+    assert loader.get() is not old and loader.version == new_version
+    assert loader.info()['test_R2'] == 0.7 and loader.reloads == 1
+    assert not watcher.check()
+
+def test_reload_drains_in_flight_requests(registry):
+    models_dir, pipeline, _ = registry
+    loader = make_loader(models_dir)
+    old = loader.load()
+
+    lease = loader.use()
+    reloading = threading.Thread(target=loader.reload)
+    reloading.start()
+    reloading.join(timeout=5)
+
+    # нова модель вже обслуговує запити, reload чекає на старий lease
+    assert reloading.is_alive() and loader.get() is not old
+    with lease as model:
+        assert model is old
+    reloading.join(timeout=5)
+    assert not reloading.is_alive()
+
+def test_failed_reload_keeps_current_model(registry):
+    models_dir, _, version = registry
+    loader = make_loader(models_dir)
+    loader.load()
+    watcher = ModelRegistryWatcher(loader)
+
+    (models_dir / 'best_model.pkl').write_bytes(b'broken')
+    publish(models_dir, pipeline=None, test_r2=0.9)
+    (models_dir / 'best_model.pkl').write_bytes(b'broken')
+
+    assert not watcher.check()
+    assert watcher.last_error is not None
+    assert loader.ready and loader.version == version
+
+def test_model_endpoint_reports_active_version(registry, monkeypatch):
+    models_dir, _, version = registry
+    monkeypatch.setattr(api, 'loader', make_loader(models_dir))
+    monkeypatch.setattr(api, 'RELOAD_INTERVAL', 0)
+    monkeypatch.setattr(api, 'WAIT_FOR_MODEL', True)
+
+    with TestClient(api.app) as client:
+        info = client.get('/model').json()
+        assert info['version'] == version and info['test_R2'] == 0.5
+        assert client.post('/predict', json=RECORD).status_code == 200
+
+def test_watcher_loads_model_after_failed_first_load(tmp_path, model_artifacts):
+    loader = make_loader(tmp_path)
+    watcher = ModelRegistryWatcher(loader)
+    with pytest.raises(FileNotFoundError):
+        loader.load()
+
+    assert not watcher.check() and loader.status == 'failed'
+
+    version = publish(tmp_path, joblib.load(model_artifacts / 'best_model.pkl'), test_r2=0.5)
+    assert watcher.check()
+    assert loader.ready and loader.version == version
+
+def test_watcher_survives_unreadable_registry(registry, monkeypatch):
+    models_dir, _, version = registry
+    loader = make_loader(models_dir)
+    loader.load()
+    watcher = ModelRegistryWatcher(loader)
+
+    def denied(path):
+        raise PermissionError(13, 'Permission denied', str(path))
+
+    monkeypatch.setattr(registry_module, 'metadata_stamp', denied)
+    assert not watcher.check()
+    assert 'PermissionError' in watcher.last_error
+    assert loader.ready and loader.version == version
@@ -0,0 +1,87 @@
+import time
+import threading
+from time import perf_counter_ns
+
+from src.utils.metrics import Histogram, PhaseMetrics, prometheus_histogram, prometheus_metric
+
+def test_phase_metrics_records_per_phase():
+    metrics = PhaseMetrics(buckets=(10, 1000))
+
+    start = metrics.record('validate', perf_counter_ns())
+    metrics.record('format', start)
+    metrics.record('format', start - 5_000_000) # 5 мс
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot) == ['format', 'validate']
+    assert snapshot['format']['count'] == 2 and snapshot['format']['buckets']['1000'] == 1
+
+def test_phase_metrics_flushes_full_buffer():
+    metrics = PhaseMetrics(buckets=(1,), flush_size=3)
+    start = perf_counter_ns()
+    for _ in range(4):
+        metrics.record('regressor', start)
+
+    assert len(metrics._buffers['regressor']) == 1 and metrics._histograms['regressor'].count == 3
+    assert metrics.histograms()['regressor'].count == 4
+
+def test_flushes_of_one_phase_are_serialized():
+    metrics = PhaseMetrics(buckets=(1,), flush_size=2)
+    start = perf_counter_ns()
+    metrics.record('regressor', start)
+    histogram = metrics.histograms()['regressor']
+
+    # перший flush зупиняється посеред зведення, другий має дочекатись його
+    release, calls = threading.Event(), []
+    observe_many = histogram.observe_many
+    def slow_observe_many(values, scale=1.0):
+        calls.append(len(values))
+        if len(calls) == 1:
+            release.wait(5)
+        observe_many(values, scale)
+    histogram.observe_many = slow_observe_many
+
+    writer = threading.Thread(target=lambda: [metrics.record('regressor', start) for _ in range(2)])
+    writer.start()
+    while not calls:
+        time.sleep(0.01)
+    metrics.record('regressor', start)
+    reader = threading.Thread(target=metrics.histograms)
+    reader.start()
+    reader.join(0.2)
+
+    assert reader.is_alive() and calls == [2]
+    release.set()
+    writer.join()
+    reader.join()
+    histogram = metrics.histograms()['regressor']
+    assert histogram.count == sum(histogram.counts) == 4
+
+def test_observe_many_matches_observe():
+    values = [0, 0.1, 1, 1.5, 10, 11, 1e9]
+    one_by_one, batched = Histogram(buckets=(1, 10)), Histogram(buckets=(1, 10))
+    for value in values:
+        one_by_one.observe(value)
+    batched.observe_many(values)
+
+    assert batched.snapshot() == one_by_one.snapshot()
+
+def test_prometheus_text_format():
+    histogram = Histogram(buckets=(1, 10))
+    histogram.observe(0.5)
+    histogram.observe(20)
+
+    lines = prometheus_histogram('latency_seconds', 'Latency', {(('phase', 'a"b'),): histogram}, scale=1e-3)
+    lines += prometheus_metric('hits_total', 'Hits', 'counter', {(): 3})
+
+    assert lines == [
+        '# HELP latency_seconds Latency',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{phase="a\\"b",le="0.001"} 1',
+        'latency_seconds_bucket{phase="a\\"b",le="0.01"} 1',
+        'latency_seconds_bucket{phase="a\\"b",le="+Inf"} 2',
+        'latency_seconds_sum{phase="a\\"b"} 0.0205',
+        'latency_seconds_count{phase="a\\"b"} 2',
+        '# HELP hits_total Hits',
+        '# TYPE hits_total counter',
+        'hits_total 3',
+    ]
@@ -1,12 +1,24 @@
 import pandas as pd
 
 from src.utils.paths import DATA_DIR
-from src.data.pipeline import run_pipeline
+from src.pipeline import preprocces_data
+from benchmarks.synthetic import write_raw_csv
+
+OUTPUT_COLUMNS = ['job_category', 'seniority_level', 'english_level', 'experience_years', 'salary_usd']
 
 def test_pipeline_flow():
-    df = run_pipeline(input_csv= DATA_DIR / 'raw/2025_june_raw.csv',
-                      save=False)
+    df = preprocces_data(input_csv=DATA_DIR / 'raw/2025_june_raw.csv',
+                         save_data=False)
 
     assert isinstance(df, pd.DataFrame)
+    assert list(df.columns) == OUTPUT_COLUMNS and len(df) > 0
     assert not df.isna().values.any(), "DataFrame містить NaN"
-    assert (DATA_DIR / "processed/model_input_df.csv").exists()
+
+def test_pipeline_flow_on_synthetic_survey(tmp_path):
+    raw_csv = write_raw_csv(tmp_path / 'raw.csv', n_rows=5_000)
+
+    df = preprocces_data(raw_csv, save_data=False)
+
+    assert list(df.columns) == OUTPUT_COLUMNS and len(df) > 1_000
+    assert not df.isna().values.any()
+    pd.testing.assert_frame_equal(preprocces_data(raw_csv, save_data=False, chunksize=1_000), df)
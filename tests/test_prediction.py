@@ -1,19 +1,12 @@
 import pandas as pd
-from src.scripts.prediction import SalaryPredictor
 
-model = SalaryPredictor()
-
-def test_single_output():
-
-    test_data = {'category': 'Analyst',
-                 'title_group': 'Mid-level',
+def test_single_output(predictor):
+    test_data = {'job_category': 'Data & Machine Learning',
+                 'seniority_level': 'Middle',
                  'english_level': 'Pre-Intermediate',
-                 'it_experience_years': 4.0}
-
-    test_data = pd.DataFrame([test_data])
-
-    prediction = model.predict(test_data)
+                 'experience_years': 4.0}
 
-    print(f'Predicted value = {prediction}')
+    prediction = predictor.predict(pd.DataFrame([test_data]))
 
-test_single_output()
+    assert prediction.shape == (1,)
+    assert prediction[0] == predictor.predict_record(test_data)
@@ -0,0 +1,120 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+from models.prediction_cache import PredictionCache, RedisBackend, DictBackend
+from models.salary_predictor import SalaryPredictor
+from src.models.registry import save_model_artifacts
+
+RECORD = {'job_category': 'QA & Testing',
+          'seniority_level': 'Junior',
+          'english_level': 'Intermediate',
+          'experience_years': 2}
+
+class FakeRedis:
+    """mget / pipeline().set(ex=) / execute() поверх dict"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def mget(self, names):
+        return [self.data.get(name) for name in names]
+
+    def pipeline(self):
+        return self
+
+    def set(self, name, value, ex=None):
+        self.data[name] = value.encode()
+        self.expiry[name] = ex
+
+    def execute(self):
+        pass
+
+def make_predictor(models_dir, cache, **kwargs) -> SalaryPredictor:
+    return SalaryPredictor(model_path=models_dir / 'best_model.pkl',
+                           metadata_path=models_dir / 'model_metadata.pkl',
+                           prediction_cache=cache, **kwargs)
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(max_size=2)
+    cache.set('a', 1.0)
+    cache.set('b', 2.0)
+    assert cache.get('a') == 1.0 # 'a' свіжіший за 'b'
+
+    cache.set('c', 3.0)
+
+    assert cache.get_many(['a', 'b', 'c']) == [1.0, None, 3.0]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (3, 1, 1, 2)
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('models.prediction_cache.time.monotonic', lambda: now[0])
+    cache = PredictionCache(ttl=10)
+    cache.set('a', 1.0)
+
+    now[0] = 109.0
+    assert cache.get('a') == 1.0
+    now[0] = 111.0
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+def test_shared_backend_fills_local_cache():
+    backend = DictBackend()
+    PredictionCache(backend=backend).set(('v1', 'x', 2.0), 5.0)
+
+    other_worker = PredictionCache(backend=backend)
+
+    assert other_worker.get(('v1', 'x', 2.0)) == 5.0
+    assert other_worker.get(('v1', 'x', 2.0)) == 5.0
+    stats = other_worker.stats()
+    assert (stats['backend_hits'], stats['hits'], stats['misses']) == (1, 1, 0)
+
+def test_redis_backend_serializes_keys():
+    client = FakeRedis()
+    backend = RedisBackend(client, prefix='test')
+
+    backend.set_many([(('v1', 'QA & Testing', 2.0), 1234.5)], ttl=60)
+
+    assert client.expiry == {'test:["v1","QA & Testing",2.0]': 60}
+    assert backend.get_many([('v1', 'QA & Testing', 2.0), ('v2', 'QA & Testing', 2.0)]) == [1234.5, None]
+
+def test_predictor_cache_matches_model(model_artifacts):
+    cache = PredictionCache()
+    predictor = make_predictor(model_artifacts, cache)
+    sample = predictor._sample_inputs(n_samples=100, random_state=7)
+    expected = make_predictor(model_artifacts, None).predict(sample)
+
+    np.testing.assert_array_equal(predictor.predict(sample), expected)
+    misses = cache.stats()['misses']
+    np.testing.assert_array_equal(predictor.predict(sample), expected)
+
+    assert cache.stats()['misses'] == misses and cache.stats()['hits'] >= len(sample)
+    # 2 і 2.0 - той самий ключ
+    assert predictor.cache_key(RECORD) == predictor.cache_key({**RECORD, 'experience_years': 2.0})
+    assert predictor.lookup_record(sample.iloc[0].to_dict()) == expected[0]
+
+def test_predictor_cache_skips_invalid_records(predictor):
+    predictor.cache = PredictionCache()
+
+    assert predictor.cache_key({**RECORD, 'experience_years': None}) is None
+    predictions, row_errors = predictor.predict_batch(pd.DataFrame([RECORD, {**RECORD, 'english_level': 'Fluent'}]))
+
+    assert list(row_errors.index) == [1] and not np.isnan(predictions[0])
+    assert predictor.cache.stats()['size'] == 1
+
+def test_new_model_version_invalidates_cache(tmp_path, model_artifacts):
+    pipeline = joblib.load(model_artifacts / 'best_model.pkl')
+    save_model_artifacts(pipeline, {'model_name': 'Ridge', 'test_R2': 0.5, 'params': {}}, tmp_path)
+    cache = PredictionCache()
+    old = make_predictor(tmp_path, cache)
+    old.predict_record(RECORD)
+    assert old.lookup_record(RECORD) is not None
+
+    save_model_artifacts(pipeline, {'model_name': 'Ridge', 'test_R2': 0.7, 'params': {}}, tmp_path)
+    new = make_predictor(tmp_path, cache)
+
+    assert new.version != old.version and cache.version == new.version
+    assert new.lookup_record(RECORD) is None
+    assert cache.stats()['invalidations'] == 1
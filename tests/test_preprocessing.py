@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+from src.data.configs.experience_mapping import EXPERIENCE_RANGES
+from src.data.configs.salary_mapping import SALARY_RANGES
+from src.data.preprocessing import (
+    score_experience_outliers,
+    score_salary_outliers,
+    cleaning_outliers_experience,
+    cleaning_outliers_salary,
+    stratified_sample_mask,
+    feature_balancing_category,
+)
+
+def reference_experience_score(seniority, experience):
+    """Скалярні правила з попередньої (iterrows) реалізації"""
+    if seniority not in EXPERIENCE_RANGES:
+        return 0.0
+    rules = EXPERIENCE_RANGES[seniority]
+    if 'max_outlier' in rules and experience > rules['max_outlier']:
+        return 1.0
+    if rules['typical_range'][0] <= experience <= rules['typical_range'][1]:
+        return 0.0
+    if rules['acceptable'][0] <= experience <= rules['acceptable'][1]:
+        return 0.25
+    if experience < rules['critical_outlier']:
+        return 0.75
+    if experience < rules['outlier_threshold']:
+        return 0.5
+    return 1.0
+
+def reference_salary_score(seniority, salary):
+    if seniority not in SALARY_RANGES:
+        return 0.0
+    rules = SALARY_RANGES[seniority]
+    if rules['typical_range'][0] <= salary <= rules['typical_range'][1]:
+        return 0.0
+    if rules['acceptable'][0] <= salary <= rules['acceptable'][1]:
+        return 0.25
+    if rules['outlier_range'][0] <= salary <= rules['outlier_range'][1]:
+        return 0.75
+    return 1.0
+
+def test_experience_scores_match_rules():
+    levels = list(EXPERIENCE_RANGES.keys()) + ['Unknown']
+    grid = np.arange(0, 45, 0.25)
+    seniority = np.repeat(levels, len(grid))
+    experience = np.tile(grid, len(levels))
+
+    expected = [reference_experience_score(s, e) for s, e in zip(seniority, experience)]
+    np.testing.assert_array_equal(score_experience_outliers(seniority, experience), expected)
+
+def test_salary_scores_match_rules():
+    levels = list(SALARY_RANGES.keys()) + ['Unknown']
+    grid = np.arange(0, 32000, 50)
+    seniority = np.repeat(levels, len(grid))
+    salary = np.tile(grid, len(levels))
+
+    expected = [reference_salary_score(s, v) for s, v in zip(seniority, salary)]
+    np.testing.assert_array_equal(score_salary_outliers(seniority, salary), expected)
+
+def test_cleaning_keeps_only_normal_rows():
+    df = pd.DataFrame({
+        'seniority_level': ['Junior', 'Junior', 'Senior', 'Senior'],
+        'experience_years': [1.0, 10.0, 5.0, 0.5],
+        'salary_usd': [1000.0, 1000.0, 9000.0, 4000.0],
+    })
+
+    df_exp = cleaning_outliers_experience(df, keep_scores=True)
+    assert df_exp.index.tolist() == [0, 2]
+    assert df_exp['outlier_score'].tolist() == [0.0, 0.0]
+
+    df_salary = cleaning_outliers_salary(df_exp)
+    assert df_salary['salary_usd'].tolist() == [1000.0]
+    assert 'salary_score' not in df_salary.columns
+
+def make_balancing_frame(n_rows: int = 5000, random_state: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(random_state)
+    return pd.DataFrame({
+        'job_category': rng.choice(['Software Engineering', 'QA & Testing', 'Design & Creative'], n_rows),
+        'seniority_level': rng.choice(['Junior', 'Middle', 'Senior', None], n_rows),
+        'salary_usd': rng.choice(np.arange(500, 6000, 250), n_rows).astype(float),
+    })
+
+def test_stratified_sample_quotas_match_per_group_sampling():
+    df = make_balancing_frame()
+    se_df = df[df['job_category'] == 'Software Engineering']
+    strata = ['seniority_level', 'salary_usd']
+
+    mask = stratified_sample_mask(se_df, strata, scale=100)
+
+    # квоти попередньої реалізації (x.sample по кожній страті); NaN-страти не відбираються
+    expected = se_df.groupby(strata).size().map(lambda size: min(size, max(1, int(100 * size / len(se_df)))))
+    actual = se_df[mask].groupby(strata).size()
+    pd.testing.assert_series_equal(actual, expected)
+
+def test_feature_balancing_is_deterministic_and_keeps_other_categories():
+    df = make_balancing_frame()
+
+    first = feature_balancing_category(df, random_state=7)
+    pd.testing.assert_frame_equal(first, feature_balancing_category(df, random_state=7))
+    assert not first.equals(feature_balancing_category(df, random_state=8))
+
+    assert (first['job_category'] == 'Design & Creative').sum() == (df['job_category'] == 'Design & Creative').sum()
+
+def test_feature_balancing_salary_bins():
+    df = make_balancing_frame()
+    se_df = df[df['job_category'] == 'Software Engineering']
+
+    mask = stratified_sample_mask(se_df, ['seniority_level', 'salary_usd'], scale=100, bins={'salary_usd': 4})
+    bins = pd.qcut(se_df['salary_usd'], q=4, labels=False)
+
+    # 3 рівні x 4 біни, у кожній страті - пропорційна квота
+    assert se_df[mask].groupby(['seniority_level', bins[mask]]).ngroups == 12
+    assert len(feature_balancing_category(df, salary_bins=[0, 2000, 4000, 6000])) < len(df)
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from src.utils.paths import DATA_DIR
+from src.data.preprocessing import (
+    select_and_rename_features,
+    standardization_seniority_features,
+    drop_unspecified_positions,
+    feature_balancing_category,
+    preprocessing_feature_english,
+    cleaning_outliers_experience,
+    cleaning_outliers_salary,
+    export_dataframe,
+)
+from src.data.feature_engineering import standardization_job_category
+from src.data.preprocessing_graph import Stage, StageGraph, run_preprocessing_graph
+
+RAW_CSV = DATA_DIR / 'raw/2025_june_raw.csv'
+
+def legacy_preprocessing(input_csv):
+    """Попередня фіксована послідовність етапів preprocces_data"""
+    df = pd.read_csv(input_csv, encoding='cp1251')
+    df = select_and_rename_features(df)
+    df = standardization_seniority_features(df)
+    df = drop_unspecified_positions(df)
+    df = standardization_job_category(df)
+    df = feature_balancing_category(df)
+    df = preprocessing_feature_english(df)
+    df = cleaning_outliers_experience(df)
+    df = cleaning_outliers_salary(df)
+    return export_dataframe(df, save=False)
+
+def test_graph_matches_legacy_sequence():
+    cache = {}
+    df, report = run_preprocessing_graph(RAW_CSV, cache=cache)
+
+    pd.testing.assert_frame_equal(export_dataframe(df, save=False), legacy_preprocessing(RAW_CSV))
+    assert report[0]['stage'] == 'read_csv' and report[-1]['rows'] == len(df)
+    assert not any(stage['cached'] for stage in report)
+
+    cached_df, cached_report = run_preprocessing_graph(RAW_CSV, cache=cache, track_memory=True)
+    pd.testing.assert_frame_equal(cached_df, df)
+    assert isinstance(df['seniority_level'].dtype, pd.CategoricalDtype)
+    assert all(stage['cached'] for stage in cached_report[1:])
+    assert all(stage['peak_mb'] is not None for stage in cached_report[1:])
+
+def test_filters_are_fused_and_unused_stages_pruned():
+    calls = []
+
+    def positive(col):
+        def func(df):
+            calls.append((col, len(df)))
+            return df[col] > 0
+        return func
+
+    graph = StageGraph([
+        Stage('a_positive', positive('a'), ['a'], kind='filter'),
+        Stage('unused', lambda df: {'c': df['a'] * 2}, ['a'], ['c']),
+        Stage('double_b', lambda df: {'b': df['b'] * 2}, ['b'], ['b']),
+        Stage('b_positive', positive('b'), ['b'], kind='filter'),
+    ], output_columns=['b'])
+
+    assert [stage.name for stage in graph.stages] == ['a_positive', 'double_b', 'b_positive']
+    assert graph.required_columns == ['a', 'b']
+
+    df = pd.DataFrame({'a': [1, -1, 2, 3], 'b': [1, 1, -1, 2], 'extra': [0, 0, 0, 0]})
+    result, report = graph.run(df)
+
+    # обидва фільтри бачать повний фрейм, маска застосовується один раз у кінці
+    assert calls == [('a', 4), ('b', 4)]
+    assert result['b'].tolist() == [2, 4]
+    assert [stage['rows'] for stage in report] == [3, 3, 2]
+
+def test_graph_validates_inputs():
+    graph = StageGraph([Stage('f', lambda df: df['a'] > 0, ['a'], kind='filter')], ['a'])
+
+    with pytest.raises(ValueError, match='Missing input columns'):
+        graph.run(pd.DataFrame({'b': [1]}))
+    with pytest.raises(ValueError, match='kind'):
+        Stage('bad', lambda df: df, ['a'], kind='join')
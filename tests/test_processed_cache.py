@@ -0,0 +1,32 @@
+import pandas as pd
+
+import src.pipeline as pipeline
+import src.data.processed_cache as processed_cache
+from src.utils.paths import DATA_DIR
+from src.data.processed_cache import processed_cache_key
+
+RAW_CSV = DATA_DIR / 'raw/2025_june_raw.csv'
+
+def test_cache_hit_skips_preprocessing(tmp_path, monkeypatch):
+    expected = pipeline.preprocces_data(RAW_CSV, save_data=False, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.parquet'))) == 1
+
+    def fail(df):
+        raise AssertionError('preprocessing must be skipped on cache hit')
+    monkeypatch.setattr(pipeline, 'feature_balancing_category', fail)
+
+    cached = pipeline.preprocces_data(RAW_CSV, save_data=False, cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(cached, expected)
+
+def test_cache_key_depends_on_mappings_and_content(tmp_path, monkeypatch):
+    key = processed_cache_key(RAW_CSV)
+    assert processed_cache_key(RAW_CSV) == key
+
+    changed = dict(processed_cache.SENIORITY_LEVEL_MAPPING, Junior='Middle')
+    monkeypatch.setattr(processed_cache, 'SENIORITY_LEVEL_MAPPING', changed)
+    assert processed_cache_key(RAW_CSV) != key
+    monkeypatch.undo()
+
+    copy = tmp_path / 'raw.csv'
+    copy.write_bytes(RAW_CSV.read_bytes() + b'\n')
+    assert processed_cache_key(copy) != key
@@ -0,0 +1,73 @@
+import json
+from sklearn.linear_model import LinearRegression, Ridge
+
+import src.pipeline as pipeline
+from src.utils.profiling import StageProfiler, compare_profiles, folded_stacks
+
+MODELS = {
+    'LinearRegression': (LinearRegression(), {'regressor__fit_intercept': [True, False]}),
+    'Ridge': (Ridge(), {'regressor__alpha': [0.1, 1.0, 10.0]}),
+}
+
+def test_stage_profiler_nests_stages(tmp_path):
+    profiler = StageProfiler(tmp_path, run='test')
+    with profiler.stage('outer'):
+        with profiler.stage('inner') as record:
+            record['rows'] = 10
+            sum(range(100_000))
+    report_path = profiler.write(status='ok')
+
+    report = json.loads(report_path.read_text())
+    inner = report['stages']['children'][0]['children'][0]
+    assert report['run'] == 'test' and report['status'] == 'ok'
+    assert inner['name'] == 'inner' and inner['rows'] == 10
+    assert inner['wall_s'] > 0 and inner['cpu_s'] > 0 and inner['peak_rss_mb'] > 0
+    for line in (tmp_path / 'profile.folded').read_text().splitlines():
+        stack, weight = line.rsplit(' ', 1)
+        assert stack.startswith('main') and int(weight) > 0
+
+def test_folded_stacks_use_self_time_and_candidates():
+    record = {'name': 'main', 'wall_s': 3.0, 'children': [
+        {'name': 'Ridge', 'wall_s': 2.0, 'children': [],
+         'candidates': [{'params': {'alpha': 0.1}, 'total_s': 0.5}, {'params': {'alpha': 1}, 'total_s': 1.0}]},
+    ]}
+
+    assert dict(folded_stacks(record)) == {
+        'main': 1_000_000,
+        'main;Ridge': 500_000,
+        'main;Ridge;candidate_alpha=0.1': 500_000,
+        'main;Ridge;candidate_alpha=1': 1_000_000,
+    }
+
+def test_compare_profiles_reports_slower_stages():
+    def report(training_s, split_s):
+        return {'stages': {'name': 'main', 'wall_s': training_s + split_s, 'children': [
+            {'name': 'training', 'wall_s': training_s, 'children': []},
+            {'name': 'split', 'wall_s': split_s, 'children': []},
+        ]}}
+
+    regressions = compare_profiles(report(10.0, 0.1), report(15.0, 0.3), threshold=0.2, min_wall_s=0.5)
+
+    # split виріс утричі, але на 0.2 с - нижче порогу шуму
+    assert [item['stage'] for item in regressions] == ['main', 'main/training']
+    assert regressions[1]['change'] == 0.5
+
+def test_main_writes_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr('src.models.train_model.REGRESSION_MODELS', MODELS)
+
+    pipeline.main(use_cache=False, profile=True, profile_dir=tmp_path)
+
+    report = json.loads((tmp_path / 'profile.json').read_text())
+    stages = {stage['name']: stage for stage in report['stages']['children']}
+    assert report['status'] == 'ok' and list(stages) == ['preprocess', 'split', 'training']
+
+    preprocess = [stage['name'] for stage in stages['preprocess']['children']]
+    assert preprocess[0] == 'read_csv' and 'balance_job_category' in preprocess and preprocess[-1] == 'export_dataframe'
+
+    search = stages['training']['children'][0]
+    assert search['name'] == 'search'
+    models = {model['name']: model for model in search['children']}
+    assert set(models) == set(MODELS)
+    assert len(models['Ridge']['candidates']) == 3 and models['Ridge']['wall_s'] > 0
+    assert all(candidate['mean_fit_s'] > 0 for candidate in models['Ridge']['candidates'])
+    assert (tmp_path / 'profile.folded').read_text().count('candidate_regressor__alpha') == 3
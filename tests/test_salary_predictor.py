@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+VALID_ROW = {'job_category': 'Software Engineering',
+             'seniority_level': 'Middle',
+             'english_level': 'Upper-Intermediate',
+             'experience_years': 4}
+
+def test_predict_single_row(predictor):
+    prediction = predictor.predict(pd.DataFrame([VALID_ROW]))
+
+    assert prediction.shape == (1,)
+    assert prediction[0] >= 0
+
+def test_predict_rejects_invalid_category(predictor):
+    with pytest.raises(ValueError, match='seniority_level'):
+        predictor.predict(pd.DataFrame([{**VALID_ROW, 'seniority_level': 'Guru'}]))
+
+def test_validate_input_uses_fixed_categories(predictor):
+    X = predictor.validate_input(pd.DataFrame([VALID_ROW] * 3))
+
+    dtype = X['seniority_level'].dtype
+    assert isinstance(dtype, pd.CategoricalDtype)
+    assert list(dtype.categories) == predictor.config_values['seniority_level']
+    np.testing.assert_array_equal(predictor.predict(X), predictor.predict(pd.DataFrame([VALID_ROW] * 3)))
+
+def test_predict_batch_reports_row_errors(predictor):
+    rows = [VALID_ROW,
+            {**VALID_ROW, 'seniority_level': 'Guru'},
+            {**VALID_ROW, 'english_level': None},
+            {**VALID_ROW, 'experience_years': 10}]
+
+    predictions, row_errors = predictor.predict_batch(pd.DataFrame(rows))
+
+    assert sorted(row_errors.index) == [1, 2]
+    assert "'Guru'" in row_errors[1]
+    assert 'english_level' in row_errors[2]
+    assert np.isnan(predictions[[1, 2]]).all()
+
+    # валідні рядки збігаються з одиночним predict
+    expected = predictor.predict(pd.DataFrame([rows[0], rows[3]]))
+    np.testing.assert_array_equal(predictions[[0, 3]], expected)
+
+@pytest.fixture
+def table_predictor(model_artifacts):
+    from models.salary_predictor import SalaryPredictor
+
+    return SalaryPredictor(model_path=model_artifacts / 'best_model.pkl',
+                           metadata_path=model_artifacts / 'model_metadata.pkl',
+                           table_mode=True,
+                           experience_grid=np.arange(0, 21))
+
+def test_table_mode_matches_live_model(predictor, table_predictor):
+    assert table_predictor.table is not None
+
+    # 25 - поза сіткою (fallback на модель), 2.5 - між точками сітки
+    rows = pd.DataFrame([{**VALID_ROW, 'experience_years': years} for years in [0, 4, 20, 25, 2.5]])
+    np.testing.assert_array_equal(table_predictor.predict(rows), predictor.predict(rows))
+
+    for record in rows.to_dict('records'):
+        assert table_predictor.predict_record(record) == predictor.predict(pd.DataFrame([record]))[0]
+
+def test_table_mode_interpolates_between_grid_points(model_artifacts):
+    from models.salary_predictor import SalaryPredictor
+
+    predictor = SalaryPredictor(model_path=model_artifacts / 'best_model.pkl',
+                                metadata_path=model_artifacts / 'model_metadata.pkl',
+                                table_mode=True, experience_grid=[2, 3], interpolate=True)
+    low, mid, high = [predictor.table.lookup_one({**VALID_ROW, 'experience_years': years})
+                      for years in [2, 2.5, 3]]
+
+    assert mid == pytest.approx((low + high) / 2)
+    assert predictor.table.lookup_one({**VALID_ROW, 'experience_years': 4}) is None
+
+def test_table_tolerance_checks_interpolated_points(predictor):
+    from models.prediction_table import PredictionTable
+
+    class QuadraticModel:
+        def predict(self, X):
+            return X['experience_years'].to_numpy(dtype=float) ** 2
+
+    model = QuadraticModel()
+    grid = np.arange(0, 21)
+    exact = PredictionTable(model, predictor.config_values, predictor.feature_cols, grid)
+    interpolated = PredictionTable(model, predictor.config_values, predictor.feature_cols, grid, interpolate=True)
+
+    assert exact.check_tolerance(model) == 0
+    # лінійна інтерполяція x^2 між цілими точками помиляється до 0.25
+    assert 0 < interpolated.check_tolerance(model) <= 0.25
+
+def test_table_mode_invalid_record_raises(table_predictor):
+    with pytest.raises(ValueError, match='job_category'):
+        table_predictor.predict_record({**VALID_ROW, 'job_category': 'Astronaut'})
+
+def test_compiled_inference_matches_pandas_path(model_artifacts, predictor):
+    from models.salary_predictor import SalaryPredictor
+
+    pandas_predictor = SalaryPredictor(model_path=model_artifacts / 'best_model.pkl',
+                                       metadata_path=model_artifacts / 'model_metadata.pkl',
+                                       compiled_inference=False)
+    assert predictor.compiled is not None and pandas_predictor.compiled is None
+
+    sample = predictor._sample_inputs(n_samples=100, random_state=3)
+    features = predictor.compiled.transform_record(sample.iloc[0].to_dict()).copy()
+    np.testing.assert_allclose(features, predictor.model.named_steps['preprocessor'].transform(sample.iloc[:1]))
+
+    expected = pandas_predictor.predict(sample)
+    for idx, record in enumerate(sample.to_dict('records')):
+        assert predictor.predict_record(record) == expected[idx]
+        assert predictor.predict_record(tuple(record.values())) == expected[idx]
+
+def test_compiled_inference_validates_record(predictor):
+    with pytest.raises(ValueError, match="Invalid values in column 'english_level'"):
+        predictor.predict_record({**VALID_ROW, 'english_level': 'Fluent'})
+    with pytest.raises(ValueError, match='Missing values'):
+        predictor.predict_record({**VALID_ROW, 'experience_years': None})
+
+def test_phase_metrics_cover_inference_paths(model_artifacts, predictor):
+    from models.salary_predictor import SalaryPredictor
+    from src.utils.metrics import PhaseMetrics
+
+    metrics = PhaseMetrics()
+    timed = SalaryPredictor(model_path=model_artifacts / 'best_model.pkl',
+                            metadata_path=model_artifacts / 'model_metadata.pkl',
+                            compiled_inference=False, metrics=metrics)
+    timed.warmup()
+    assert metrics.histograms() == {}
+
+    sample = predictor._sample_inputs(n_samples=30)
+    np.testing.assert_array_equal(timed.predict(sample), predictor.predict(sample))
+    branches = {f'preprocess.{name}' for name, *_ in predictor.model.named_steps['preprocessor'].transformers_
+                if name != 'remainder'}
+    assert set(metrics.histograms()) == {'validate', 'select', 'regressor', 'format'} | branches
+
+    metrics.reset()
+    predictor.metrics = metrics
+    predictor.predict_record(VALID_ROW)
+    assert set(metrics.histograms()) == {'lookup', 'regressor', 'format'} | branches
+    assert all(histogram.count == 1 for histogram in metrics.histograms().values())
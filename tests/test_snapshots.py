@@ -0,0 +1,95 @@
+import pandas as pd
+
+import src.data.snapshots as snapshots
+from src.utils.paths import DATA_DIR
+from src.data.snapshots import SnapshotStore, SNAPSHOT_COLUMN
+from src.data.preprocessing import export_dataframe
+from src.pipeline import preprocces_data, ingest_snapshots
+from src.utils.profiling import StageProfiler, flatten_stages
+
+RAW_CSV = DATA_DIR / 'raw/2025_june_raw.csv'
+
+class CountingProcess:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, raw_csv):
+        self.calls.append(snapshots.Path(raw_csv).name)
+        return preprocces_data(raw_csv, save_data=False)
+
+def make_snapshots(tmp_path, n_rows: int = 4000):
+    """Два 'місячні' вивантаження з реального сирого файлу"""
+    raw = pd.read_csv(RAW_CSV, encoding='cp1251')
+    paths = []
+    for name, part in [('2025_may', raw.iloc[:n_rows]), ('2025_june', raw.iloc[n_rows:])]:
+        path = tmp_path / f'{name}.csv'
+        part.to_csv(path, index=False, encoding='cp1251')
+        paths.append(path)
+    return paths
+
+def test_ingest_processes_only_new_snapshots(tmp_path):
+    may, june = make_snapshots(tmp_path)
+    store = SnapshotStore(tmp_path / 'store')
+    may_name, june_name = store.snapshot_name(may), store.snapshot_name(june)
+
+    process = CountingProcess()
+    assert store.ingest([may], process) == [may_name]
+    assert SnapshotStore(tmp_path / 'store').ingest([may, june], process) == [june_name]
+    assert process.calls == ['2025_may.csv', '2025_june.csv']
+
+    df = SnapshotStore(tmp_path / 'store').load()
+    expected = export_dataframe(pd.concat([preprocces_data(may, False), preprocces_data(june, False)],
+                                          ignore_index=True), save=False)
+    pd.testing.assert_frame_equal(df.drop(columns=[SNAPSHOT_COLUMN]), expected)
+    assert df[SNAPSHOT_COLUMN].value_counts().to_dict() == {
+        may_name: len(preprocces_data(may, False)),
+        june_name: len(preprocces_data(june, False)),
+    }
+
+def test_ingest_reprocesses_changed_content_and_mappings(tmp_path, monkeypatch):
+    may, june = make_snapshots(tmp_path)
+    store = SnapshotStore(tmp_path / 'store')
+    may_name, june_name = store.snapshot_name(may), store.snapshot_name(june)
+    process = CountingProcess()
+    store.ingest([may, june], process)
+
+    with open(may, 'a', encoding='cp1251') as f:
+        f.write('\n')
+    assert store.ingest([may, june], process) == [may_name]
+
+    monkeypatch.setattr(snapshots, 'mappings_fingerprint', lambda: 'changed')
+    assert store.ingest([may, june], process) == [may_name, june_name]
+
+def test_same_file_names_in_different_dirs_are_separate_snapshots(tmp_path):
+    may, june = make_snapshots(tmp_path)
+    (tmp_path / 'other').mkdir()
+    other_may = (tmp_path / 'other/2025_may.csv')
+    other_may.write_bytes(june.read_bytes())
+    store = SnapshotStore(tmp_path / 'store')
+
+    store.ingest([may, other_may], CountingProcess())
+
+    assert store.snapshot_name(may) != store.snapshot_name(other_may)
+    assert len(store.load([store.snapshot_name(other_may)])) == len(preprocces_data(june, False))
+
+def test_ingest_snapshots_loads_only_requested_files(tmp_path):
+    may, june = make_snapshots(tmp_path)
+    ingest_snapshots([may, june], save_data=False, store_root=tmp_path / 'store')
+
+    profiler = StageProfiler(tmp_path / 'profile')
+    df = ingest_snapshots([may], save_data=False, store_root=tmp_path / 'store', profiler=profiler)
+
+    pd.testing.assert_frame_equal(df, export_dataframe(preprocces_data(may, False), save=False))
+    # may вже в сховищі - етапи препроцесингу записуються лише для нових файлів
+    assert [stage['name'] for stage in profiler.root['children']] == ['load_snapshots']
+
+def test_ingest_snapshots_profiles_preprocessing_stages(tmp_path):
+    may, _ = make_snapshots(tmp_path)
+    profiler = StageProfiler(tmp_path / 'profile')
+
+    ingest_snapshots([may], save_data=False, store_root=tmp_path / 'store', profiler=profiler)
+
+    stages = flatten_stages(profiler.root)
+    snapshot_stage = f'main/snapshot_{SnapshotStore.snapshot_name(may)}'
+    assert snapshot_stage in stages
+    assert any(path.startswith(snapshot_stage + '/') for path in stages)
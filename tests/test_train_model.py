@@ -0,0 +1,159 @@
+import os
+import time
+from pathlib import Path
+import pytest
+import pandas as pd
+from sklearn.linear_model import LinearRegression, Ridge
+from xgboost import XGBRegressor
+from threadpoolctl import threadpool_info, threadpool_limits
+
+from src.models.prepare_training_data import preparing_and_split, preparing_features_for_training
+from src.models.train_model import run_training, build_search, fit_model_search, grid_size
+from src.models.preprocessor_cache import FoldCache
+from tests.conftest import make_model_input_frame
+
+MODELS = {
+    'LinearRegression': (LinearRegression(), {'regressor__fit_intercept': [True, False]}),
+    'Ridge': (Ridge(), {'regressor__alpha': [0.1, 1.0, 10.0]}),
+}
+
+@pytest.fixture(scope='module')
+def training_data():
+    data_bundle = preparing_and_split(make_model_input_frame(), 'salary_usd', 0.8)
+    return data_bundle, preparing_features_for_training(data_bundle)
+
+@pytest.mark.parametrize('search_mode', ['grid', 'halving', 'random'])
+def test_run_training_search_modes(training_data, search_mode):
+    data_bundle, preprocessor = training_data
+
+    best_model_info, results = run_training(data_bundle, preprocessor, save_best_model=False,
+                                            search_mode=search_mode, models=MODELS)
+
+    assert best_model_info['name'] in MODELS
+    assert {r['model'] for r in results} == set(MODELS)
+
+def test_run_training_process_pool_matches_sequential(training_data):
+    data_bundle, preprocessor = training_data
+
+    sequential, _ = run_training(data_bundle, preprocessor, save_best_model=False, models=MODELS)
+    parallel, _ = run_training(data_bundle, preprocessor, save_best_model=False, models=MODELS,
+                               n_workers=2, thread_budget=1)
+
+    assert parallel['name'] == sequential['name']
+    assert parallel['best_params'] == sequential['best_params']
+
+def test_run_training_respects_time_budget(training_data):
+    data_bundle, preprocessor = training_data
+
+    best_model_info, results = run_training(data_bundle, preprocessor, save_best_model=False,
+                                            models=MODELS, time_budget=0)
+
+    assert best_model_info is None and results == []
+
+class SlowRidge(Ridge):
+    def fit(self, X, y, sample_weight=None):
+        time.sleep(60)
+        return super().fit(X, y, sample_weight)
+
+def test_time_budget_stops_long_search_in_sequential_mode(training_data):
+    data_bundle, preprocessor = training_data
+
+    start = time.perf_counter()
+    best_model_info, results = run_training(data_bundle, preprocessor, save_best_model=False,
+                                            models={'SlowRidge': (SlowRidge(), {'regressor__alpha': [1.0]})},
+                                            time_budget=1)
+
+    assert best_model_info is None and results == []
+    assert time.perf_counter() - start < 30
+
+def test_fit_model_search_limits_regressor_threads(training_data):
+    data_bundle, preprocessor = training_data
+    params = {'regressor__n_estimators': [10]}
+
+    _, search, _ = fit_model_search('XGBoost', XGBRegressor(n_jobs=-1), params, preprocessor,
+                                    data_bundle['X_train'], data_bundle['y_train'])
+
+    assert search.best_estimator_.named_steps['regressor'].n_jobs == 1
+
+class OpenMPProbe(Ridge):
+    """Ridge, що записує к-сть потоків OpenMP під час fit (у т.ч. у воркерах CV)"""
+
+    def __init__(self, alpha=1.0, log_dir=None):
+        super().__init__(alpha=alpha)
+        self.log_dir = log_dir
+
+    def fit(self, X, y, sample_weight=None):
+        threads = [info['num_threads'] for info in threadpool_info() if info['user_api'] == 'openmp']
+        with open(Path(self.log_dir) / f'{os.getpid()}.log', 'a') as f:
+            f.write(f'{max(threads)}\n')
+        return super().fit(X, y, sample_weight)
+
+@pytest.mark.parametrize('thread_budget', [1, 2])
+def test_fit_model_search_limits_openmp_threads(training_data, tmp_path, thread_budget):
+    data_bundle, preprocessor = training_data
+    params = {'regressor__alpha': [0.1, 1.0]}
+
+    # пул OpenMP більший за 1 навіть на машині з одним ядром
+    with threadpool_limits(limits=4, user_api='openmp'):
+        fit_model_search('Probe', OpenMPProbe(log_dir=str(tmp_path)), params, preprocessor,
+                         data_bundle['X_train'], data_bundle['y_train'], thread_budget=thread_budget)
+
+    threads = [int(line) for path in tmp_path.glob('*.log') for line in path.read_text().split()]
+    assert len(threads) == 2 * 5 + 1 and set(threads) == {1}
+
+def test_unknown_search_mode():
+    with pytest.raises(ValueError, match='search_mode'):
+        build_search(None, {'a': [1]}, 'bayes', n_jobs=1)
+    assert grid_size({'a': [1, 2], 'b': [1, 2, 3]}) == 6
+
+def test_fold_cache_fits_preprocessor_once_per_fold(training_data, tmp_path):
+    data_bundle, preprocessor = training_data
+    X_train, y_train = data_bundle['X_train'], data_bundle['y_train']
+
+    _, cached, _ = fit_model_search('Ridge', *MODELS['Ridge'], preprocessor, X_train, y_train,
+                                    cache_dir=tmp_path)
+    _, plain, _ = fit_model_search('Ridge', *MODELS['Ridge'], preprocessor, X_train, y_train)
+
+    # 5 fold'ів + refit на всьому train, незалежно від к-сті кандидатів
+    assert FoldCache(tmp_path).n_computed() == cached.n_splits_ + 1
+    assert cached.best_params_ == plain.best_params_
+    assert (cached.predict(data_bundle['X_test']) == plain.predict(data_bundle['X_test'])).all()
+    FoldCache(tmp_path).clear()
+
+def test_fold_cache_key_covers_categorical_columns(training_data):
+    data_bundle, preprocessor = training_data
+    X, y = data_bundle['X_train'], data_bundle['y_train']
+    remapped = X.assign(job_category=X['job_category'].astype(str).str.upper())
+
+    assert FoldCache.make_key(preprocessor, X, y) == FoldCache.make_key(preprocessor, X.copy(), y)
+    assert FoldCache.make_key(preprocessor, X, y) != FoldCache.make_key(preprocessor, remapped, y)
+
+def test_run_training_cache_matches_uncached(training_data):
+    data_bundle, preprocessor = training_data
+
+    cached, _ = run_training(data_bundle, preprocessor, save_best_model=False, models=MODELS,
+                             n_workers=2, thread_budget=1)
+    plain, _ = run_training(data_bundle, preprocessor, save_best_model=False, models=MODELS,
+                            cache_preprocessing=False)
+
+    assert cached['name'] == plain['name']
+    assert cached['best_params'] == plain['best_params']
+
+def test_fold_cache_recomputes_unreadable_file(tmp_path):
+    cache = FoldCache(tmp_path)
+    calls = []
+
+    def fit_transform(transformer, X, y=None):
+        calls.append(1)
+        return X * 2
+
+    X = pd.DataFrame({'a': [1.0, 2.0]})
+    # файл, який інший процес ще не дописав
+    (tmp_path / f'{FoldCache.make_key(None, X, None)}.pkl').write_bytes(b'\x80\x04trunc')
+
+    result = cache.cache(fit_transform)(None, X)
+
+    assert calls == [1] and result.equals(X * 2)
+    assert cache.cache(fit_transform)(None, X).equals(X * 2) and calls == [1]
+    assert cache.n_computed() == 1 and not list(tmp_path.glob('*.tmp'))
+    cache.clear()
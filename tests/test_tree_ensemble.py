@@ -0,0 +1,84 @@
+import json
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+from xgboost import XGBRegressor
+
+from models.tree_ensemble import TreeEnsemble, export_tree_ensemble
+from src.data.categories import CATEGORICAL_COLUMNS
+from src.models.prepare_training_data import preparing_and_split, preparing_features_for_training
+from src.models.registry import save_model_artifacts
+from src.models.train_model import export_tree_inference
+from src.utils.paths import CONFIG_DIR
+from tests.conftest import make_model_input_frame
+
+REGRESSORS = {
+    'DecisionTree': DecisionTreeRegressor(random_state=25),
+    'RandomForest': RandomForestRegressor(n_estimators=20, random_state=25),
+    'GradientBoosting': GradientBoostingRegressor(n_estimators=20, random_state=25),
+    'HistGBM': HistGradientBoostingRegressor(max_iter=20, random_state=25),
+    'XGBoost': XGBRegressor(n_estimators=20, max_depth=4, random_state=25, n_jobs=1),
+}
+
+@pytest.fixture(scope='module')
+def training_data():
+    data_bundle = preparing_and_split(make_model_input_frame(), 'salary_usd', 0.8)
+    return data_bundle, preparing_features_for_training(data_bundle)
+
+@pytest.fixture(scope='module')
+def categories():
+    allowed = json.load(open(CONFIG_DIR / 'allowed_values.json'))
+    return {col: allowed[col] for col in CATEGORICAL_COLUMNS}
+
+def fit_pipeline(training_data, regressor):
+    data_bundle, preprocessor = training_data
+    return Pipeline([('preprocessor', clone(preprocessor)), ('regressor', clone(regressor))]).fit(
+        data_bundle['X_train'], data_bundle['y_train'])
+
+@pytest.mark.parametrize('name', list(REGRESSORS))
+def test_tree_ensemble_matches_model(training_data, categories, name):
+    pipeline = fit_pipeline(training_data, REGRESSORS[name])
+    X_test = training_data[0]['X_test']
+
+    engine = TreeEnsemble(export_tree_ensemble(pipeline, categories, list(X_test.columns)))
+
+    np.testing.assert_allclose(engine.predict(X_test), pipeline.predict(X_test), rtol=0, atol=1e-6)
+
+def test_tree_ensemble_unknown_category_is_nan(training_data, categories):
+    pipeline = fit_pipeline(training_data, REGRESSORS['DecisionTree'])
+    X = training_data[0]['X_test'].iloc[:3].astype({'english_level': object})
+    X.loc[X.index[1], 'english_level'] = 'Fluent'
+
+    result = TreeEnsemble(export_tree_ensemble(pipeline, categories, list(X.columns))).predict(X)
+
+    assert np.isnan(result[1]) and not np.isnan(result[[0, 2]]).any()
+
+def test_export_tree_inference_skips_unsupported(training_data):
+    pipeline = fit_pipeline(training_data, Ridge())
+
+    assert export_tree_inference(pipeline, training_data[0]['X_train']) is None
+
+def test_predictor_uses_exported_tree_ensemble(tmp_path, training_data):
+    from models.salary_predictor import SalaryPredictor
+
+    data_bundle = training_data[0]
+    pipeline = fit_pipeline(training_data, REGRESSORS['RandomForest'])
+    arrays = export_tree_inference(pipeline, data_bundle['X_train'])
+    save_model_artifacts(pipeline, {'model_name': 'RandomForest', 'test_R2': 0.5, 'params': {}}, tmp_path, arrays)
+
+    predictor = SalaryPredictor(model_path=tmp_path / 'best_model.pkl',
+                                metadata_path=tmp_path / 'model_metadata.pkl')
+    assert predictor.tree is not None and (tmp_path / 'tree_ensemble.npz').exists()
+
+    sample = predictor._sample_inputs(n_samples=50, random_state=3)
+    expected = np.clip(np.round(pipeline.predict(sample)), 0, None).astype(int)
+    np.testing.assert_array_equal(predictor.predict(sample), expected)
+    assert predictor.predict_record(sample.iloc[0].to_dict()) == expected[0]
+
+    # великі батчі - через модель
+    predictor.tree_max_batch = 10
+    np.testing.assert_array_equal(predictor.predict(sample), expected)